@@ -1,50 +1,131 @@
 import os
 import csv
-import concurrent.futures
+import time
+import argparse
+import multiprocessing
+from collections import deque
 
-from strategies import BFSStrategy, DFSStrategy, IDDFSStrategy, AStarStrategy, IDAStarStrategy
+from strategies import BFSStrategy, DFSStrategy, IDDFSStrategy, AStarStrategy, IDAStarStrategy, BidirectionalStrategy, AnytimeAStarStrategy
+from strategies.niveles import cargar_compilados
+from strategies.cache_soluciones import CacheSoluciones, RUTA_CACHE
+from strategies.telemetria import memoria_residente
 
-ruta_niveles = "levels"
-archivos = [f for f in os.listdir(ruta_niveles) if os.path.isfile(os.path.join(ruta_niveles, f))]
+estrategias = [BFSStrategy, DFSStrategy, IDDFSStrategy, AStarStrategy, IDAStarStrategy, BidirectionalStrategy, AnytimeAStarStrategy]
 
-niveles = {}
+ENCABEZADO = ["Nivel", "Algoritmo", "Estado", "Hay Solucion?", "Tiempo", "Nodos generados", "Nodos abiertos", "Nodos podados", "Profundidad máxima"]
 
-for archivo in archivos:
-    with open(os.path.join(ruta_niveles, archivo), "r") as f:
-        lineas = f.readlines()
-        datos = [list(linea.rstrip()) for linea in lineas]
-        niveles[archivo.split(".")[0]] = datos
 
-print(niveles)
+def resolver_nivel_con_estrategia(conexion, datos, estrategia, opciones, ruta_cache=None):
+    """
+    Resuelve un nivel en un proceso hijo y envía el resultado por la conexión. Con
+    `ruta_cache` se reutiliza la solución guardada, si la hay.
+    """
+    try:
+        if ruta_cache is not None:
+            cache = CacheSoluciones(ruta_cache)
+            resultado = cache.resolver(estrategia, datos, **opciones)
+            cache.cerrar()
+        else:
+            resultado = estrategia(datos, **opciones).resolver()
+        conexion.send(("resuelto", resultado))
+    except MemoryError:
+        conexion.send(("memoria agotada", None))
+    except Exception as error:
+        conexion.send(("error", repr(error)))
+    finally:
+        conexion.close()
 
-estrategias = [BFSStrategy, DFSStrategy, IDDFSStrategy, AStarStrategy, IDAStarStrategy]
 
-# ["Algoritmo", "Tiempo", "Nodos generados", "Nodos abiertos", "Profundidad máxima"]
+def ejecutar_trabajos(niveles, estrategias, procesos, tiempo_limite, memoria_limite, opciones, ruta_cache=None):
+    """
+    Reparte la matriz (nivel, estrategia) entre procesos, a lo sumo `procesos` a la vez.
+    Cada trabajo tiene un límite de tiempo real y de memoria residente; si lo supera se
+    termina su proceso. Produce una fila por trabajo a medida que terminan.
+    """
+    pendientes = deque((nivel, estrategia) for nivel in niveles for estrategia in estrategias)
+    en_curso = {}  # proceso -> (nivel, estrategia, conexión, inicio)
 
-def resolver_nivel_con_estrategia(nivel, estrategia):
-    print(f"Resolviendo nivel {nivel} con {estrategia.__name__}")
-    resultado = estrategia(niveles[nivel]).resolver()
-    return estrategia.__name__, resultado
+    while pendientes or en_curso:
+        # Lanzar trabajos hasta ocupar todos los procesos
+        while pendientes and len(en_curso) < procesos:
+            nivel, estrategia = pendientes.popleft()
+            print(f"Resolviendo nivel {nivel} con {estrategia.__name__}")
+            receptor, emisor = multiprocessing.Pipe(duplex=False)
+            proceso = multiprocessing.Process(
+                target=resolver_nivel_con_estrategia,
+                args=(emisor, niveles[nivel], estrategia, opciones, ruta_cache),
+                daemon=True,
+            )
+            proceso.start()
+            emisor.close()
+            en_curso[proceso] = (nivel, estrategia, receptor, time.monotonic())
 
+        for proceso, (nivel, estrategia, receptor, inicio) in list(en_curso.items()):
+            estado, resultado = None, None
 
-resultados = {}
+            if receptor.poll():
+                try:
+                    estado, resultado = receptor.recv()
+                except EOFError:
+                    estado = "error"
+            elif not proceso.is_alive():
+                # El proceso terminó sin enviar resultado (por ejemplo, lo mató el sistema)
+                estado = "error"
+            elif time.monotonic() - inicio > tiempo_limite:
+                estado = "tiempo agotado"
+            elif memoria_limite and (memoria_residente(proceso.pid) or 0) > memoria_limite:
+                estado = "memoria agotada"
 
-for nivel in niveles:
-    resultados_nivel = {}
-    with concurrent.futures.ThreadPoolExecutor() as executor:
-        # Crear una lista de tareas para cada estrategia
-        futures = [executor.submit(resolver_nivel_con_estrategia, nivel, estrategia) for estrategia in estrategias]
-        for future in concurrent.futures.as_completed(futures):
-            estrategia_nombre, resultado = future.result()
-            resultados_nivel[estrategia_nombre] = resultado
-    resultados[nivel] = resultados_nivel
+            if estado is None:
+                continue
 
-print(resultados)
+            if proceso.is_alive():
+                proceso.terminate()
+            proceso.join()
+            receptor.close()
+            del en_curso[proceso]
+            yield nivel, estrategia.__name__, estado, resultado if isinstance(resultado, dict) else None
 
-with open("resultados.csv", "w", newline="") as f:
-    writer = csv.writer(f)
-    writer.writerow(["Nivel", "Algoritmo", "Hay Solucion?", "Tiempo", "Nodos generados", "Nodos abiertos", "Profundidad máxima"])
-    for nivel in resultados:
-        for estrategia in resultados[nivel]:
-            resultado = resultados[nivel][estrategia]
-            writer.writerow([nivel, estrategia, (resultado["camino"] != None), resultado["tiempo_total"], resultado["nodos_generados"], resultado["nodos_abiertos"], resultado["profundidad_maxima"]])
\ No newline at end of file
+        time.sleep(0.05)
+
+
+def fila_csv(nivel, estrategia, estado, resultado):
+    """
+    Convierte el resultado de un trabajo en una fila del CSV. Los trabajos que no terminaron
+    dejan las métricas vacías.
+    """
+    if resultado is None:
+        return [nivel, estrategia, estado, False, "", "", "", "", ""]
+    return [nivel, estrategia, estado, (resultado["camino"] != None), resultado["tiempo_total"], resultado["nodos_generados"], resultado["nodos_abiertos"], resultado["nodos_podados"], resultado["profundidad_maxima"]]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compara las estrategias de búsqueda en todos los niveles.")
+    parser.add_argument("--niveles", default="levels", help="Directorio de niveles o archivo de colección (.xsb, .sok)")
+    parser.add_argument("--salida", default="resultados.csv", help="Archivo CSV de resultados")
+    parser.add_argument("--procesos", type=int, default=os.cpu_count() or 1, help="Trabajos en paralelo")
+    parser.add_argument("--tiempo-limite", type=float, default=120, help="Segundos por trabajo")
+    parser.add_argument("--memoria-limite", type=int, default=2048, help="MB de memoria residente por trabajo (0 sin límite)")
+    parser.add_argument("--modo", choices=["pasos", "empujes"], default="pasos", help="Modo de búsqueda")
+    parser.add_argument("--cache", nargs="?", const=RUTA_CACHE, help="Reutilizar soluciones guardadas (las métricas son las de la búsqueda original)")
+    args = parser.parse_args()
+
+    # Niveles compilados (o leídos de la cache de niveles compilados), indexados por nombre
+    niveles = dict(cargar_compilados(args.niveles))
+    opciones = {"modo": args.modo}
+
+    # Cada fila se escribe en cuanto termina su trabajo
+    with open(args.salida, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(ENCABEZADO)
+        f.flush()
+        for nivel, estrategia, estado, resultado in ejecutar_trabajos(
+            niveles, estrategias, args.procesos, args.tiempo_limite, args.memoria_limite * 1024 * 1024, opciones, args.cache
+        ):
+            print(f"Nivel {nivel} con {estrategia}: {estado}")
+            writer.writerow(fila_csv(nivel, estrategia, estado, resultado))
+            f.flush()
+
+
+if __name__ == "__main__":
+    main()
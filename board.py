@@ -0,0 +1,176 @@
+import sys
+import argparse
+
+from strategies.niveles import leer_coleccion
+
+# Desplazamiento (dx, dy) de cada dirección LURD
+DIRECTIONS = {"L": (-1, 0), "U": (0, -1), "R": (1, 0), "D": (0, 1)}
+
+# Celda fuera del nivel (relleno de filas cortas y borde); se comporta como pared
+OUTSIDE = 0
+WALL = ord("#")
+FLOOR = ord(" ")
+TARGET = ord(".")
+BOX = ord("$")
+BOX_ON_TARGET = ord("*")
+PLAYER = ord("@")
+PLAYER_ON_TARGET = ord("+")
+
+
+class Board:
+    """
+    Tablero del juego en un arreglo plano de bytes, con la posición del jugador y la
+    cantidad de cajas fuera de objetivo actualizadas en cada movimiento, de modo que
+    mover y comprobar si el nivel está resuelto son O(1).
+    """
+
+    def __init__(self, rows):
+        self.height = len(rows)
+        self.width = max(map(len, rows), default=0)
+        # Un borde de celdas OUTSIDE alrededor evita comprobar límites al mover
+        self.stride = self.width + 2
+        self.cells = bytearray((self.height + 2) * self.stride)
+        self.row_lengths = [len(row) for row in rows]
+        self.player = None
+        self.boxes_off_target = 0
+
+        for y, row in enumerate(rows):
+            for x, char in enumerate(row):
+                cell = self.cell(x, y)
+                self.cells[cell] = ord(char)
+                if char in ("@", "+"):
+                    self.player = cell
+                elif char == "$":
+                    self.boxes_off_target += 1
+
+        if self.player is None:
+            raise ValueError("El nivel no tiene jugador")
+
+        self.offsets = {
+            direction: dy * self.stride + dx for direction, (dx, dy) in DIRECTIONS.items()
+        }
+
+    def cell(self, x, y):
+        return (y + 1) * self.stride + x + 1
+
+    def coordinates(self, cell):
+        y, x = divmod(cell, self.stride)
+        return x - 1, y - 1
+
+    def char_at(self, x, y):
+        return chr(self.cells[self.cell(x, y)])
+
+    def rows(self):
+        # Reconstruir el nivel como lista de listas, con las filas de su largo original
+        return [
+            [self.char_at(x, y) for x in range(length)]
+            for y, length in enumerate(self.row_lengths)
+        ]
+
+    def is_solved(self):
+        return self.boxes_off_target == 0
+
+    def move(self, direction):
+        """
+        Mueve al jugador en la dirección dada (L, U, R o D, sin importar mayúsculas).
+        Devuelve None si el movimiento no es válido o, si lo es, una tupla con un
+        booleano que indica si empujó una caja y las celdas que cambiaron.
+        """
+        offset = self.offsets.get(direction.upper())
+        if offset is None:
+            return None
+
+        cells = self.cells
+        player = self.player
+        target = player + offset
+        content = cells[target]
+
+        # Movimiento sin caja
+        if content == FLOOR or content == TARGET:
+            cells[player] = TARGET if cells[player] == PLAYER_ON_TARGET else FLOOR
+            cells[target] = PLAYER_ON_TARGET if content == TARGET else PLAYER
+            self.player = target
+            return False, (player, target)
+
+        # Movimiento con caja
+        if content == BOX or content == BOX_ON_TARGET:
+            following = target + offset
+            beyond = cells[following]
+            if beyond != FLOOR and beyond != TARGET:
+                return None
+            cells[player] = TARGET if cells[player] == PLAYER_ON_TARGET else FLOOR
+            cells[following] = BOX_ON_TARGET if beyond == TARGET else BOX
+            cells[target] = PLAYER_ON_TARGET if content == BOX_ON_TARGET else PLAYER
+            self.boxes_off_target += (content == BOX_ON_TARGET) - (beyond == TARGET)
+            self.player = target
+            return True, (player, target, following)
+
+        return None  # Pared o fuera del nivel
+
+
+def validate(rows, solution, strict=False):
+    """
+    Reproduce una solución LURD sobre el nivel sin interfaz gráfica.
+
+    Con `strict` las mayúsculas deben coincidir con los empujes (minúscula para
+    caminar, mayúscula para empujar). Devuelve un diccionario con `legal`, `solved`,
+    la cantidad de movimientos y empujes realizados y, si hubo un movimiento inválido,
+    su posición en `error_index`.
+    """
+    board = Board(rows)
+    moves = pushes = 0
+    error_index = None
+
+    for index, direction in enumerate(solution):
+        result = board.move(direction)
+        if result is None or (strict and result[0] != direction.isupper()):
+            error_index = index
+            break
+        moves += 1
+        pushes += result[0]
+
+    return {
+        "legal": error_index is None,
+        "solved": error_index is None and board.is_solved(),
+        "moves": moves,
+        "pushes": pushes,
+        "error_index": error_index,
+    }
+
+
+def load_rows(level_path):
+    # Primer tablero del archivo; admite colecciones .xsb/.sok con títulos, comentarios y RLE
+    with open(level_path, "r") as level:
+        for _, rows in leer_coleccion(level, ""):
+            return rows
+    raise ValueError(f"El archivo no contiene ningún nivel: {level_path}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Valida soluciones LURD sobre un nivel sin abrir la ventana del juego.")
+    parser.add_argument("level", help="Archivo del nivel")
+    parser.add_argument("solutions", nargs="*", help="Soluciones LURD (si no se indican, una por línea desde la entrada estándar)")
+    parser.add_argument("--strict", action="store_true", help="Exigir mayúsculas solo en los empujes")
+    args = parser.parse_args()
+
+    rows = load_rows(args.level)
+    solutions = args.solutions or [line.strip() for line in sys.stdin if line.strip()]
+
+    # Una línea por solución; el código de salida indica si alguna no resuelve el nivel
+    failed = 0
+    for solution in solutions:
+        result = validate(rows, solution, strict=args.strict)
+        if result["solved"]:
+            status = "ok"
+        elif result["legal"]:
+            status = "no resuelve"
+        else:
+            status = f"movimiento inválido en {result['error_index']}"
+        failed += not result["solved"]
+        print(f"{status}\t{result['moves']} movimientos\t{result['pushes']} empujes")
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
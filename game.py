@@ -1,99 +1,117 @@
+import os
 import pygame
+from board import Board, load_rows
 from strategies.bfs import BFSStrategy
 from strategies.dfs import DFSStrategy
 from strategies.iddfs import IDDFSStrategy
 from strategies.astar import AStarStrategy
 from strategies.idastar import IDAStarStrategy
 
+# Tamaño en píxeles de cada celda
+TILE = 36
+
+# Imagen de cada símbolo del nivel
+SPRITES = {
+    "#": "wall.png",
+    "@": "player.png",
+    ".": "target.png",
+    "+": "player.png",
+    "$": "box.png",
+    "*": "box_target.png",
+    " ": "space.png",
+}
+
 class Game:
 
     def __init__(self):
         self.lurd_history = []
+        self.atlas = None
+        self.atlas_rects = {}
+        # Celdas modificadas desde el último dibujo; None fuerza a redibujar todo el nivel
+        self.dirty_cells = None
 
     def load_level(self, level_path):
         # Cargar el nivel desde un archivo
-        level = open(level_path, 'r')
-        self.level_data = [list(line.rstrip()) for line in level.readlines()]
-        level.close()
+        self.board = Board(load_rows(level_path))
         # Configurar la ventana acorde al tamaño del nivel
-        width = max(map(len, self.level_data)) * 36
-        height = len(self.level_data) * 36
+        width = self.board.width * TILE
+        height = self.board.height * TILE
         self.screen = pygame.display.set_mode((width, height))
         pygame.display.set_caption('Sokoban')
 
+        # Las imágenes se convierten al formato de la pantalla, así que se cargan tras crearla
+        if self.atlas is None:
+            self.load_sprites()
+        self.invalidate()
+
         return self.level_data
+
+    @property
+    def level_data(self):
+        # Vista del tablero como lista de listas (la forma que reciben las estrategias)
+        return self.board.rows()
     
-    def autoplay(self):
-        bfs = AStarStrategy(self.level_data)
-        solucion = bfs.resolver()["camino"]
+    def autoplay(self, fps=10, cache=None):
+        # Con una cache de soluciones, un nivel ya resuelto no se vuelve a buscar
+        if cache is not None:
+            solucion = cache.resolver(AStarStrategy, self.level_data)["camino"]
+        else:
+            solucion = AStarStrategy(self.level_data).resolver()["camino"]
+        # El reloj mantiene el ritmo de la repetición sin importar lo que tarde cada dibujo
+        clock = pygame.time.Clock()
         for movimiento in solucion:
+            pygame.event.pump()
             self.movePlayer(movimiento)
             self.draw()
-            pygame.time.wait(100)
+            clock.tick(fps)
+
+    def load_sprites(self):
+        # Cargar y convertir las imágenes una sola vez, en un atlas con una celda por símbolo
+        self.atlas = pygame.Surface((TILE * len(SPRITES), TILE), pygame.SRCALPHA).convert_alpha()
+        self.atlas_rects = {}
+        loaded = {}
+        for index, (char, filename) in enumerate(SPRITES.items()):
+            if filename not in loaded:
+                loaded[filename] = pygame.image.load(os.path.join('images', filename)).convert_alpha()
+            self.atlas_rects[char] = pygame.Rect(index * TILE, 0, TILE, TILE)
+            self.atlas.blit(loaded[filename], self.atlas_rects[char])
+
+    def invalidate(self):
+        # Forzar a redibujar todo el nivel en el próximo dibujo (por ejemplo, si la ventana se expuso)
+        self.dirty_cells = None
 
     def draw(self):
-        # Cargar imagenes de los elementos
-        wall = pygame.image.load('images/wall.png')
-        player = pygame.image.load('images/player.png')
-        player_target = pygame.image.load('images/player.png')
-        target = pygame.image.load('images/target.png')
-        box = pygame.image.load('images/box.png')
-        box_target = pygame.image.load('images/box_target.png')
-        space = pygame.image.load('images/space.png')
-
-        xcb = {"#": wall, "@": player, ".": target, "+": player_target, "$": box, "*": box_target, " ": space}
-
-        # Dibujar el nivel
-        for y, row in enumerate(self.level_data):
-            for x, char in enumerate(row):
-                self.screen.blit(xcb[char], (x * 36, y * 36))
-
-        pygame.display.flip()
-    
+        if self.dirty_cells is None:
+            # Dibujar el nivel completo
+            for y, length in enumerate(self.board.row_lengths):
+                for x in range(length):
+                    self.screen.blit(self.atlas, (x * TILE, y * TILE), self.atlas_rects[self.board.char_at(x, y)])
+            pygame.display.flip()
+            self.dirty_cells = set()
+            return
+
+        if not self.dirty_cells:
+            return
+
+        # Redibujar solo las celdas que cambió el último movimiento
+        rects = []
+        for x, y in self.dirty_cells:
+            rect = pygame.Rect(x * TILE, y * TILE, TILE, TILE)
+            self.screen.blit(self.atlas, rect, self.atlas_rects[self.board.char_at(x, y)])
+            rects.append(rect)
+        pygame.display.update(rects)
+        self.dirty_cells.clear()
+
     def get_player_position(self):
-        for y, row in enumerate(self.level_data):
-            for x, char in enumerate(row):
-                if char in ('@', '+'):
-                    return x, y
+        return self.board.coordinates(self.board.player)
 
     def movePlayer(self, direction):
-        player_x, player_y = self.get_player_position()
-        current_position = self.level_data[player_y][player_x]
-
-        # Calcular las nuevas posiciones basadas en la dirección
-        if direction == 'L':
-            target_x, target_y = player_x - 1, player_y
-            next_x, next_y = player_x - 2, player_y
-        elif direction == 'U':
-            target_x, target_y = player_x, player_y - 1
-            next_x, next_y = player_x, player_y - 2
-        elif direction == 'R':
-            target_x, target_y = player_x + 1, player_y
-            next_x, next_y = player_x + 2, player_y
-        elif direction == 'D':
-            target_x, target_y = player_x, player_y + 1
-            next_x, next_y = player_x, player_y + 2
-        else:
-            return False  # Dirección no válida
-
-        # Movimiento sin caja
-        if self.level_data[target_y][target_x] in (' ', '.'):
-            # Dejar la casilla original como estaba
-            self.level_data[player_y][player_x] = '.' if current_position == '+' else ' '
-            # Actualizar la nueva posición del jugador
-            self.level_data[target_y][target_x] = '+' if self.level_data[target_y][target_x] == '.' else '@'
-            self.lurd_history.append(direction.lower())
-            return True
-
-        # Movimiento con caja
-        if self.level_data[target_y][target_x] in ('$', '*') and self.level_data[next_y][next_x] in (' ', '.'):
-            # Dejar la casilla original como estaba
-            self.level_data[player_y][player_x] = '.' if current_position == '+' else ' '
-            # Mover la caja
-            self.level_data[next_y][next_x] = '*' if self.level_data[next_y][next_x] == '.' else '$'
-            # Mover el jugador
-            self.level_data[target_y][target_x] = '+' if self.level_data[target_y][target_x] == '*' else '@'
-            self.lurd_history.append(direction.upper())
-            return True
-
-        return False  # Movimiento inválido
\ No newline at end of file
+        result = self.board.move(direction)
+        if result is None:
+            return False  # Dirección o movimiento inválido
+
+        pushed, cells = result
+        if self.dirty_cells is not None:
+            self.dirty_cells.update(self.board.coordinates(cell) for cell in cells)
+        self.lurd_history.append(direction.upper() if pushed else direction.lower())
+        return True
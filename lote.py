@@ -0,0 +1,86 @@
+import sys
+import json
+import argparse
+import contextlib
+
+from strategies import ESTRATEGIAS
+from strategies.nivel import Nivel
+from strategies.niveles import cargar_compilados
+from strategies.cache_soluciones import CacheSoluciones
+from strategies.presupuesto import Presupuesto
+
+
+def resolver_lote(niveles, estrategias=("astar",), cache=None, tiempo_limite=None, nodos_limite=None, **opciones):
+    """
+    Resuelve cada nivel (pares nombre, mapa) con cada estrategia indicada por nombre y
+    produce un diccionario por resultado en cuanto termina.
+
+    Cada nivel se compila una sola vez (o llega ya compilado como `Nivel`): todas las
+    estrategias reciben el mismo `Nivel`, así que sus tablas derivadas (celdas muertas,
+    distancias de empuje) se calculan una vez por nivel. Si se indica una
+    `CacheSoluciones`, los niveles ya resueltos con la misma estrategia y opciones se
+    devuelven desde ella. Con `tiempo_limite` (segundos) o `nodos_limite` cada resolución
+    recibe su propio `Presupuesto`.
+    """
+    clases = [ESTRATEGIAS[nombre] for nombre in estrategias]
+
+    for nombre, mapa in niveles:
+        nivel = None
+        for nombre_estrategia, clase in zip(estrategias, clases):
+            fila = {"nivel": nombre, "estrategia": nombre_estrategia}
+            try:
+                if nivel is None:
+                    nivel = mapa if isinstance(mapa, Nivel) else Nivel(mapa)
+                if tiempo_limite is not None or nodos_limite is not None:
+                    opciones["presupuesto"] = Presupuesto(tiempo_limite, nodos_limite)
+                if cache is not None:
+                    resultado = cache.resolver(clase, nivel, **opciones)
+                else:
+                    resultado = clase(nivel, **opciones).resolver()
+                if resultado["camino"] is not None:
+                    fila["estado"] = "resuelto"
+                elif resultado.get("presupuesto_agotado"):
+                    fila["estado"] = "presupuesto agotado"
+                else:
+                    fila["estado"] = "sin solución"
+                fila.update(resultado)
+            except MemoryError:
+                fila["estado"] = "memoria agotada"
+            except Exception as error:
+                fila["estado"] = "error"
+                fila["error"] = repr(error)
+            yield fila
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Resuelve niveles en lote sin interfaz gráfica, escribiendo una línea JSON por resultado.")
+    parser.add_argument("ruta", help="Directorio de niveles o archivo de colección (.xsb, .sok)")
+    parser.add_argument("--estrategia", action="append", choices=sorted(ESTRATEGIAS), help="Estrategia a usar (se puede repetir; por defecto astar)")
+    parser.add_argument("--modo", choices=["pasos", "empujes"], default="pasos", help="Modo de búsqueda")
+    parser.add_argument("--podar-movimientos", action="store_true", help="Macros de túnel y poda de corrales PI (requiere --modo empujes)")
+    parser.add_argument("--tiempo-limite", type=float, help="Segundos máximos por nivel y estrategia")
+    parser.add_argument("--nodos-limite", type=int, help="Nodos generados máximos por nivel y estrategia")
+    parser.add_argument("--salida", help="Archivo de resultados (por defecto la salida estándar)")
+    parser.add_argument("--no-cache", action="store_true", help="Resolver siempre, sin usar la cache de soluciones")
+    parser.add_argument("--simetrias", action="store_true", help="Reutilizar soluciones de niveles rotados o reflejados")
+    args = parser.parse_args()
+
+    cache = None if args.no_cache else CacheSoluciones(simetrias=args.simetrias)
+    salida = open(args.salida, "w") if args.salida else sys.stdout
+    try:
+        # Los mensajes de las estrategias van a stderr para no mezclarse con el JSON
+        with contextlib.redirect_stdout(sys.stderr):
+            for fila in resolver_lote(cargar_compilados(args.ruta), args.estrategia or ["astar"], cache,
+                                      args.tiempo_limite, args.nodos_limite, modo=args.modo,
+                                      podar_movimientos=args.podar_movimientos):
+                salida.write(json.dumps(fila, ensure_ascii=False) + "\n")
+                salida.flush()
+    finally:
+        if salida is not sys.stdout:
+            salida.close()
+        if cache is not None:
+            cache.cerrar()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,338 @@
+import gc
+import io
+import sys
+import json
+import math
+import time
+import argparse
+import platform
+import tempfile
+import statistics
+import contextlib
+import tracemalloc
+
+from strategies import ESTRATEGIAS
+from strategies.nivel import Nivel
+from strategies.strategy import Strategy, MODO_PASOS, MODO_EMPUJES
+from strategies.niveles import cargar_compilados
+from strategies.tablero import Tablero
+from strategies.heuristica import MotorHeuristico
+from strategies.patrones import MotorPatrones
+from strategies.presupuesto import Presupuesto
+from strategies.visitados import ConjuntoVisitados
+
+# Archivo predeterminado de la línea base con la que se comparan las mediciones
+RUTA_BASE = "rendimiento_base.json"
+
+# Duración mínima de cada medición: las funciones más rápidas se repiten hasta alcanzarla
+DURACION_MINIMA = 0.02
+
+# Estrategias de los macro-benchmarks por defecto: las de un solo proceso y sin disco
+ESTRATEGIAS_MACRO = ("bfs", "dfs", "astar", "idastar", "bidireccional", "anytime")
+
+
+def medir(funcion, repeticiones, calentamiento):
+    """
+    Ejecuta `funcion` `calentamiento` veces sin medir y luego toma `repeticiones`
+    mediciones con `perf_counter`, devolviendo el tiempo por llamada de cada una. Como en
+    `timeit`, cada medición repite la función hasta durar al menos `DURACION_MINIMA` (la
+    cantidad de vueltas se calibra en el calentamiento) y el recolector de basura se
+    desactiva mientras dura, para que no se cuele en una sola.
+    """
+    vueltas = 1
+    for _ in range(max(calentamiento, 1)):
+        inicio = time.perf_counter()
+        funcion()
+        duracion = time.perf_counter() - inicio
+        if duracion < DURACION_MINIMA:
+            vueltas = max(vueltas, math.ceil(DURACION_MINIMA / max(duracion, 1e-9)))
+
+    tiempos = []
+    for _ in range(repeticiones):
+        gc.collect()
+        gc.disable()
+        try:
+            inicio = time.perf_counter()
+            for _ in range(vueltas):
+                funcion()
+            tiempos.append((time.perf_counter() - inicio) / vueltas)
+        finally:
+            gc.enable()
+    return tiempos
+
+
+def percentiles(tiempos):
+    """
+    Resume los tiempos con su mínimo, mediana, percentiles 90 y 99 y máximo.
+    """
+    if len(tiempos) > 1:
+        cortes = statistics.quantiles(tiempos, n=100, method="inclusive")
+        p90, p99 = cortes[89], cortes[98]
+    else:
+        p90 = p99 = tiempos[0]
+    return {
+        "minimo": min(tiempos),
+        "mediana": statistics.median(tiempos),
+        "p90": p90,
+        "p99": p99,
+        "maximo": max(tiempos),
+    }
+
+
+def muestras(nivel, modo, cantidad):
+    """
+    Devuelve hasta `cantidad` estados del nivel en el orden en que los alcanza una búsqueda
+    en amplitud desde el inicial, siempre los mismos para el mismo nivel y modo.
+    """
+    estrategia = Strategy(nivel, modo=modo)
+    estados = [estrategia.estado_inicial]
+    vistos = {estrategia.estado_inicial.clave}
+    for estado in estados:
+        if len(estados) >= cantidad:
+            break
+        for nuevo_estado, _ in estrategia.generar_movimientos(estado):
+            if nuevo_estado.clave not in vistos:
+                vistos.add(nuevo_estado.clave)
+                estados.append(nuevo_estado)
+    return estados[:cantidad]
+
+
+def micro_benchmarks(nivel, cantidad, directorio):
+    """
+    Devuelve las operaciones a medir en el nivel como pares (nombre, función, operaciones):
+    cada función recorre una lista fija de estados, así que el tiempo por operación es el
+    tiempo de la función dividido por la cantidad de estados (o de movimientos, en la
+    actualización incremental de la clave). La base de datos de patrones se construye en
+    `directorio` en lugar de la cache del usuario.
+    """
+    pasos = muestras(nivel, MODO_PASOS, cantidad)
+    empujes = muestras(nivel, MODO_EMPUJES, cantidad)
+    estrategia_pasos = Strategy(nivel, modo=MODO_PASOS)
+    estrategia_empujes = Strategy(nivel, modo=MODO_EMPUJES)
+    vecinos = nivel.tabla(Tablero).vecinos
+    motor = nivel.tabla(MotorHeuristico)
+    motor_patrones = MotorPatrones(nivel, directorio=directorio)
+
+    def generar_pasos():
+        for estado in pasos:
+            estrategia_pasos.generar_movimientos(estado)
+
+    def generar_empujes():
+        for estado in empujes:
+            estrategia_empujes.generar_movimientos(estado)
+
+    # Actualización con XOR de la clave en cada paso o empuje posible, como en `generar_pasos`
+    def clave_zobrist_incremental():
+        for jugador, _, clave, ocupacion in pasos:
+            for _, _, _, clave_paso, clave_empuje, bit_jugador, _ in vecinos[jugador]:
+                clave ^ clave_paso ^ clave_empuje if ocupacion & bit_jugador else clave ^ clave_paso
+
+    # Cálculo de la clave desde cero, como al compilar el nivel
+    def clave_zobrist_completa():
+        for jugador, cajas, _, _ in pasos:
+            nivel.clave(jugador, cajas)
+
+    def visitados():
+        conjunto = ConjuntoVisitados()
+        for estado in pasos:
+            if estado not in conjunto:
+                conjunto.add(estado)
+
+    # `estimar` calcula sin la cache de configuraciones de cajas de `calcular`
+    def heuristica():
+        for estado in empujes:
+            motor.estimar(estado.cajas)
+
+    def heuristica_patrones():
+        for estado in empujes:
+            motor_patrones.estimar(estado.cajas)
+
+    return [
+        ("generar_pasos", generar_pasos, len(pasos)),
+        ("generar_empujes", generar_empujes, len(empujes)),
+        ("clave_zobrist_incremental", clave_zobrist_incremental, sum(len(vecinos[estado.jugador]) for estado in pasos)),
+        ("clave_zobrist_completa", clave_zobrist_completa, len(pasos)),
+        ("visitados", visitados, len(pasos)),
+        ("heuristica", heuristica, len(empujes)),
+        ("heuristica_patrones", heuristica_patrones, len(empujes)),
+    ]
+
+
+def ejecutar_micro(niveles, repeticiones, calentamiento, cantidad):
+    """
+    Mide las operaciones básicas en cada nivel y produce pares (clave, resultado). Las bases
+    de datos de patrones se escriben en un directorio temporal que se borra al terminar, para
+    no dejar archivos en `~/.cache` ni medir con los de una ejecución anterior.
+    """
+    with tempfile.TemporaryDirectory(prefix="rendimiento-patrones-") as directorio:
+        for nombre, nivel in niveles:
+            for operacion, funcion, operaciones in micro_benchmarks(nivel, cantidad, directorio):
+                resultado = percentiles(medir(funcion, repeticiones, calentamiento))
+                resultado["operaciones"] = operaciones
+                resultado["ns_por_operacion"] = resultado["mediana"] / operaciones * 1e9
+                yield f"micro/{nombre}/{operacion}", resultado
+
+
+def resolver_con_presupuesto(clase, nivel, nodos, opciones):
+    """
+    Resuelve el nivel con un presupuesto nuevo de `nodos` nodos generados, sin los mensajes
+    de la estrategia.
+    """
+    with contextlib.redirect_stdout(io.StringIO()):
+        return clase(nivel, presupuesto=Presupuesto(nodos=nodos), **opciones).resolver()
+
+
+def ejecutar_macro(niveles, estrategias, repeticiones, calentamiento, nodos, opciones):
+    """
+    Resuelve cada nivel con cada estrategia bajo el mismo presupuesto de nodos y produce
+    pares (clave, resultado) con los tiempos, los nodos por segundo y la memoria pico. La
+    memoria se mide con tracemalloc en una ejecución aparte, para no inflar los tiempos.
+    """
+    for nombre, nivel in niveles:
+        for nombre_estrategia in estrategias:
+            clase = ESTRATEGIAS[nombre_estrategia]
+            respuestas = []
+
+            def resolver():
+                respuestas.append(resolver_con_presupuesto(clase, nivel, nodos, opciones))
+
+            try:
+                resultado = percentiles(medir(resolver, repeticiones, calentamiento))
+            except (ImportError, ValueError) as error:
+                # Estrategias que no admiten el modo o a las que les falta una dependencia opcional
+                print(f"Se omite {nombre_estrategia} en {nombre}: {error}", file=sys.stderr)
+                continue
+
+            respuesta = respuestas[-1]
+            resultado["nodos"] = respuesta["nodos_generados"]
+            resultado["nodos_por_segundo"] = respuesta["nodos_generados"] / resultado["mediana"]
+            resultado["resuelto"] = respuesta["camino"] is not None
+
+            tracemalloc.start()
+            try:
+                resolver_con_presupuesto(clase, nivel, nodos, opciones)
+                resultado["memoria_pico"] = tracemalloc.get_traced_memory()[1]
+            finally:
+                tracemalloc.stop()
+            yield f"macro/{nombre}/{nombre_estrategia}", resultado
+
+
+def comparar(resultados, base, tolerancia):
+    """
+    Compara los resultados con la línea base y devuelve las regresiones como pares (clave,
+    descripción): un tiempo mínimo o una memoria pico más de `tolerancia` (fracción) por
+    encima de la base. Se compara el mínimo porque es la medición menos afectada por la
+    carga del sistema; la mediana y los percentiles quedan en el informe.
+    """
+    regresiones = []
+    for clave, resultado in resultados.items():
+        anterior = base.get(clave)
+        if anterior is None:
+            continue
+        for metrica in ("minimo", "memoria_pico"):
+            if metrica not in resultado or not anterior.get(metrica):
+                continue
+            razon = resultado[metrica] / anterior[metrica]
+            if razon > 1 + tolerancia:
+                regresiones.append((clave, f"{metrica} x{razon:.2f} ({anterior[metrica]:.6g} -> {resultado[metrica]:.6g})"))
+    return regresiones
+
+
+def formatear(clave, resultado):
+    """
+    Devuelve la línea de la tabla de resultados para una medición.
+    """
+    linea = (
+        f"{clave:<50} min={resultado['minimo'] * 1000:9.3f}ms mediana={resultado['mediana'] * 1000:9.3f}ms "
+        f"p90={resultado['p90'] * 1000:9.3f}ms p99={resultado['p99'] * 1000:9.3f}ms"
+    )
+    if "ns_por_operacion" in resultado:
+        linea += f" {resultado['ns_por_operacion']:10.0f}ns/op"
+    if "nodos_por_segundo" in resultado:
+        linea += f" {resultado['nodos_por_segundo']:10.0f} nodos/s {resultado['memoria_pico'] / (1024 * 1024):7.1f}MB"
+    return linea
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Micro y macro-benchmarks reproducibles, comparados con una línea base.")
+    parser.add_argument("--niveles", default="levels", help="Directorio de niveles o archivo de colección (.xsb, .sok)")
+    parser.add_argument("--solo", choices=["micro", "macro"], help="Ejecutar solo un tipo de benchmark")
+    parser.add_argument("--estrategia", action="append", choices=sorted(ESTRATEGIAS), help=f"Estrategia de los macro-benchmarks (se puede repetir; por defecto {', '.join(ESTRATEGIAS_MACRO)})")
+    parser.add_argument("--modo", choices=["pasos", "empujes"], default="pasos", help="Modo de búsqueda de los macro-benchmarks")
+    parser.add_argument("--nodos", type=int, default=20000, help="Nodos generados por resolución en los macro-benchmarks")
+    parser.add_argument("--muestras", type=int, default=500, help="Estados por nivel en los micro-benchmarks")
+    parser.add_argument("--repeticiones", type=int, default=7, help="Mediciones por benchmark")
+    parser.add_argument("--calentamiento", type=int, default=1, help="Ejecuciones previas sin medir")
+    parser.add_argument("--base", default=RUTA_BASE, help="Línea base con la que comparar")
+    parser.add_argument("--guardar-base", action="store_true", help="Guardar los resultados como nueva línea base en lugar de comparar")
+    parser.add_argument("--permitir-sin-base", action="store_true", help="No fallar si la línea base no existe (solo se informan las mediciones)")
+    parser.add_argument("--tolerancia", type=float, default=0.25, help="Fracción de empeoramiento admitida antes de fallar")
+    parser.add_argument("--salida", help="Archivo JSON con todos los resultados")
+    args = parser.parse_args()
+
+    # Los niveles inválidos llegan como mapa; al compilarlos se obtiene su error
+    niveles = []
+    for nombre, nivel in cargar_compilados(args.niveles):
+        try:
+            niveles.append((nombre, nivel if isinstance(nivel, Nivel) else Nivel(nivel)))
+        except ValueError as error:
+            print(f"Se omite el nivel {nombre}: {error}", file=sys.stderr)
+
+    resultados = {}
+    mediciones = []
+    if args.solo != "macro":
+        mediciones.append(ejecutar_micro(niveles, args.repeticiones, args.calentamiento, args.muestras))
+    if args.solo != "micro":
+        mediciones.append(ejecutar_macro(niveles, args.estrategia or ESTRATEGIAS_MACRO, args.repeticiones,
+                                         args.calentamiento, args.nodos, {"modo": args.modo}))
+    for medicion in mediciones:
+        for clave, resultado in medicion:
+            resultados[clave] = resultado
+            print(formatear(clave, resultado), flush=True)
+
+    documento = {
+        "entorno": {"python": platform.python_version(), "plataforma": platform.platform()},
+        "parametros": {"modo": args.modo, "nodos": args.nodos, "muestras": args.muestras},
+        "repeticiones": args.repeticiones,
+        "resultados": resultados,
+    }
+    if args.salida:
+        with open(args.salida, "w") as f:
+            json.dump(documento, f, indent=2, ensure_ascii=False)
+
+    if args.guardar_base:
+        with open(args.base, "w") as f:
+            json.dump(documento, f, indent=2, ensure_ascii=False)
+        print(f"Línea base guardada en {args.base}")
+        return
+
+    try:
+        with open(args.base, "r") as f:
+            base = json.load(f)
+    except FileNotFoundError:
+        # Sin línea base no hay comparación posible: no se da por bueno salvo que se pida
+        if args.permitir_sin_base:
+            print(f"Sin línea base en {args.base}; se crea con --guardar-base")
+            return
+        print(f"Error: no existe la línea base {args.base}; se crea con --guardar-base", file=sys.stderr)
+        sys.exit(1)
+    # Con otros parámetros (presupuesto, modo, muestras) las mediciones no son comparables
+    if base.get("parametros") != documento["parametros"]:
+        print(
+            f"Error: la línea base {args.base} se midió con otros parámetros ({base.get('parametros')} en lugar de "
+            f"{documento['parametros']}); se vuelve a crear con --guardar-base",
+            file=sys.stderr,
+        )
+        sys.exit(1)
+
+    regresiones = comparar(resultados, base["resultados"], args.tolerancia)
+    if regresiones:
+        print(f"\nREGRESIONES ({len(regresiones)}) respecto de {args.base}:", file=sys.stderr)
+        for clave, descripcion in regresiones:
+            print(f"  {clave}: {descripcion}", file=sys.stderr)
+        sys.exit(1)
+    print(f"Sin regresiones respecto de {args.base} (tolerancia {args.tolerancia:.0%})")
+
+
+if __name__ == "__main__":
+    main()
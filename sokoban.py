@@ -1,8 +1,10 @@
 import pygame
 import sys
+import argparse
 from game import Game
+from strategies.cache_soluciones import CacheSoluciones
 
-def main(level_path):
+def main(level_path, use_cache=True):
 
     # Inicializar Pygame
     pygame.init()
@@ -13,29 +15,35 @@ def main(level_path):
 
     autoplay_executed = False
 
-    pygame.display.flip()
-
     game.draw()
 
+    clock = pygame.time.Clock()
+
     # Bucle del juego
     while True:
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 pygame.quit()
                 sys.exit()
+            if event.type == pygame.VIDEOEXPOSE:
+                # La ventana se volvió a mostrar: hay que redibujar todo el nivel
+                game.invalidate()
 
         # Ejecutar `autoplay` solo una vez
         if not autoplay_executed:
-            game.autoplay()             # Se ejecuta solo la primera vez
+            game.autoplay(cache=CacheSoluciones() if use_cache else None)  # Se ejecuta solo la primera vez
             autoplay_executed = True    # Desactivar bandera para no volver a ejecutarlo
         
-        # Dibujar el juego y actualizar pantalla
+        # Dibujar solo lo que cambió y esperar al siguiente cuadro
         game.draw()
-        pygame.display.flip()
+        clock.tick(30)
 
 
 if __name__ == "__main__":
     # Leer nivel del archivo desde la línea de comandos
-    level_path = sys.argv[1]
+    parser = argparse.ArgumentParser(description="Muestra la solución de un nivel de Sokoban.")
+    parser.add_argument("level_path", help="Archivo del nivel")
+    parser.add_argument("--no-cache", action="store_true", help="Resolver el nivel aunque su solución esté en la cache")
+    args = parser.parse_args()
     # Inicializar el juego
-    main(level_path)
\ No newline at end of file
+    main(args.level_path, use_cache=not args.no_cache)
\ No newline at end of file
@@ -3,3 +3,23 @@ from .dfs import DFSStrategy
 from .iddfs import IDDFSStrategy
 from .astar import AStarStrategy
 from .idastar import IDAStarStrategy
+from .hdastar import HDAStarStrategy
+from .bfs_externo import ExternalBFSStrategy
+from .bidireccional import BidirectionalStrategy
+from .anytime import AnytimeAStarStrategy
+from .vectorial import VectorBFSStrategy, VectorAStarStrategy
+
+# Estrategias por nombre, para elegirlas desde la línea de comandos
+ESTRATEGIAS = {
+    "bfs": BFSStrategy,
+    "dfs": DFSStrategy,
+    "iddfs": IDDFSStrategy,
+    "astar": AStarStrategy,
+    "idastar": IDAStarStrategy,
+    "hdastar": HDAStarStrategy,
+    "bfs-externo": ExternalBFSStrategy,
+    "bidireccional": BidirectionalStrategy,
+    "anytime": AnytimeAStarStrategy,
+    "bfs-vectorial": VectorBFSStrategy,
+    "astar-vectorial": VectorAStarStrategy,
+}
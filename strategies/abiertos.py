@@ -0,0 +1,93 @@
+from collections import deque
+
+# Desempates entre nodos con el mismo f(n)
+DESEMPATE_LIFO = "lifo"
+DESEMPATE_FIFO = "fifo"
+DESEMPATE_MAYOR_G = "mayor_g"
+
+
+class ListaAbiertos():
+    """
+    Lista de abiertos por cubetas de f(n), para costos enteros pequeños.
+
+    Cada cubeta guarda solo los índices de los nodos (del `AlmacenNodos`) con ese valor de
+    f, así que insertar y extraer son O(1) salvo por el avance del mínimo, que solo crece
+    mientras la heurística sea consistente. Dentro de una cubeta el desempate es
+    configurable:
+
+    - **lifo:** el último nodo insertado primero (favorece seguir la rama actual).
+    - **fifo:** el primero insertado primero.
+    - **mayor_g:** el de mayor g(n) primero, es decir, el más cercano al objetivo según
+      h(n); entre iguales, el último insertado.
+
+    La lista no reordena ni borra nodos: para bajar el costo de un estado se inserta un
+    nodo nuevo y el índice estado → nodo de la estrategia descarta el anterior al extraerlo.
+    """
+
+    def __init__(self, desempate=DESEMPATE_MAYOR_G):
+        if desempate not in (DESEMPATE_LIFO, DESEMPATE_FIFO, DESEMPATE_MAYOR_G):
+            raise ValueError(f"Desempate desconocido: {desempate}")
+        self.desempate = desempate
+        self.cubetas = []
+        # Con `mayor_g`, cada cubeta es una lista de pilas por g y se guarda el mayor g usado
+        self.mayores = []
+        self.minimo = 0
+        self.tamano = 0
+
+    def __len__(self):
+        return self.tamano
+
+    def insertar(self, nodo, f_cost, g_cost):
+        """
+        Inserta el nodo en la cubeta de su f(n).
+        """
+        cubetas = self.cubetas
+        while len(cubetas) <= f_cost:
+            cubetas.append(deque() if self.desempate == DESEMPATE_FIFO else [])
+            self.mayores.append(-1)
+
+        if self.desempate == DESEMPATE_MAYOR_G:
+            pilas = cubetas[f_cost]
+            while len(pilas) <= g_cost:
+                pilas.append([])
+            pilas[g_cost].append(nodo)
+            if g_cost > self.mayores[f_cost]:
+                self.mayores[f_cost] = g_cost
+        else:
+            cubetas[f_cost].append(nodo)
+
+        if f_cost < self.minimo:
+            self.minimo = f_cost
+        self.tamano += 1
+
+    def extraer(self):
+        """
+        Extrae un nodo de la cubeta de menor f(n) y devuelve `(f, nodo)`. La lista no debe
+        estar vacía.
+        """
+        cubetas = self.cubetas
+        while not self.tiene_nodos(self.minimo):
+            self.minimo += 1
+        f_cost = self.minimo
+        self.tamano -= 1
+
+        if self.desempate == DESEMPATE_FIFO:
+            return f_cost, cubetas[f_cost].popleft()
+        if self.desempate == DESEMPATE_LIFO:
+            return f_cost, cubetas[f_cost].pop()
+
+        # `tiene_nodos` ya dejó en `mayores` el mayor g con nodos de la cubeta
+        return f_cost, cubetas[f_cost][self.mayores[f_cost]].pop()
+
+    def tiene_nodos(self, f_cost):
+        """
+        Indica si la cubeta de f(n) tiene algún nodo (con `mayor_g`, ajustando su mayor g).
+        """
+        if self.desempate != DESEMPATE_MAYOR_G:
+            return bool(self.cubetas[f_cost])
+        mayor = self.mayores[f_cost]
+        pilas = self.cubetas[f_cost]
+        while mayor >= 0 and not pilas[mayor]:
+            mayor -= 1
+        self.mayores[f_cost] = mayor
+        return mayor >= 0
@@ -0,0 +1,146 @@
+import math
+import time
+import heapq
+from strategies.strategy import Strategy
+from strategies.heuristica import MotorHeuristico
+from strategies.patrones import MotorPatrones
+
+# Pesos de las búsquedas sucesivas; infinito es la búsqueda voraz (solo h(n))
+PESOS = (math.inf, 5, 3, 2, 1.5, 1.25, 1)
+
+
+class AnytimeAStarStrategy(Strategy):
+    """
+    ## A* ponderado anytime
+
+    - **Objetivo:** Tener cuanto antes *una* solución y mejorarla mientras quede tiempo, en lugar de esperar a la óptima.
+    - **Método:** Repite A* ponderado con f(n) = g(n) + w·h(n) para cada peso de `pesos`, de mayor a menor (el primero, infinito, es la búsqueda voraz por h(n)). Cada búsqueda descarta los nodos con g(n) + h(n) mayor o igual que el costo de la mejor solución conocida, así que solo puede encontrar soluciones mejores. Cuando una búsqueda con peso w encuentra una solución de costo c, la óptima cuesta al menos c / w, que es la cota inferior informada. Si una búsqueda se agota sin encontrar una solución mejor, la mejor conocida es óptima.
+    - **Optimalidad:** Termina con la solución óptima si el último peso es 1 y el presupuesto alcanza; si se agota antes, devuelve la mejor encontrada y su cota.
+    - **Ventaja:** La primera solución llega muy rápido y `mejor_respuesta()` (o el callback `al_mejorar`) da en todo momento la mejor hasta ahora con su cota.
+    - **Desventaja:** Cada peso vuelve a buscar desde el estado inicial, así que repite trabajo de las búsquedas anteriores.
+    """
+
+    def __init__(self, mapa, pesos=PESOS, patrones=False, al_mejorar=None, **opciones):
+        super().__init__(mapa, **opciones)
+        self.pesos = pesos
+        # Callback opcional que recibe la respuesta cada vez que se mejora la solución
+        self.al_mejorar = al_mejorar
+        # Tablas de distancias de empuje precalculadas una vez por nivel; con `patrones`
+        # se suma la base de datos de patrones de pares de cajas
+        self.motor_heuristico = self.nivel.tabla(MotorPatrones if patrones else MotorHeuristico)
+
+        # Mejor solución conocida: camino, costo (pasos o empujes según el modo), peso con
+        # que se encontró y cota inferior del costo óptimo
+        self.mejor_camino = None
+        self.mejor_costo = math.inf
+        self.mejor_peso = None
+        self.cota_inferior = 0
+
+    def heuristica(self, estado):
+        """
+        Calcula la heurística del estado (mínimo de empujes asignando cada caja a un objetivo distinto).
+        """
+        return self.motor_heuristico.calcular(estado.cajas)
+
+    def busqueda_ponderada(self, peso):
+        """
+        Ejecuta una búsqueda A* con el peso dado, descartando los nodos que no pueden mejorar
+        la mejor solución. Devuelve el nodo objetivo y su costo, o None si no hay solución
+        mejor o se agotó el presupuesto.
+        """
+        # El almacén de nodos se reinicia, conservando solo la raíz
+        self.nodos.truncar(self.nodo_inicial + 1)
+        heap = []
+        insertar = self.cronometrar("cola", heapq.heappush)
+        extraer = self.cronometrar("cola", heapq.heappop)
+        telemetria = self.telemetria
+        presupuesto = self.presupuesto
+        voraz = peso == math.inf
+
+        # Mejor costo g conocido por clave; un estado se reabre si se llega con menor costo
+        costos = {self.estado_inicial.clave: 0}
+        h_cost = self.heuristica(self.estado_inicial)
+        prioridad = h_cost if voraz else peso * h_cost
+        insertar(heap, (prioridad, 0, self.nodo_inicial, self.estado_inicial, h_cost))  # (prioridad, g, nodo, estado, h)
+
+        while heap:
+            prioridad, g_cost, nodo, estado_actual, h_cost = extraer(heap)
+            # Descartar las entradas superadas por un camino más corto o por la mejor solución
+            if g_cost > costos[estado_actual.clave] or g_cost + h_cost >= self.mejor_costo:
+                continue
+            self.nodos_cerrados += 1  # Incrementar nodos cerrados
+            if telemetria is not None:
+                telemetria.progreso(self, len(heap), len(costos), prioridad)
+            if presupuesto is not None and self.agotado():
+                return None
+
+            if g_cost > self.profundidad_maxima:
+                self.profundidad_maxima = g_cost
+
+            # Verificar si hemos alcanzado el objetivo
+            if self.es_estado_objetivo(estado_actual):
+                return nodo, g_cost
+
+            nuevo_g_cost = g_cost + 1  # Cada movimiento tiene un costo de 1
+            for nuevo_estado, movimiento in self.generar_movimientos(estado_actual):
+                if nuevo_g_cost >= costos.get(nuevo_estado.clave, math.inf):
+                    continue
+                h_cost = self.heuristica(nuevo_estado)
+                # Heurística infinita (bloqueo) o sin posibilidad de mejorar la mejor solución
+                if nuevo_g_cost + h_cost >= self.mejor_costo:
+                    self.nodos_podados += 1
+                    continue
+
+                costos[nuevo_estado.clave] = nuevo_g_cost
+                prioridad = h_cost if voraz else nuevo_g_cost + peso * h_cost
+                insertar(heap, (prioridad, nuevo_g_cost, self.nodos.agregar(nodo, movimiento), nuevo_estado, h_cost))
+                self.nodos_abiertos += 1  # Incrementar nodos abiertos
+
+        return None
+
+    def mejor_respuesta(self):
+        """
+        Devuelve la respuesta con la mejor solución encontrada hasta ahora y su cota.
+        """
+        respuesta = super().preparar_respuesta(None)
+        respuesta["camino"] = self.mejor_camino
+        respuesta["costo"] = self.mejor_costo if self.mejor_camino is not None else None
+        respuesta["cota_inferior"] = self.cota_inferior
+        respuesta["peso"] = self.mejor_peso
+        return respuesta
+
+    def resolver(self):
+        """
+        Ejecuta las búsquedas ponderadas sucesivas hasta probar la optimalidad, terminar los
+        pesos o agotar el presupuesto.
+        """
+        inicio = time.time()  # Tiempo de inicio
+        self.cota_inferior = self.heuristica(self.estado_inicial)
+
+        if self.cota_inferior < math.inf:
+            for peso in self.pesos:
+                resultado = self.busqueda_ponderada(peso)
+                if self.presupuesto_agotado:
+                    print("Presupuesto agotado, devolviendo la mejor solución encontrada.")
+                    break
+                if resultado is None:
+                    # Ningún camino mejora la mejor solución: es óptima (o no hay solución)
+                    self.cota_inferior = self.mejor_costo
+                    break
+
+                nodo, costo = resultado
+                self.mejor_camino = self.reconstruir_camino(nodo)
+                self.mejor_costo = costo
+                self.mejor_peso = peso
+                if peso < math.inf:
+                    self.cota_inferior = max(self.cota_inferior, math.ceil(costo / peso))
+                self.tiempo_total = time.time() - inicio
+                print(f"Solución de costo {costo} (peso {peso}) en {self.tiempo_total:.2f} segundos")
+                if self.al_mejorar is not None:
+                    self.al_mejorar(self.mejor_respuesta())
+                if self.cota_inferior >= self.mejor_costo:
+                    break
+
+        fin = time.time()
+        self.tiempo_total = fin - inicio
+        return self.mejor_respuesta()
@@ -1,7 +1,9 @@
 import time
-import heapq
-from collections import deque
+from array import array
 from strategies.strategy import Strategy
+from strategies.abiertos import ListaAbiertos, DESEMPATE_MAYOR_G
+from strategies.heuristica import MotorHeuristico
+from strategies.patrones import MotorPatrones
 
 class AStarStrategy(Strategy):
     """
@@ -11,70 +13,103 @@ class AStarStrategy(Strategy):
     - **Método:** A* expande los nodos en función de un valor f(n) = g(n) + h(n), donde:
         - g(n) es el costo exacto desde el nodo inicial hasta n.
         - h(n) es una heurística que estima el costo desde n hasta el objetivo.
-    - **Optimalidad:** Si la heurística es admisible (es decir, nunca sobreestima el costo real), A* garantiza encontrar la solución óptima.
+    - **Optimalidad:** Si la heurística es admisible (es decir, nunca sobreestima el costo real), A* garantiza encontrar la solución óptima. Un estado ya conocido se vuelve a abrir cuando se llega a él con menor costo, así que la garantía se mantiene aunque la heurística no sea consistente.
     - **Ventaja:** Enfoca la búsqueda en el camino con el menor costo estimado hacia el objetivo, reduciendo el número de nodos a explorar.
-    - **Desventaja:** A* consume mucha memoria, ya que debe mantener todos los nodos en la cola de prioridad hasta encontrar la solución. En problemas con grandes espacios de búsqueda, esto puede llevar a un uso excesivo de recursos.
+    - **Desventaja:** A* consume mucha memoria, ya que debe mantener todos los nodos en la lista de abiertos hasta encontrar la solución. En problemas con grandes espacios de búsqueda, esto puede llevar a un uso excesivo de recursos.
     """
 
+    def __init__(self, mapa, patrones=False, desempate=DESEMPATE_MAYOR_G, **opciones):
+        super().__init__(mapa, **opciones)
+        # Lista de abiertos por cubetas de f(n); `desempate` ordena los nodos con el mismo
+        # f(n): "lifo", "fifo" o "mayor_g"
+        self.abiertos = ListaAbiertos(desempate)
+        # Tablas de distancias de empuje precalculadas una vez por nivel; con `patrones`
+        # se suma la base de datos de patrones de pares de cajas
+        self.motor_heuristico = self.nivel.tabla(MotorPatrones if patrones else MotorHeuristico)
+
     def heuristica(self, estado):
         """
-        Calcula la heurística del estado (distancia de Manhattan de cada caja al objetivo más cercano).
+        Calcula la heurística del estado (mínimo de empujes asignando cada caja a un objetivo distinto).
         """
-        total_distancia = 0
-        for caja in estado['cajas']:
-            distancias = [abs(caja[0] - obj[0]) + abs(caja[1] - obj[1]) for obj in estado['objetivos']]
-            total_distancia += min(distancias)
-        return total_distancia
+        return self.motor_heuristico.calcular(estado.cajas)
 
     def resolver(self):
         """
         Ejecuta la búsqueda A* para encontrar la solución.
         """
         inicio = time.time()  # Tiempo de inicio
-        
-        # Inicializar la cola de prioridad
-        heap = []
-        
-        # Estado inicial y su costo
-        g_cost = 0  # Costo inicial es 0
-        f_cost = g_cost + self.heuristica(self.estado_inicial)
-        
-        # Insertar el estado inicial en la cola de prioridad
-        heapq.heappush(heap, (f_cost, g_cost, 0, "", self.estado_inicial))  # (f, g, profundidad, camino, estado)
-        
-        # Conjunto para rastrear estados visitados
-        visited = set()
-        visited.add((self.estado_inicial['jugador'], frozenset(self.estado_inicial['cajas'])))
-        
-        while heap:
-            # Extraer el estado con el menor f(n)
-            f_cost, g_cost, profundidad, camino, estado_actual = heapq.heappop(heap)
+
+        # Operaciones de la lista de abiertos, medidas si hay telemetría de fases
+        abiertos = self.abiertos
+        insertar = self.cronometrar("cola", abiertos.insertar)
+        extraer = self.cronometrar("cola", abiertos.extraer)
+        telemetria = self.telemetria
+        presupuesto = self.presupuesto
+
+        # Índice estado → mejor nodo conocido; el costo g de cada nodo se guarda por índice.
+        # Con `verificar_colisiones` el índice usa la posición completa en lugar de la clave
+        indice = {}
+        costos = array("l")
+        estados = {}
+        exacto = self.verificar_colisiones
+
+        def abrir(nodo, estado, g_cost, h_cost):
+            indice[estado if exacto else estado.clave] = nodo
+            while len(costos) <= nodo:
+                costos.append(0)
+            costos[nodo] = g_cost
+            estados[nodo] = estado
+            insertar(nodo, g_cost + h_cost, g_cost)
+
+        # Estado inicial, con costo 0
+        h_cost = self.heuristica(self.estado_inicial)
+        if h_cost < float('inf'):
+            abrir(self.nodo_inicial, self.estado_inicial, 0, h_cost)
+
+        while abiertos:
+            # Extraer el nodo con el menor f(n)
+            f_cost, nodo = extraer()
+            estado_actual = estados.pop(nodo)
+            # Descartar los nodos superados por otro más barato del mismo estado
+            if indice[estado_actual if exacto else estado_actual.clave] != nodo:
+                continue
+            g_cost = costos[nodo]
             self.nodos_cerrados += 1  # Incrementar nodos cerrados
-            
+            if telemetria is not None:
+                telemetria.progreso(self, len(abiertos), len(indice), f_cost)
+            if presupuesto is not None and self.agotado():
+                print("Presupuesto agotado, deteniendo la búsqueda.")
+                break
+
             # Actualizar la profundidad máxima alcanzada
-            if profundidad > self.profundidad_maxima:
-                self.profundidad_maxima = profundidad
-            
+            if g_cost > self.profundidad_maxima:
+                self.profundidad_maxima = g_cost
+
             # Verificar si hemos alcanzado el objetivo
             if self.es_estado_objetivo(estado_actual):
                 fin = time.time()
                 self.tiempo_total = fin - inicio
                 print(f"Solución encontrada en {self.tiempo_total:.2f} segundos")
-                return super().preparar_respuesta(camino)
+                return super().preparar_respuesta(nodo)
 
-            # Generar nuevos estados (movimientos válidos)
+            nuevo_g_cost = g_cost + 1  # Cada movimiento tiene un costo de 1
             for nuevo_estado, direccion in self.generar_movimientos(estado_actual):
-                estado_clave = (nuevo_estado['jugador'], frozenset(nuevo_estado['cajas']))
-                
-                # Si el estado no ha sido visitado, agrégalo a la cola y a los visitados
-                if estado_clave not in visited:
-                    visited.add(estado_clave)
-                    nuevo_g_cost = g_cost + 1  # Cada movimiento tiene un costo de 1
-                    nuevo_f_cost = nuevo_g_cost + self.heuristica(nuevo_estado)
-                    heapq.heappush(heap, (nuevo_f_cost, nuevo_g_cost, profundidad + 1, camino + direccion, nuevo_estado))
-                    self.nodos_abiertos += 1  # Incrementar nodos abiertos
+                # Un estado conocido solo se vuelve a abrir si se llega con menor costo: si
+                # sigue abierto equivale a bajar su clave, y si estaba cerrado se reabre
+                anterior = indice.get(nuevo_estado if exacto else nuevo_estado.clave)
+                if anterior is not None and costos[anterior] <= nuevo_g_cost:
+                    continue
+
+                h_cost = self.heuristica(nuevo_estado)
+                # Una heurística infinita indica que alguna caja ya no puede llegar a un objetivo
+                if h_cost == float('inf'):
+                    self.nodos_podados += 1
+                    continue
+
+                abrir(self.nodos.agregar(nodo, direccion), nuevo_estado, nuevo_g_cost, h_cost)
+                self.nodos_abiertos += 1  # Incrementar nodos abiertos
 
         # Si no se encuentra solución
         fin = time.time()
         self.tiempo_total = fin - inicio
-        return super().preparar_respuesta(None)
\ No newline at end of file
+        return super().preparar_respuesta(None)
@@ -13,14 +13,14 @@ class BFSStrategy(Strategy):
 	- **Desventaja:** Consume mucha memoria, ya que debe almacenar todos los nodos de cada nivel antes de pasar al siguiente, lo que puede ser ineficiente en problemas de gran escala.
     """
 
-    def __init__(self, mapa):
-        super().__init__(mapa)
-        # Cola para la búsqueda en amplitud, incluye el camino recorrido y la profundidad
-        self.queue = deque([(self.estado_inicial, "", 0)])  # (estado, camino, profundidad)
+    def __init__(self, mapa, **opciones):
+        super().__init__(mapa, **opciones)
+        # Cola para la búsqueda en amplitud, incluye el nodo en el almacén y la profundidad
+        self.queue = deque([(self.estado_inicial, self.nodo_inicial, 0)])  # (estado, nodo, profundidad)
         # Conjunto para mantener los estados visitados
-        self.visited = set()
+        self.visited = self.crear_visitados()
         # Agregar el estado inicial a los visitados
-        self.visited.add((self.estado_inicial["jugador"], frozenset(self.estado_inicial["cajas"])))
+        self.visited.add(self.estado_inicial)
 
     def resolver(self):
         """
@@ -28,10 +28,20 @@ class BFSStrategy(Strategy):
         """
         # Iniciar el tiempo de cálculo
         inicio = time.time()
+        telemetria = self.telemetria
+        presupuesto = self.presupuesto
+        # Operaciones de la cola, medidas si hay telemetría de fases
+        desencolar = self.cronometrar("cola", self.queue.popleft)
+        encolar = self.cronometrar("cola", self.queue.append)
         
         while self.queue:
-            estado_actual, camino, profundidad = self.queue.popleft()
+            estado_actual, nodo, profundidad = desencolar()
             self.nodos_cerrados += 1  # Incrementar los nodos cerrados
+            if telemetria is not None:
+                telemetria.progreso(self, len(self.queue), len(self.visited), profundidad)
+            if presupuesto is not None and self.agotado():
+                print("Presupuesto agotado, deteniendo la búsqueda.")
+                break
             
             # Actualizar la profundidad máxima alcanzada
             if profundidad > self.profundidad_maxima:
@@ -42,16 +52,14 @@ class BFSStrategy(Strategy):
                 fin = time.time()
                 self.tiempo_total = fin - inicio
                 print(f"Solución encontrada en {self.tiempo_total:.2f} segundos")
-                return super().preparar_respuesta(camino)
+                return super().preparar_respuesta(nodo)
 
             # Generar nuevos estados (movimientos válidos)
             for nuevo_estado, direccion in self.generar_movimientos(estado_actual):
-                estado_clave = (nuevo_estado["jugador"], frozenset(nuevo_estado["cajas"]))
-
                 # Si el estado no ha sido visitado, agrégalo a la cola y a los visitados
-                if estado_clave not in self.visited:
-                    self.visited.add(estado_clave)
-                    self.queue.append((nuevo_estado, camino + direccion, profundidad + 1))  # (estado, camino, profundidad)
+                if nuevo_estado not in self.visited:
+                    self.visited.add(nuevo_estado)
+                    encolar((nuevo_estado, self.nodos.agregar(nodo, direccion), profundidad + 1))  # (estado, nodo, profundidad)
                     self.nodos_abiertos += 1  # Incrementar los nodos abiertos
 
         # Si no se encuentra solución
@@ -0,0 +1,229 @@
+import os
+import mmap
+import time
+import heapq
+import struct
+import tempfile
+from strategies.strategy import Strategy
+from strategies.nivel import Estado, tablero_de_bits
+
+# Memoria máxima predeterminada para los estados generados en RAM (256 MiB)
+MEMORIA_MAXIMA = 256 * 1024 * 1024
+# Sobrecosto aproximado de cada registro en una lista de Python (objeto bytes y puntero)
+SOBRECOSTO_REGISTRO = 64
+
+
+class ExternalBFSStrategy(Strategy):
+    """
+    ## Búsqueda en Amplitud en memoria externa (BFS externo)
+
+    - **Objetivo:** Resolver con BFS niveles cuyo espacio de estados no cabe en memoria, cambiando memoria por disco.
+    - **Método:** Cada capa (todos los estados a la misma distancia) se guarda en un archivo binario de registros de tamaño fijo, ordenados. Los sucesores de una capa se acumulan en memoria hasta `memoria_maxima` y se vuelcan ordenados a archivos temporales; al terminar la capa se fusionan esos archivos y se descartan los estados ya vistos recorriendo en paralelo el archivo ordenado de visitados (detección diferida de duplicados). Los archivos se leen con mmap.
+    - **Optimalidad:** Igual que BFS: la primera capa que contiene un estado objetivo da la solución más corta.
+    - **Ventaja:** La memoria usada está acotada por `memoria_maxima`; lo que antes se quedaba sin memoria ahora termina, más lento.
+    - **Desventaja:** Cada capa vuelve a recorrer el archivo de visitados completo, así que el costo de disco crece con el número de capas.
+    """
+
+    def __init__(self, mapa, memoria_maxima=MEMORIA_MAXIMA, directorio=None, **opciones):
+        super().__init__(mapa, **opciones)
+        self.directorio = directorio
+        self.temporal = None  # Directorio temporal de la búsqueda en curso
+
+        # Registro: clave Zobrist, jugador y cajas (la identidad del estado, en big-endian
+        # para que el orden de los bytes sea el orden numérico), clave del padre y movimiento
+        celda = "H" if len(self.nivel.paredes) <= 0xFFFF else "I"
+        self.formato = struct.Struct(f">Q{1 + len(self.estado_inicial.cajas)}{celda}QI")
+        self.tamano_registro = self.formato.size
+        self.tamano_identidad = self.tamano_registro - struct.calcsize(">QI")
+        self.limite_registros = max(1, memoria_maxima // (self.tamano_registro + SOBRECOSTO_REGISTRO))
+
+    def codificar(self, estado, clave_padre, movimiento):
+        jugador, cajas, clave, _ = estado
+        return self.formato.pack(clave, jugador, *cajas, clave_padre, movimiento)
+
+    def decodificar(self, registro):
+        """
+        Devuelve el estado del registro, la clave de su padre y el movimiento que lo generó.
+        La ocupación de las cajas no se guarda en el registro y se reconstruye aquí.
+        """
+        clave, jugador, *cajas, clave_padre, movimiento = self.formato.unpack(registro)
+        return Estado(jugador, tuple(cajas), clave, tablero_de_bits(cajas)), clave_padre, movimiento
+
+    def leer(self, ruta, tamano):
+        """
+        Recorre los registros de tamaño fijo de un archivo mapeado en memoria.
+        """
+        if os.path.getsize(ruta) == 0:
+            return
+        with open(ruta, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as datos:
+            for posicion in range(0, len(datos), tamano):
+                yield datos[posicion:posicion + tamano]
+
+    def volcar(self, registros, rutas):
+        """
+        Ordena los registros en memoria, elimina duplicados y los escribe en un archivo nuevo.
+        """
+        registros.sort()
+        ruta = os.path.join(self.temporal, f"corrida{len(rutas)}.bin")
+        with open(ruta, "wb") as f:
+            anterior = None
+            for registro in registros:
+                identidad = registro[:self.tamano_identidad]
+                if identidad != anterior:
+                    f.write(registro)
+                    anterior = identidad
+        rutas.append(ruta)
+
+    def fusionar(self, corridas, ruta_visitados, ruta_capa):
+        """
+        Fusiona las corridas ordenadas en la nueva capa, sin los estados ya visitados, y
+        agrega la capa al archivo de visitados. Devuelve la cantidad de estados nuevos.
+        """
+        n = self.tamano_identidad
+        visitados = self.leer(ruta_visitados, n)
+        visitado = next(visitados, None)
+        ruta_fusion = ruta_visitados + ".nuevo"
+        nuevos = 0
+
+        with open(ruta_capa, "wb") as capa, open(ruta_fusion, "wb") as fusion:
+            anterior = None
+            for registro in heapq.merge(*(self.leer(ruta, self.tamano_registro) for ruta in corridas)):
+                identidad = registro[:n]
+                if identidad == anterior:
+                    continue
+                anterior = identidad
+
+                # Avanzar en los visitados (también ordenados) copiándolos a la fusión
+                while visitado is not None and visitado < identidad:
+                    fusion.write(visitado)
+                    visitado = next(visitados, None)
+                if visitado == identidad:
+                    continue
+
+                capa.write(registro)
+                fusion.write(identidad)
+                nuevos += 1
+
+            while visitado is not None:
+                fusion.write(visitado)
+                visitado = next(visitados, None)
+
+        os.replace(ruta_fusion, ruta_visitados)
+        for ruta in corridas:
+            os.remove(ruta)
+        return nuevos
+
+    def buscar(self, ruta, clave):
+        """
+        Busca (búsqueda binaria sobre el archivo mapeado) los registros de una capa con la
+        clave dada; puede haber más de uno si dos estados comparten clave.
+        """
+        tamano = self.tamano_registro
+        objetivo = struct.pack(">Q", clave)
+        with open(ruta, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as datos:
+            bajo, alto = 0, len(datos) // tamano
+            while bajo < alto:
+                medio = (bajo + alto) // 2
+                if datos[medio * tamano:medio * tamano + 8] < objetivo:
+                    bajo = medio + 1
+                else:
+                    alto = medio
+            encontrados = []
+            while bajo * tamano < len(datos) and datos[bajo * tamano:bajo * tamano + 8] == objetivo:
+                encontrados.append(datos[bajo * tamano:(bajo + 1) * tamano])
+                bajo += 1
+        return encontrados
+
+    def reconstruir_nodo(self, capas, registro):
+        """
+        Recorre las capas hacia atrás desde el registro objetivo buscando cada padre por su
+        clave, y carga la secuencia de movimientos en el almacén de nodos.
+        """
+        # Las expansiones para verificar candidatos no cuentan en las métricas
+        generados, podados = self.nodos_generados, self.nodos_podados
+        secuencia = []
+        estado, clave_padre, movimiento = self.decodificar(registro)
+
+        for ruta in reversed(capas[:-1]):
+            secuencia.append(movimiento)
+            # Entre los candidatos con la clave del padre, el que genera este estado
+            for candidato in self.buscar(ruta, clave_padre):
+                padre, clave_abuelo, movimiento_padre = self.decodificar(candidato)
+                if any(
+                    nuevo[:2] == estado[:2] and nuevo_movimiento == movimiento
+                    for nuevo, nuevo_movimiento in self.generar_movimientos(padre)
+                ):
+                    break
+            estado, clave_padre, movimiento = padre, clave_abuelo, movimiento_padre
+        self.nodos_generados, self.nodos_podados = generados, podados
+
+        nodo = self.nodo_inicial
+        for movimiento in reversed(secuencia):
+            nodo = self.nodos.agregar(nodo, movimiento)
+        return nodo
+
+    def resolver(self):
+        """
+        Ejecuta la búsqueda en amplitud capa por capa, con las capas en disco.
+        """
+        # Iniciar el tiempo de cálculo
+        inicio = time.time()
+
+        with tempfile.TemporaryDirectory(prefix="bfs-externo-", dir=self.directorio) as temporal:
+            self.temporal = temporal
+            ruta_visitados = os.path.join(temporal, "visitados.bin")
+            capas = [os.path.join(temporal, "capa0.bin")]
+
+            registro_inicial = self.codificar(self.estado_inicial, 0, 0)
+            with open(capas[0], "wb") as f:
+                f.write(registro_inicial)
+            with open(ruta_visitados, "wb") as f:
+                f.write(registro_inicial[:self.tamano_identidad])
+
+            while True:
+                corridas = []
+                registros = []
+
+                for registro in self.leer(capas[-1], self.tamano_registro):
+                    estado_actual = self.decodificar(registro)[0]
+                    self.nodos_cerrados += 1  # Incrementar los nodos cerrados
+                    if self.telemetria is not None:
+                        self.telemetria.progreso(self, len(registros), self.nodos_abiertos, len(capas) - 1)
+                    if self.presupuesto is not None and self.agotado():
+                        print("Presupuesto agotado, deteniendo la búsqueda.")
+                        break
+
+                    # Verificar si hemos alcanzado el objetivo
+                    if self.es_estado_objetivo(estado_actual):
+                        nodo = self.reconstruir_nodo(capas, registro)
+                        fin = time.time()
+                        self.tiempo_total = fin - inicio
+                        print(f"Solución encontrada en {self.tiempo_total:.2f} segundos")
+                        return super().preparar_respuesta(nodo)
+
+                    for nuevo_estado, movimiento in self.generar_movimientos(estado_actual):
+                        registros.append(self.codificar(nuevo_estado, estado_actual.clave, movimiento))
+                        # Al llegar al límite de memoria se vuelca una corrida ordenada a disco
+                        if len(registros) >= self.limite_registros:
+                            self.volcar(registros, corridas)
+                            registros = []
+
+                if self.presupuesto_agotado:
+                    break
+                if registros:
+                    self.volcar(registros, corridas)
+                    registros = []
+                if not corridas:
+                    break
+
+                capas.append(os.path.join(temporal, f"capa{len(capas)}.bin"))
+                nuevos = self.fusionar(corridas, ruta_visitados, capas[-1])
+                if nuevos == 0:
+                    break
+                self.nodos_abiertos += nuevos
+                self.profundidad_maxima = len(capas) - 1
+
+        # Si no se encuentra solución
+        fin = time.time()
+        self.tiempo_total = fin - inicio
+        return super().preparar_respuesta(None)
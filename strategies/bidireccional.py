@@ -0,0 +1,187 @@
+import time
+from strategies.strategy import Strategy, MODO_EMPUJES
+from strategies.nivel import Estado
+
+
+class BidirectionalStrategy(Strategy):
+    """
+    ## Búsqueda bidireccional (empujes hacia adelante, tirones hacia atrás)
+
+    - **Objetivo:** Reducir el tamaño de la frontera de BFS buscando a la vez desde el estado inicial y desde los estados finales, de modo que cada búsqueda solo llegue a la mitad de la profundidad.
+    - **Método:** Hacia adelante se generan empujes desde el estado inicial; hacia atrás, tirones de caja desde los estados finales (cajas en los objetivos y el jugador en cualquiera de las regiones junto a ellas). En ambos sentidos el jugador se normaliza a la menor celda de su región, así que un mismo estado tiene la misma clave Zobrist en las dos búsquedas y el encuentro se detecta buscando la clave en la tabla del otro lado. En cada paso se expande una capa completa de la frontera más pequeña.
+    - **Optimalidad:** Se sigue expandiendo hasta que la suma de las profundidades alcanzadas no puede mejorar el mejor encuentro, por lo que la solución tiene el mínimo de empujes (no de pasos).
+    - **Ventaja:** Cada frontera crece solo hasta la mitad de la profundidad de la solución, lo que en niveles profundos reduce mucho los estados explorados.
+    - **Desventaja:** La búsqueda hacia atrás no puede usar la poda de bloqueos y parte de varios estados finales, uno por región del jugador.
+    """
+
+    def __init__(self, mapa, **opciones):
+        # La búsqueda hacia atrás solo tiene sentido en el espacio de empujes
+        opciones.pop("modo", None)
+        super().__init__(mapa, modo=MODO_EMPUJES, **opciones)
+
+    def estados_finales(self):
+        """
+        Genera los estados finales: las cajas en los objetivos y el jugador en cada una de
+        las regiones libres vecinas a alguna caja.
+        """
+        cajas = self.nivel.objetivos
+        ocupadas = set(cajas)
+        paredes = self.nivel.paredes
+        vistas = bytearray(len(paredes))
+        finales = []
+
+        for caja in cajas:
+            for delta in self.nivel.desplazamientos:
+                celda = caja + delta
+                if paredes[celda] or celda in ocupadas or vistas[celda]:
+                    continue
+                alcanzables, canonica = self.nivel.region(celda, ocupadas)
+                for indice, alcanzable in enumerate(alcanzables):
+                    if alcanzable:
+                        vistas[indice] = 1
+                finales.append(Estado(canonica, cajas, self.nivel.clave(canonica, cajas), self.tablero.objetivos))
+
+        return finales
+
+    def generar_tirones(self, estado):
+        """
+        Genera los predecesores del estado tirando de cada caja: el jugador, junto a la caja,
+        retrocede una celda arrastrándola. Devuelve cada predecesor con el empuje (hacia
+        adelante) que lleva de él al estado, codificado como `caja * 4 + direccion`.
+        """
+        movimientos = []
+        jugador, cajas, clave, ocupacion = estado
+        zobrist_jugador = self.nivel.zobrist_jugador
+        tirones = self.tablero.tirones
+        ocupadas = set(cajas)
+        alcanzables, _ = self.nivel.region(jugador, ocupadas)
+
+        for indice, caja in enumerate(cajas):
+            # Direcciones en que las paredes permiten tirar de la caja
+            for direccion, junto, destino, clave_caja, bit_destino, cambio in tirones[caja]:
+                # El jugador se para en `junto` y retrocede a `destino`, que debe estar libre
+                if not alcanzables[junto] or ocupacion & bit_destino:
+                    continue
+
+                nuevas_cajas = list(cajas)
+                nuevas_cajas[indice] = junto
+                nuevas_cajas.sort()
+
+                _, canonica = self.nivel.region(destino, set(nuevas_cajas))
+                nueva_clave = clave ^ zobrist_jugador[jugador] ^ zobrist_jugador[canonica] ^ clave_caja
+                # Hacia adelante es el empuje de la caja en `junto` en la dirección opuesta
+                # (en DIRECCIONES las opuestas son pares consecutivos: U-D y L-R)
+                nuevo_estado = Estado(canonica, tuple(nuevas_cajas), nueva_clave, ocupacion ^ cambio)
+                movimientos.append((nuevo_estado, junto * 4 + (direccion ^ 1)))
+                self.nodos_generados += 1  # Incrementar el contador de nodos generados
+
+        return movimientos
+
+    def resolver(self):
+        """
+        Ejecuta la búsqueda bidireccional para encontrar la solución con menos empujes.
+        """
+        # Iniciar el tiempo de cálculo
+        inicio = time.time()
+
+        # Tablas de cada búsqueda indexadas por clave:
+        # adelante: clave -> (estado, nodo, profundidad)
+        # atras: clave -> (estado, clave del estado siguiente hacia el final, empuje, profundidad)
+        adelante = {self.estado_inicial.clave: (self.estado_inicial, self.nodo_inicial, 0)}
+        atras = {estado.clave: (estado, None, None, 0) for estado in self.estados_finales()}
+        frontera_adelante = [self.estado_inicial]
+        frontera_atras = list(atras[clave][0] for clave in atras)
+        profundidad_adelante = profundidad_atras = 0
+        telemetria = self.telemetria
+        presupuesto = self.presupuesto
+        generar_tirones = self.cronometrar("sucesores", self.generar_tirones)
+
+        # Mejor encuentro: (empujes totales, nodo hacia adelante, clave hacia atrás)
+        mejor = None
+        if self.es_estado_objetivo(self.estado_inicial):
+            # El nivel ya está resuelto; el jugador puede estar en una región sin cajas vecinas
+            frontera_adelante = []
+
+        # Ningún camino aún no encontrado puede tener menos de profundidad_adelante + profundidad_atras + 1 empujes
+        while frontera_adelante and frontera_atras:
+            if mejor is not None and mejor[0] <= profundidad_adelante + profundidad_atras + 1:
+                break
+
+            siguiente = []
+            if len(frontera_adelante) <= len(frontera_atras):
+                # Expandir una capa hacia adelante con empujes
+                for estado in frontera_adelante:
+                    self.nodos_cerrados += 1
+                    if telemetria is not None:
+                        telemetria.progreso(
+                            self, len(frontera_adelante) + len(frontera_atras), len(adelante) + len(atras),
+                            profundidad_adelante + profundidad_atras,
+                        )
+                    if presupuesto is not None and self.agotado():
+                        break
+                    nodo = adelante[estado.clave][1]
+                    for nuevo_estado, movimiento in self.generar_movimientos(estado):
+                        if nuevo_estado.clave in adelante:
+                            continue
+                        nuevo_nodo = self.nodos.agregar(nodo, movimiento)
+                        adelante[nuevo_estado.clave] = (nuevo_estado, nuevo_nodo, profundidad_adelante + 1)
+                        siguiente.append(nuevo_estado)
+                        self.nodos_abiertos += 1
+
+                        encuentro = atras.get(nuevo_estado.clave)
+                        if encuentro is not None and encuentro[0][:2] == nuevo_estado[:2]:
+                            total = profundidad_adelante + 1 + encuentro[3]
+                            if mejor is None or total < mejor[0]:
+                                mejor = (total, nuevo_nodo, nuevo_estado.clave)
+                frontera_adelante = siguiente
+                profundidad_adelante += 1
+            else:
+                # Expandir una capa hacia atrás con tirones
+                for estado in frontera_atras:
+                    self.nodos_cerrados += 1
+                    if telemetria is not None:
+                        telemetria.progreso(
+                            self, len(frontera_adelante) + len(frontera_atras), len(adelante) + len(atras),
+                            profundidad_adelante + profundidad_atras,
+                        )
+                    if presupuesto is not None and self.agotado():
+                        break
+                    for nuevo_estado, movimiento in generar_tirones(estado):
+                        if nuevo_estado.clave in atras:
+                            continue
+                        atras[nuevo_estado.clave] = (nuevo_estado, estado.clave, movimiento, profundidad_atras + 1)
+                        siguiente.append(nuevo_estado)
+                        self.nodos_abiertos += 1
+
+                        encuentro = adelante.get(nuevo_estado.clave)
+                        if encuentro is not None and encuentro[0][:2] == nuevo_estado[:2]:
+                            total = encuentro[2] + profundidad_atras + 1
+                            if mejor is None or total < mejor[0]:
+                                mejor = (total, encuentro[1], nuevo_estado.clave)
+                frontera_atras = siguiente
+                profundidad_atras += 1
+
+            self.profundidad_maxima = profundidad_adelante + profundidad_atras
+            if self.presupuesto_agotado:
+                # Un encuentro parcial no garantiza el mínimo de empujes, así que se descarta
+                print("Presupuesto agotado, deteniendo la búsqueda.")
+                mejor = None
+                break
+
+        if mejor is None and (self.presupuesto_agotado or not self.es_estado_objetivo(self.estado_inicial)):
+            fin = time.time()
+            self.tiempo_total = fin - inicio
+            return super().preparar_respuesta(None)
+
+        # Unir las dos mitades: la rama hacia adelante continúa con los empujes hacia atrás
+        _, nodo, clave = mejor or (0, self.nodo_inicial, None)
+        while clave is not None:
+            _, clave, movimiento, _ = atras[clave]
+            if clave is None:
+                break
+            nodo = self.nodos.agregar(nodo, movimiento)
+
+        fin = time.time()
+        self.tiempo_total = fin - inicio
+        print(f"Solución encontrada en {self.tiempo_total:.2f} segundos")
+        return super().preparar_respuesta(nodo)
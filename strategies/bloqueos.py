@@ -0,0 +1,124 @@
+from strategies.tablero import Tablero
+
+
+class DetectorBloqueos():
+    """
+    Detección de bloqueos (deadlocks): estados desde los que ya no es posible resolver el nivel.
+
+    - **Celdas muertas:** se precalculan una vez por nivel tirando (empuje inverso) de una caja
+      desde cada objetivo. Toda celda libre a la que no se llega así es una celda desde la que
+      ninguna caja puede alcanzar un objetivo.
+    - **Cajas congeladas:** tras cada empuje se comprueba si la caja movida quedó inmóvil en
+      ambos ejes (por paredes, celdas muertas u otras cajas congeladas) fuera de un objetivo.
+    - **Bloques 2x2:** cuatro celdas formando un cuadrado, todas paredes o cajas, con alguna
+      caja fuera de un objetivo.
+    """
+
+    def __init__(self, nivel, celdas_muertas=None):
+        self.nivel = nivel
+        # El tablero compilado se pide al primer uso: cargar un nivel no lo necesita
+        self.tablero = None
+        # Las celdas muertas se pueden recibir ya calculadas (cache de niveles compilados)
+        self.celdas_muertas = celdas_muertas if celdas_muertas is not None else self.calcular_celdas_muertas()
+
+    def calcular_celdas_muertas(self):
+        """
+        Marca como muertas las celdas libres a las que no puede llegar una caja tirando
+        de ella desde algún objetivo.
+        """
+        paredes = self.nivel.paredes
+        vivas = bytearray(len(paredes))
+        pendientes = list(self.nivel.objetivos)
+        for objetivo in pendientes:
+            vivas[objetivo] = 1
+
+        while pendientes:
+            caja = pendientes.pop()
+            for delta in self.nivel.desplazamientos:
+                # Para tirar de la caja hacia `destino` el jugador necesita la celda siguiente libre
+                destino = caja + delta
+                if not vivas[destino] and not paredes[destino] and not paredes[destino + delta]:
+                    vivas[destino] = 1
+                    pendientes.append(destino)
+
+        return bytearray(
+            1 if not paredes[celda] and not vivas[celda] else 0 for celda in range(len(paredes))
+        )
+
+    def es_bloqueo(self, ocupacion, caja):
+        """
+        Verifica si el empuje que dejó una caja en `caja` produce un bloqueo.
+        `ocupacion` es el tablero de bits de las cajas después del empuje.
+        """
+        if self.celdas_muertas[caja]:
+            return True
+        return self.es_bloque_2x2(ocupacion, caja) or self.es_congelada(ocupacion, caja)
+
+    def es_bloque_2x2(self, ocupacion, caja):
+        """
+        Verifica si la caja forma un cuadrado 2x2 de paredes y cajas con alguna caja fuera
+        de un objetivo.
+        """
+        tablero = self.tablero
+        if tablero is None:
+            tablero = self.tablero = self.nivel.tabla(Tablero)
+        llenas = ocupacion | tablero.paredes
+        fuera_de_objetivo = ocupacion & ~tablero.objetivos
+
+        # Cada bloque es una máscara de bits: lleno si todas sus celdas son pared o caja
+        for bloque in tablero.cuadrados[caja]:
+            if llenas & bloque == bloque and fuera_de_objetivo & bloque:
+                return True
+        return False
+
+    def es_congelada(self, ocupacion, caja):
+        """
+        Verifica si la caja quedó congelada junto con otras cajas y alguna de ellas no está
+        en un objetivo.
+        """
+        congeladas = []
+        if not self._congelada(caja, ocupacion, set(), congeladas):
+            return False
+        return any(not self.nivel.es_objetivo[celda] for celda in congeladas)
+
+    def _congelada(self, caja, ocupacion, como_pared, congeladas):
+        """
+        Una caja está congelada si está bloqueada en el eje horizontal y en el vertical.
+        Mientras se evalúa, la caja cuenta como pared para las cajas vecinas.
+        """
+        ancho = self.nivel.ancho
+        longitud = len(congeladas)
+        como_pared.add(caja)
+        congelada = (
+            self._bloqueada_en_eje(caja, 1, ocupacion, como_pared, congeladas)
+            and self._bloqueada_en_eje(caja, ancho, ocupacion, como_pared, congeladas)
+        )
+        como_pared.discard(caja)
+
+        if congelada:
+            congeladas.append(caja)
+        else:
+            # Las cajas dadas por congeladas suponiendo que esta lo estaba dejan de serlo
+            del congeladas[longitud:]
+        return congelada
+
+    def _bloqueada_en_eje(self, caja, delta, ocupacion, como_pared, congeladas):
+        """
+        Verifica si la caja no puede moverse en el eje dado por `delta`.
+        """
+        paredes = self.nivel.paredes
+        anterior, siguiente = caja - delta, caja + delta
+
+        # Una pared (o una caja tratada como pared) a cualquier lado
+        if paredes[anterior] or paredes[siguiente] or anterior in como_pared or siguiente in como_pared:
+            return True
+
+        # Celdas muertas a ambos lados: moverla en este eje también es un bloqueo
+        if self.celdas_muertas[anterior] and self.celdas_muertas[siguiente]:
+            return True
+
+        # Una caja vecina que a su vez está congelada
+        for vecina in (anterior, siguiente):
+            if ocupacion >> vecina & 1 and self._congelada(vecina, ocupacion, como_pared, congeladas):
+                return True
+        return False
@@ -0,0 +1,198 @@
+import os
+import json
+import sqlite3
+import hashlib
+
+from strategies.nivel import Nivel
+
+# Ubicación predeterminada de la base de datos de soluciones
+RUTA_CACHE = os.path.join(os.path.expanduser("~"), ".cache", "sokoban-solver", "soluciones.sqlite")
+
+# Vector (dx, dy) de cada dirección LURD
+VECTORES = {"U": (0, -1), "D": (0, 1), "L": (-1, 0), "R": (1, 0)}
+DIRECCION_DE_VECTOR = {vector: direccion for direccion, vector in VECTORES.items()}
+
+# Opciones de las estrategias que no cambian la solución: objetos de la ejecución (cuyo
+# texto incluye una dirección de memoria) y recursos como memoria, disco o procesos
+OPCIONES_DE_EJECUCION = (
+    "telemetria", "presupuesto", "al_mejorar", "tabla_transposicion",
+    "memoria_maxima", "directorio", "procesos",
+)
+
+
+def tablero_canonico(nivel):
+    """
+    Reconstruye el tablero del nivel como lista de cadenas, normalizado: todo lo que no
+    alcanza el jugador (ni es caja u objetivo) pasa a ser pared y se recorta al rectángulo
+    mínimo con un borde de pared. Así los espacios finales, las filas irregulares o el
+    piso exterior no cambian la clave.
+    """
+    jugador, cajas, _, _ = nivel.estado_inicial
+    cajas = set(cajas)
+    alcanzables, _ = nivel.region(jugador, set())
+    dentro = [
+        celda for celda in range(len(nivel.paredes))
+        if alcanzables[celda] or celda in cajas or nivel.es_objetivo[celda]
+    ]
+
+    coordenadas = [nivel.coordenadas(celda) for celda in dentro]
+    x_min = min(x for x, _ in coordenadas) - 1
+    x_max = max(x for x, _ in coordenadas) + 1
+    y_min = min(y for _, y in coordenadas) - 1
+    y_max = max(y for _, y in coordenadas) + 1
+    dentro = set(dentro)
+
+    filas = []
+    for y in range(y_min, y_max + 1):
+        fila = []
+        for x in range(x_min, x_max + 1):
+            celda = y * nivel.ancho + x
+            if not (0 <= x < nivel.ancho and 0 <= y < nivel.alto) or celda not in dentro:
+                fila.append("#")
+            elif celda == jugador:
+                fila.append("+" if nivel.es_objetivo[celda] else "@")
+            elif celda in cajas:
+                fila.append("*" if nivel.es_objetivo[celda] else "$")
+            else:
+                fila.append("." if nivel.es_objetivo[celda] else " ")
+        filas.append("".join(fila))
+    return filas
+
+
+def transformaciones(filas):
+    """
+    Produce las 8 simetrías del tablero (rotaciones y reflejos) como pares (filas,
+    traducción), donde la traducción lleva cada dirección LURD del tablero original a
+    la del tablero transformado.
+    """
+    traduccion = {direccion: direccion for direccion in VECTORES}
+    for reflejado in (False, True):
+        if reflejado:
+            # Reflejo horizontal: (dx, dy) -> (-dx, dy)
+            filas = [fila[::-1] for fila in filas]
+            traduccion = {
+                original: DIRECCION_DE_VECTOR[(-VECTORES[d][0], VECTORES[d][1])]
+                for original, d in traduccion.items()
+            }
+        for _ in range(4):
+            yield filas, traduccion
+            # Rotación de 90°: la celda (x, y) pasa a (alto - 1 - y, x) y (dx, dy) a (-dy, dx)
+            alto = len(filas)
+            filas = ["".join(filas[alto - 1 - y][x] for y in range(alto)) for x in range(len(filas[0]))]
+            traduccion = {
+                original: DIRECCION_DE_VECTOR[(-VECTORES[d][1], VECTORES[d][0])]
+                for original, d in traduccion.items()
+            }
+
+
+class CacheSoluciones():
+    """
+    Cache persistente de soluciones en SQLite, indexada por el contenido normalizado del
+    nivel, la estrategia y sus opciones.
+
+    - **Clave:** hash SHA-256 del tablero canónico (ver `tablero_canonico`). Con
+      `simetrias=True` se elige la menor de sus 8 rotaciones y reflejos, de modo que un
+      nivel girado o espejado reutiliza la solución; el camino se guarda en la orientación
+      canónica y se traduce al recuperarlo.
+    - **Tamaño acotado:** cada acceso actualiza un contador de uso y, al superar
+      `max_entradas`, se eliminan las soluciones usadas hace más tiempo (LRU).
+    - Solo se guardan soluciones encontradas: un resultado sin camino puede deberse a un
+      límite de tiempo y no se recuerda.
+    """
+
+    def __init__(self, ruta=RUTA_CACHE, max_entradas=10000, simetrias=False):
+        self.max_entradas = max_entradas
+        self.simetrias = simetrias
+        if os.path.dirname(ruta):
+            os.makedirs(os.path.dirname(ruta), exist_ok=True)
+        self.conexion = sqlite3.connect(ruta)
+        self.conexion.execute(
+            "CREATE TABLE IF NOT EXISTS soluciones ("
+            "clave TEXT PRIMARY KEY, camino TEXT NOT NULL, metricas TEXT NOT NULL, uso INTEGER NOT NULL)"
+        )
+        self.conexion.execute("CREATE INDEX IF NOT EXISTS soluciones_uso ON soluciones (uso)")
+        self.conexion.commit()
+
+    def clave(self, nivel, estrategia, opciones):
+        """
+        Devuelve la clave del nivel para la estrategia y opciones dadas, y la traducción de
+        direcciones de la orientación del nivel a la canónica.
+        """
+        filas = tablero_canonico(nivel)
+        if self.simetrias:
+            filas, traduccion = min(transformaciones(filas), key=lambda transformacion: transformacion[0])
+        else:
+            traduccion = {direccion: direccion for direccion in VECTORES}
+
+        # Las opciones que solo afectan a la ejecución (no a la solución) no forman parte de la
+        # clave; el resto tiene que ser serializable para que la clave sea la misma entre ejecuciones
+        opciones = {nombre: valor for nombre, valor in opciones.items() if nombre not in OPCIONES_DE_EJECUCION}
+        try:
+            serializadas = json.dumps(opciones, sort_keys=True)
+        except TypeError as error:
+            raise TypeError(f"Opciones no válidas para la clave de la cache: {error}") from error
+        contenido = "\n".join(filas) + "\0" + estrategia + "\0" + serializadas
+        return hashlib.sha256(contenido.encode()).hexdigest(), traduccion
+
+    def siguiente_uso(self):
+        return self.conexion.execute("SELECT COALESCE(MAX(uso), 0) + 1 FROM soluciones").fetchone()[0]
+
+    def obtener(self, nivel, estrategia, opciones):
+        """
+        Devuelve la respuesta guardada para el nivel, con el camino en su orientación, o
+        None si no está en la cache.
+        """
+        clave, traduccion = self.clave(nivel, estrategia, opciones)
+        fila = self.conexion.execute(
+            "SELECT camino, metricas FROM soluciones WHERE clave = ?", (clave,)
+        ).fetchone()
+        if fila is None:
+            return None
+
+        self.conexion.execute("UPDATE soluciones SET uso = ? WHERE clave = ?", (self.siguiente_uso(), clave))
+        self.conexion.commit()
+
+        inversa = {canonica: original for original, canonica in traduccion.items()}
+        respuesta = json.loads(fila[1])
+        respuesta["camino"] = "".join(inversa[direccion] for direccion in fila[0])
+        respuesta["desde_cache"] = True
+        return respuesta
+
+    def guardar(self, nivel, estrategia, opciones, respuesta):
+        """
+        Guarda la respuesta de una estrategia, con el camino en la orientación canónica.
+        """
+        # Una búsqueda cortada por el presupuesto no es la respuesta completa de la estrategia
+        if respuesta["camino"] is None or respuesta.get("presupuesto_agotado"):
+            return
+
+        clave, traduccion = self.clave(nivel, estrategia, opciones)
+        camino = "".join(traduccion[direccion] for direccion in respuesta["camino"])
+        metricas = {nombre: valor for nombre, valor in respuesta.items() if nombre not in ("camino", "desde_cache")}
+
+        self.conexion.execute(
+            "INSERT OR REPLACE INTO soluciones (clave, camino, metricas, uso) VALUES (?, ?, ?, ?)",
+            (clave, camino, json.dumps(metricas), self.siguiente_uso()),
+        )
+        # Desalojar las soluciones usadas hace más tiempo si se superó el tamaño máximo
+        self.conexion.execute(
+            "DELETE FROM soluciones WHERE clave IN ("
+            "SELECT clave FROM soluciones ORDER BY uso LIMIT MAX(0, (SELECT COUNT(*) FROM soluciones) - ?))",
+            (self.max_entradas,),
+        )
+        self.conexion.commit()
+
+    def resolver(self, estrategia, mapa, **opciones):
+        """
+        Devuelve la solución de la cache o, si no está, resuelve el nivel con la clase de
+        estrategia dada y guarda el resultado.
+        """
+        nivel = mapa if isinstance(mapa, Nivel) else Nivel(mapa)
+        respuesta = self.obtener(nivel, estrategia.__name__, opciones)
+        if respuesta is None:
+            respuesta = estrategia(nivel, **opciones).resolver()
+            self.guardar(nivel, estrategia.__name__, opciones, respuesta)
+        return respuesta
+
+    def cerrar(self):
+        self.conexion.close()
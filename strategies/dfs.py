@@ -13,14 +13,14 @@ class DFSStrategy(Strategy):
 	- **Desventaja:** Puede quedar atrapado en ciclos o en un camino de gran profundidad, y no tiene garantía de optimalidad. Además, si el espacio de búsqueda es infinito, puede correr indefinidamente sin encontrar la solución.
     """
 
-    def __init__(self, mapa):
-        super().__init__(mapa)
-        # Pila para la búsqueda en profundidad, incluye el camino recorrido y la profundidad
-        self.stack = deque([(self.estado_inicial, "", 0)])  # (estado, camino, profundidad)
+    def __init__(self, mapa, **opciones):
+        super().__init__(mapa, **opciones)
+        # Pila para la búsqueda en profundidad, incluye el nodo en el almacén y la profundidad
+        self.stack = deque([(self.estado_inicial, self.nodo_inicial, 0)])  # (estado, nodo, profundidad)
         # Conjunto para mantener los estados visitados
-        self.visited = set()
+        self.visited = self.crear_visitados()
         # Agregar el estado inicial a los visitados
-        self.visited.add((self.estado_inicial["jugador"], frozenset(self.estado_inicial["cajas"])))
+        self.visited.add(self.estado_inicial)
 
     def resolver(self):
         """
@@ -28,10 +28,20 @@ class DFSStrategy(Strategy):
         """
         # Iniciar el tiempo de cálculo
         inicio = time.time()
+        telemetria = self.telemetria
+        presupuesto = self.presupuesto
+        # Operaciones de la pila, medidas si hay telemetría de fases
+        desapilar = self.cronometrar("cola", self.stack.pop)
+        apilar = self.cronometrar("cola", self.stack.append)
         
         while self.stack:
-            estado_actual, camino, profundidad = self.stack.pop()
+            estado_actual, nodo, profundidad = desapilar()
             self.nodos_cerrados += 1  # Incrementar los nodos cerrados
+            if telemetria is not None:
+                telemetria.progreso(self, len(self.stack), len(self.visited), profundidad)
+            if presupuesto is not None and self.agotado():
+                print("Presupuesto agotado, deteniendo la búsqueda.")
+                break
             
             # Actualizar la profundidad máxima alcanzada
             if profundidad > self.profundidad_maxima:
@@ -42,19 +52,14 @@ class DFSStrategy(Strategy):
                 fin = time.time()
                 self.tiempo_total = fin - inicio
                 print(f"Solución encontrada en {self.tiempo_total:.2f} segundos")
-                return super().preparar_respuesta(camino)
+                return super().preparar_respuesta(nodo)
 
             # Generar nuevos estados (movimientos válidos)
             for nuevo_estado, direccion in self.generar_movimientos(estado_actual):
-                estado_clave = (
-                    nuevo_estado["jugador"],
-                    frozenset(nuevo_estado["cajas"]),
-                )
-
                 # Si el estado no ha sido visitado, agrégalo a la pila y a los visitados
-                if estado_clave not in self.visited:
-                    self.visited.add(estado_clave)
-                    self.stack.append((nuevo_estado, camino + direccion, profundidad + 1))  # (estado, camino, profundidad)
+                if nuevo_estado not in self.visited:
+                    self.visited.add(nuevo_estado)
+                    apilar((nuevo_estado, self.nodos.agregar(nodo, direccion), profundidad + 1))  # (estado, nodo, profundidad)
                     self.nodos_abiertos += 1  # Incrementar los nodos abiertos
 
         # Si no se encuentra solución
@@ -0,0 +1,312 @@
+import os
+import time
+import heapq
+import multiprocessing
+from queue import Empty
+from strategies.strategy import Strategy
+from strategies.nivel import Estado
+from strategies.heuristica import MotorHeuristico
+
+# Estados que se acumulan por destino antes de enviarlos en un solo mensaje
+TAMANO_LOTE = 64
+# Nodos que expande un trabajador entre dos revisiones de su cola de mensajes
+EXPANSIONES_POR_RONDA = 128
+
+
+class HDAStarStrategy(Strategy):
+    """
+    ## A* paralelo con distribución por hash (HDA*)
+
+    - **Objetivo:** HDA* reparte una búsqueda A* entre varios procesos para aprovechar todos los núcleos disponibles, manteniendo la solución óptima.
+    - **Método:** Cada estado pertenece al trabajador indicado por su clave Zobrist módulo el número de trabajadores. Cada trabajador tiene su propia cola de prioridad y su propio conjunto de cerrados; los sucesores que pertenecen a otro trabajador se le envían por su cola de mensajes, agrupados en lotes. Cuando alguno encuentra una solución, la publica como cota compartida y todos siguen expandiendo solo nodos con f(n) menor que ella.
+    - **Terminación:** El proceso principal declara terminada la búsqueda cuando todos los trabajadores están ociosos y el total de estados enviados coincide con el de recibidos en dos observaciones seguidas (no quedan mensajes en tránsito).
+    - **Optimalidad:** Con una heurística admisible, cuando termina no queda ningún nodo con f(n) menor que la mejor solución, por lo que es óptima como la de A*.
+    - **Ventaja:** Escala con el número de núcleos y reparte también la memoria de abiertos y cerrados entre los procesos.
+    - **Desventaja:** El envío de estados entre procesos tiene un costo fijo alto; en niveles pequeños es más lento que A* secuencial.
+    """
+
+    def __init__(self, mapa, procesos=None, **opciones):
+        super().__init__(mapa, **opciones)
+        self.mapa = mapa
+        # La telemetría (con callbacks) no se envía a los trabajadores, y el presupuesto lo
+        # controla el proceso principal
+        self.opciones = {
+            nombre: valor for nombre, valor in opciones.items() if nombre not in ("telemetria", "presupuesto")
+        }
+        self.procesos = procesos or os.cpu_count() or 1
+        # Tablas de distancias de empuje precalculadas una vez por nivel
+        self.motor_heuristico = self.nivel.tabla(MotorHeuristico)
+        # Métricas de cada trabajador, en orden de índice
+        self.nodos_por_trabajador = []
+
+    def heuristica(self, estado):
+        """
+        Calcula la heurística del estado (mínimo de empujes asignando cada caja a un objetivo distinto).
+        """
+        return self.motor_heuristico.calcular(estado.cajas)
+
+    def resolver(self):
+        """
+        Ejecuta la búsqueda HDA* con `procesos` trabajadores para encontrar la solución.
+        """
+        inicio = time.time()  # Tiempo de inicio
+        contexto = multiprocessing.get_context()
+        n = self.procesos
+
+        # Canales de comunicación y estado compartido entre los trabajadores
+        colas = [contexto.Queue() for _ in range(n)]
+        respuestas = contexto.Queue()
+        enviados = contexto.Array("q", n, lock=False)
+        recibidos = contexto.Array("q", n, lock=False)
+        ociosos = contexto.Array("b", n, lock=False)
+        incumbente = contexto.Value("d", float("inf"), lock=False)
+        clave_objetivo = contexto.Value("Q", 0, lock=False)
+        # Nodos generados por cada trabajador y señal de parada al agotarse el presupuesto
+        generados = contexto.Array("q", n, lock=False)
+        detener = contexto.Value("b", 0, lock=False)
+        candado = contexto.Lock()
+
+        trabajadores = [
+            contexto.Process(
+                target=ejecutar_trabajador,
+                args=(indice, self.mapa, self.opciones, n, colas, respuestas,
+                      enviados, recibidos, ociosos, incumbente, clave_objetivo, candado,
+                      generados, detener),
+                daemon=True,
+            )
+            for indice in range(n)
+        ]
+        for trabajador in trabajadores:
+            trabajador.start()
+
+        # El estado inicial se entrega al trabajador dueño de su clave
+        jugador, cajas, clave, ocupacion = self.estado_inicial
+        enviados[clave % n] += 1
+        colas[clave % n].put(("estados", [(jugador, cajas, clave, ocupacion, 0, None, -1)]))
+
+        # Detección de terminación: todos ociosos y sin mensajes en tránsito, dos veces seguidas
+        anterior = None
+        while True:
+            time.sleep(0.01)
+            if not all(trabajador.is_alive() for trabajador in trabajadores):
+                raise RuntimeError("Un trabajador de HDA* terminó de forma inesperada")
+            # El presupuesto se controla con la suma de los nodos generados por los trabajadores
+            if self.presupuesto is not None and not self.presupuesto_agotado:
+                self.nodos_generados = sum(generados)
+                if self.agotado(reloj=True):
+                    # La señal de parada deja ociosos a todos los trabajadores y la búsqueda
+                    # termina; la mejor solución encontrada hasta ahora se conserva
+                    print("Presupuesto agotado, deteniendo la búsqueda.")
+                    detener.value = 1
+            totales = (sum(enviados), sum(recibidos))
+            if not all(ociosos) or totales[0] != totales[1]:
+                anterior = None
+                continue
+            if totales == anterior:
+                break
+            anterior = totales
+
+        # Reconstruir la secuencia de movimientos preguntando a cada dueño por el padre
+        nodo = None
+        if incumbente.value < float("inf"):
+            secuencia = []
+            clave = clave_objetivo.value
+            while True:
+                colas[clave % n].put(("trazar", clave))
+                padre, movimiento = respuestas.get()
+                if padre is None:
+                    break
+                secuencia.append(movimiento)
+                clave = padre
+
+            nodo = self.nodo_inicial
+            for movimiento in reversed(secuencia):
+                nodo = self.nodos.agregar(nodo, movimiento)
+
+        # Finalizar los trabajadores y reunir sus métricas
+        for cola in colas:
+            cola.put(("fin",))
+        metricas = sorted((respuestas.get() for _ in range(n)), key=lambda metrica: metrica["trabajador"])
+        for trabajador in trabajadores:
+            trabajador.join()
+
+        self.nodos_por_trabajador = metricas
+        self.nodos_generados = sum(metrica["nodos_generados"] for metrica in metricas)
+        self.nodos_abiertos = sum(metrica["nodos_abiertos"] for metrica in metricas)
+        self.nodos_cerrados = sum(metrica["nodos_cerrados"] for metrica in metricas)
+        self.nodos_podados = sum(metrica["nodos_podados"] for metrica in metricas)
+        self.profundidad_maxima = max(metrica["profundidad_maxima"] for metrica in metricas)
+
+        fin = time.time()
+        self.tiempo_total = fin - inicio
+        if nodo is not None:
+            print(f"Solución encontrada en {self.tiempo_total:.2f} segundos")
+        return self.preparar_respuesta(nodo)
+
+    def preparar_respuesta(self, nodo):
+        """
+        Agrega a la respuesta las métricas de cada trabajador.
+        """
+        respuesta = super().preparar_respuesta(nodo)
+        respuesta["nodos_por_trabajador"] = self.nodos_por_trabajador
+        return respuesta
+
+
+def ejecutar_trabajador(*argumentos):
+    """
+    Punto de entrada de cada proceso trabajador.
+    """
+    TrabajadorHDA(*argumentos).ejecutar()
+
+
+class TrabajadorHDA():
+    """
+    Trabajador de HDA*: dueño de los estados cuya clave módulo `n` es su índice.
+    """
+
+    def __init__(self, indice, mapa, opciones, n, colas, respuestas,
+                 enviados, recibidos, ociosos, incumbente, clave_objetivo, candado, generados, detener):
+        self.indice = indice
+        self.n = n
+        self.colas = colas
+        self.respuestas = respuestas
+        self.enviados = enviados
+        self.recibidos = recibidos
+        self.ociosos = ociosos
+        self.incumbente = incumbente
+        self.clave_objetivo = clave_objetivo
+        self.candado = candado
+        self.generados = generados
+        self.detener = detener
+
+        self.estrategia = HDAStarStrategy(mapa, procesos=n, **opciones)
+        self.registro = {}  # clave -> (mejor g, clave del padre, movimiento)
+        self.abiertos = []  # (f, -g, contador, estado)
+        self.contador = 0
+        self.salientes = [[] for _ in range(n)]
+
+    def ejecutar(self):
+        cola = self.colas[self.indice]
+
+        while True:
+            ocioso = self.detener.value or not self.abiertos or self.abiertos[0][0] >= self.incumbente.value
+            if ocioso:
+                # Antes de declararse ocioso se envía todo lo pendiente
+                for dueno in range(self.n):
+                    self.enviar(dueno)
+                self.ociosos[self.indice] = 1
+
+            try:
+                mensaje = cola.get(timeout=0.01) if ocioso else cola.get_nowait()
+            except Empty:
+                mensaje = None
+
+            while mensaje is not None:
+                if mensaje[0] == "estados":
+                    # Dejar de estar ocioso antes de contar los estados recibidos
+                    self.ociosos[self.indice] = 0
+                    self.recibidos[self.indice] += len(mensaje[1])
+                    self.recibir(mensaje[1])
+                elif mensaje[0] == "trazar":
+                    _, padre, movimiento = self.registro[mensaje[1]]
+                    self.respuestas.put((padre, movimiento))
+                elif mensaje[0] == "fin":
+                    self.respuestas.put(self.metricas())
+                    return
+                try:
+                    mensaje = cola.get_nowait()
+                except Empty:
+                    mensaje = None
+
+            self.expandir()
+            for dueno in range(self.n):
+                self.enviar(dueno)
+
+    def recibir(self, lote):
+        """
+        Incorpora estados propios: se abren si mejoran el costo conocido del estado.
+        """
+        estrategia = self.estrategia
+        for jugador, cajas, clave, ocupacion, g_cost, padre, movimiento in lote:
+            previo = self.registro.get(clave)
+            if previo is not None and previo[0] <= g_cost:
+                continue
+
+            estado = Estado(jugador, cajas, clave, ocupacion)
+            h_cost = estrategia.heuristica(estado)
+            if h_cost == float("inf"):
+                estrategia.nodos_podados += 1
+                continue
+
+            self.registro[clave] = (g_cost, padre, movimiento)
+            if g_cost + h_cost < self.incumbente.value:
+                self.contador += 1
+                heapq.heappush(self.abiertos, (g_cost + h_cost, -g_cost, self.contador, estado))
+                estrategia.nodos_abiertos += 1
+
+    def expandir(self):
+        """
+        Expande una ronda de nodos con f(n) menor que la mejor solución conocida.
+        """
+        estrategia = self.estrategia
+        locales = []
+
+        for _ in range(EXPANSIONES_POR_RONDA):
+            if self.detener.value or not self.abiertos or self.abiertos[0][0] >= self.incumbente.value:
+                break
+            _, g_negativo, _, estado = heapq.heappop(self.abiertos)
+            g_cost = -g_negativo
+
+            # Entrada obsoleta: el estado se reabrió luego con un costo menor
+            if self.registro[estado.clave][0] < g_cost:
+                continue
+
+            estrategia.nodos_cerrados += 1
+            if g_cost > estrategia.profundidad_maxima:
+                estrategia.profundidad_maxima = g_cost
+
+            if estrategia.es_estado_objetivo(estado):
+                with self.candado:
+                    if g_cost < self.incumbente.value:
+                        self.incumbente.value = g_cost
+                        self.clave_objetivo.value = estado.clave
+                continue
+
+            for nuevo_estado, movimiento in estrategia.generar_movimientos(estado):
+                jugador, cajas, clave, ocupacion = nuevo_estado
+                item = (jugador, cajas, clave, ocupacion, g_cost + 1, estado.clave, movimiento)
+                dueno = clave % self.n
+                if dueno == self.indice:
+                    locales.append(item)
+                else:
+                    self.salientes[dueno].append(item)
+                    if len(self.salientes[dueno]) >= TAMANO_LOTE:
+                        self.enviar(dueno)
+
+            self.generados[self.indice] = estrategia.nodos_generados
+
+            if locales:
+                self.recibir(locales)
+                locales = []
+
+    def enviar(self, dueno):
+        """
+        Envía al dueño los estados acumulados para él, contándolos antes de ponerlos en tránsito.
+        """
+        lote = self.salientes[dueno]
+        if not lote:
+            return
+        self.salientes[dueno] = []
+        self.enviados[self.indice] += len(lote)
+        self.colas[dueno].put(("estados", lote))
+
+    def metricas(self):
+        estrategia = self.estrategia
+        return {
+            "trabajador": self.indice,
+            "nodos_generados": estrategia.nodos_generados,
+            "nodos_abiertos": estrategia.nodos_abiertos,
+            "nodos_cerrados": estrategia.nodos_cerrados,
+            "nodos_podados": estrategia.nodos_podados,
+            "profundidad_maxima": estrategia.profundidad_maxima,
+        }
@@ -0,0 +1,140 @@
+from array import array
+
+# Distancia usada para las celdas desde las que una caja no puede llegar a un objetivo
+INALCANZABLE = 0xFFFF
+
+
+class MotorHeuristico():
+    """
+    Heurística admisible basada en distancias reales de empuje y asignación óptima.
+
+    - **Tablas de distancias:** una vez por nivel se recorre (BFS) el tablero desde cada
+      objetivo tirando de una caja, lo que da el número mínimo de empujes para llevar una
+      caja desde cada celda hasta ese objetivo teniendo en cuenta las paredes.
+    - **Asignación:** cada caja se asigna a un objetivo distinto minimizando la suma de
+      distancias (algoritmo húngaro). Nunca sobreestima, porque cada empuje mueve una sola
+      caja una celda.
+    - **Incremental:** la fila de costos de cada celda está precalculada, así que cambiar
+      una caja solo cambia su fila; además se recuerdan los valores por configuración de
+      cajas, de modo que los pasos del jugador que no mueven cajas no recalculan nada.
+    """
+
+    def __init__(self, nivel, tamano_cache=100000, filas=None):
+        self.nivel = nivel
+        self.tamano_cache = tamano_cache
+        self.cache = {}
+
+        # Las filas se pueden recibir ya calculadas (cache de niveles compilados)
+        if filas is not None:
+            self.filas = filas
+            return
+
+        distancias = [self.distancias_desde(objetivo) for objetivo in nivel.objetivos]
+        # Fila de costos por celda: distancia de una caja en esa celda a cada objetivo
+        self.filas = [
+            tuple(tabla[celda] for tabla in distancias) for celda in range(len(nivel.paredes))
+        ]
+
+    def distancias_desde(self, objetivo):
+        """
+        Calcula el mínimo de empujes para llevar una caja desde cada celda hasta el objetivo,
+        tirando de ella desde el objetivo hacia atrás.
+        """
+        paredes = self.nivel.paredes
+        distancias = array("H", [INALCANZABLE]) * len(paredes)
+        distancias[objetivo] = 0
+        frontera = [objetivo]
+
+        while frontera:
+            siguiente = []
+            for caja in frontera:
+                for delta in self.nivel.desplazamientos:
+                    destino = caja + delta
+                    if (
+                        distancias[destino] == INALCANZABLE
+                        and not paredes[destino]
+                        and not paredes[destino + delta]
+                    ):
+                        distancias[destino] = distancias[caja] + 1
+                        siguiente.append(destino)
+            frontera = siguiente
+
+        return distancias
+
+    def calcular(self, cajas):
+        """
+        Devuelve la cota inferior de empujes para la configuración de cajas, o infinito si
+        alguna caja no puede llegar a ningún objetivo.
+        """
+        valor = self.cache.get(cajas)
+        if valor is None:
+            valor = self.estimar(cajas)
+            if len(self.cache) >= self.tamano_cache:
+                self.cache.clear()
+            self.cache[cajas] = valor
+        return valor
+
+    def estimar(self, cajas):
+        """
+        Calcula la cota sin cache: la asignación óptima de cajas a objetivos.
+        """
+        return asignacion_minima([self.filas[caja] for caja in cajas])
+
+
+def asignacion_minima(costos):
+    """
+    Resuelve la asignación de costo mínimo (algoritmo húngaro, O(n²·m)) de cada fila a una
+    columna distinta. Requiere al menos tantas columnas como filas. Devuelve infinito si no
+    existe una asignación con todos los costos alcanzables.
+    """
+    n = len(costos)
+    if n == 0:
+        return 0
+    m = len(costos[0])
+    infinito = float("inf")
+
+    # Potenciales de filas (u) y columnas (v); columna_de[j] es la fila asignada a la columna j
+    u = [0] * (n + 1)
+    v = [0] * (m + 1)
+    columna_de = [0] * (m + 1)
+    camino = [0] * (m + 1)
+
+    for fila in range(1, n + 1):
+        columna_de[0] = fila
+        columna = 0
+        minimos = [infinito] * (m + 1)
+        usadas = [False] * (m + 1)
+
+        while True:
+            usadas[columna] = True
+            fila_actual = columna_de[columna]
+            delta = infinito
+            siguiente = 0
+            costos_fila = costos[fila_actual - 1]
+            for j in range(1, m + 1):
+                if not usadas[j]:
+                    reducido = costos_fila[j - 1] - u[fila_actual] - v[j]
+                    if reducido < minimos[j]:
+                        minimos[j] = reducido
+                        camino[j] = columna
+                    if minimos[j] < delta:
+                        delta = minimos[j]
+                        siguiente = j
+            for j in range(m + 1):
+                if usadas[j]:
+                    u[columna_de[j]] += delta
+                    v[j] -= delta
+                else:
+                    minimos[j] -= delta
+            columna = siguiente
+            if columna_de[columna] == 0:
+                break
+
+        # Recorrer el camino aumentante para actualizar la asignación
+        while columna:
+            anterior = camino[columna]
+            columna_de[columna] = columna_de[anterior]
+            columna = anterior
+
+    total = sum(costos[columna_de[j] - 1][j - 1] for j in range(1, m + 1) if columna_de[j])
+    return infinito if total >= INALCANZABLE else total
@@ -1,6 +1,9 @@
 import time
 from collections import deque
 from strategies.strategy import Strategy
+from strategies.presupuesto import Presupuesto
+from strategies.heuristica import MotorHeuristico
+from strategies.patrones import MotorPatrones
 
 class IDAStarStrategy(Strategy):
     """
@@ -9,69 +12,137 @@ class IDAStarStrategy(Strategy):
     - **Objetivo:** IDA* busca reducir la memoria requerida por A* mediante un enfoque de profundidad iterativa en el que usa límites de costo en lugar de mantener una cola de prioridad.
 	- **Método:** IDA* expande los nodos utilizando f(n) = g(n) + h(n) similar a A*, pero limita la profundidad (o el costo) que puede explorar en cada iteración. Si no encuentra la solución, aumenta el límite y reintenta.
 	- **Optimalidad:** Como A*, si la heurística es admisible, IDA* garantiza una solución óptima.
-	- **Ventaja:** Utiliza mucho menos memoria que A*, ya que solo mantiene los nodos en la pila de llamadas actual, liberando aquellos que ya no son necesarios.
+	- **Ventaja:** Utiliza mucho menos memoria que A*, ya que solo mantiene los nodos del camino actual en su pila, liberando aquellos que ya no son necesarios.
 	- **Desventaja:** Al tener que realizar varias iteraciones, revisita nodos repetidamente y puede ser más lento en problemas grandes. Sin embargo, es ideal para situaciones con limitaciones de memoria.
     """
 
-    def __init__(self, mapa):
-        super().__init__(mapa)
-        self.tiempo_limite = 60  # Tiempo máximo en segundos
+    # Presupuesto predeterminado si no se indica otro: 60 segundos
+    TIEMPO_LIMITE = 60
+
+    def __init__(self, mapa, tabla_transposicion=None, patrones=False, presupuesto=None, **opciones):
+        if presupuesto is None:
+            presupuesto = Presupuesto(tiempo=self.TIEMPO_LIMITE)
+        super().__init__(mapa, presupuesto=presupuesto, **opciones)
+        # Tabla de transposición opcional (TablaTransposicion) compartida entre iteraciones
+        self.tabla_transposicion = tabla_transposicion
+        self.nodo_objetivo = None  # Nodo del almacén que alcanzó el objetivo
+        # Tablas de distancias de empuje precalculadas una vez por nivel; con `patrones`
+        # se suma la base de datos de patrones de pares de cajas
+        self.motor_heuristico = self.nivel.tabla(MotorPatrones if patrones else MotorHeuristico)
+
+        # Pila explícita de marcos preasignados (se amplía al duplicar su capacidad)
+        capacidad = 256
+        self.marco_estados = [None] * capacidad
+        self.marco_nodos = [None] * capacidad
+        self.marco_costos = [None] * capacidad
+        self.marco_sucesores = [None] * capacidad
+        self.marco_indices = [None] * capacidad
+        self.marco_minimos = [None] * capacidad
 
     def heuristica(self, estado):
         """
-        Calcula la heurística del estado (distancia de Manhattan de cada caja al objetivo más cercano).
+        Calcula la heurística del estado (mínimo de empujes asignando cada caja a un objetivo distinto).
         """
-        total_distancia = 0
-        for caja in estado['cajas']:
-            distancias = [abs(caja[0] - obj[0]) + abs(caja[1] - obj[1]) for obj in estado['objetivos']]
-            total_distancia += min(distancias)
-        return total_distancia
+        return self.motor_heuristico.calcular(estado.cajas)
 
-    def profundidad_limitada(self, estado, camino, g_cost, limite, visitados, inicio):
+    def profundidad_limitada(self, limite, visitados):
         """
-        Realiza búsqueda en profundidad limitada al costo.
+        Realiza búsqueda en profundidad limitada al costo, sin recursión: cada nivel de la
+        pila es un marco con el estado, su nodo, su costo g, sus sucesores y el índice del
+        siguiente sucesor a explorar. Los marcos se reutilizan entre niveles y solo se
+        amplían cuando la búsqueda llega más hondo que nunca. El almacén de nodos se usa
+        como pila: las ramas sin solución se descartan al retroceder.
         """
-        # Verificar el tiempo límite
-        if time.time() - inicio > self.tiempo_limite:
-            return "timeout"
-        
-        f_cost = g_cost + self.heuristica(estado)
-        
-        # Si el costo f(n) excede el límite, devolvemos el costo como límite siguiente
-        if f_cost > limite:
-            return f_cost
-        
-        # Verificar si hemos alcanzado el objetivo
-        if self.es_estado_objetivo(estado):
-            return camino   # Devuelve el camino en LURD si encontró una solución
-        
-        min_costo_excedente = float('inf')  # Inicializa el mínimo de los costos que exceden el límite
-        
-        # Marca este estado como visitado
-        estado_clave = (estado['jugador'], frozenset(estado['cajas']))
-        visitados.add(estado_clave)
-        
-        # Generar nuevos estados (movimientos válidos)
-        for nuevo_estado, direccion in self.generar_movimientos(estado):
-            nuevo_estado_clave = (nuevo_estado['jugador'], frozenset(nuevo_estado['cajas']))
-            
-            # Si el estado no ha sido visitado en este camino
-            if nuevo_estado_clave not in visitados:
-                self.nodos_abiertos += 1  # Incrementar nodos abiertos
-                resultado = self.profundidad_limitada(nuevo_estado, camino + direccion, g_cost + 1, limite, visitados, inicio)
-                
-                # Si devuelve un camino (solución), lo propagamos hacia arriba
-                if isinstance(resultado, str):
-                    return resultado
-                
-                # De lo contrario, actualizamos el costo mínimo excedente
-                min_costo_excedente = min(min_costo_excedente, resultado)
-        
-        # Remover el estado del conjunto visitado al retroceder (backtrack)
-        visitados.remove(estado_clave)
-        self.nodos_cerrados += 1  # Incrementar nodos cerrados al retroceder
-        
-        return min_costo_excedente
+        estados, nodos, costos = self.marco_estados, self.marco_nodos, self.marco_costos
+        sucesores, indices, minimos = self.marco_sucesores, self.marco_indices, self.marco_minimos
+        tabla = self.tabla_transposicion
+        telemetria = self.telemetria
+
+        # El marco del estado inicial queda pendiente de evaluar (índice -1)
+        estados[0], nodos[0], costos[0], indices[0] = self.estado_inicial, self.nodo_inicial, 0, -1
+        tope = 0
+
+        while True:
+            estado = estados[tope]
+            resultado = None
+
+            if indices[tope] < 0:
+                # Primera visita al estado: comprobar si hay que cortar antes de expandirlo
+                g_cost = costos[tope]
+
+                # Verificar el presupuesto de tiempo y nodos
+                if self.agotado():
+                    return "agotado"
+
+                f_cost = g_cost + self.heuristica(estado)
+
+                if f_cost > limite:
+                    # Si el costo f(n) excede el límite, devolvemos el costo como límite siguiente
+                    resultado = f_cost
+                elif self.es_estado_objetivo(estado):
+                    # El camino se reconstruye luego desde el nodo objetivo
+                    self.nodo_objetivo = nodos[tope]
+                    return "solucion"
+                else:
+                    # Podar el estado si ya se exploró con un costo menor, o con el mismo en esta iteración
+                    if tabla is not None:
+                        resultado = tabla.consultar(estado.clave, g_cost)
+
+                    if resultado is None:
+                        # Marca este estado como visitado y genera sus sucesores
+                        visitados.add(estado)
+                        sucesores[tope] = self.generar_movimientos(estado)
+                        indices[tope] = 0
+                        minimos[tope] = float('inf')
+                        if telemetria is not None:
+                            telemetria.progreso(self, tope + 1, len(visitados), limite)
+                        continue
+
+            elif indices[tope] < len(sucesores[tope]):
+                nuevo_estado, direccion = sucesores[tope][indices[tope]]
+                indices[tope] += 1
+
+                # Si el estado no ha sido visitado en este camino, se apila su marco
+                if nuevo_estado not in visitados:
+                    self.nodos_abiertos += 1  # Incrementar nodos abiertos
+                    tope += 1
+                    if tope == len(estados):
+                        self.ampliar_marcos()
+                    estados[tope] = nuevo_estado
+                    nodos[tope] = self.nodos.agregar(nodos[tope - 1], direccion)
+                    costos[tope] = costos[tope - 1] + 1
+                    indices[tope] = -1
+                continue
+
+            else:
+                # Sucesores agotados: remover el estado del conjunto visitado al retroceder
+                visitados.remove(estado)
+                sucesores[tope] = None
+                self.nodos_cerrados += 1  # Incrementar nodos cerrados al retroceder
+                resultado = minimos[tope]
+
+                # Recordar el costo y la cota del subárbol para las transposiciones
+                if tabla is not None:
+                    tabla.guardar(estado.clave, costos[tope], resultado)
+
+            # Desapilar el marco y propagar su costo mínimo excedente al padre
+            if tope == 0:
+                return resultado
+            self.nodos.truncar(nodos[tope])  # Descartar la rama explorada sin éxito
+            tope -= 1
+            if resultado < minimos[tope]:
+                minimos[tope] = resultado
+
+    def ampliar_marcos(self):
+        """
+        Duplica la capacidad de la pila de marcos.
+        """
+        capacidad = len(self.marco_estados)
+        for marco in (
+            self.marco_estados, self.marco_nodos, self.marco_costos,
+            self.marco_sucesores, self.marco_indices, self.marco_minimos,
+        ):
+            marco.extend([None] * capacidad)
 
     def resolver(self):
         """
@@ -81,19 +152,22 @@ class IDAStarStrategy(Strategy):
         limite = self.heuristica(self.estado_inicial)  # Límite inicial basado en la heurística del estado inicial
         
         while True:
-            visitados = set()  # Reiniciar el conjunto de visitados para cada límite
-            resultado = self.profundidad_limitada(self.estado_inicial, "", 0, limite, visitados, inicio)
+            visitados = self.crear_visitados()  # Reiniciar el conjunto de visitados para cada límite
+            if self.tabla_transposicion is not None:
+                self.tabla_transposicion.nueva_iteracion(limite)
+            resultado = self.profundidad_limitada(limite, visitados)
             
             # Si se encuentra un camino (solución), se devuelve
             if isinstance(resultado, str):
-                if resultado == "timeout":
-                    print("Tiempo límite alcanzado, deteniendo la búsqueda.")
+                if resultado == "agotado":
+                    self.tiempo_total = time.time() - inicio
+                    print("Presupuesto agotado, deteniendo la búsqueda.")
                     return super().preparar_respuesta(None)
 
                 fin = time.time()
                 self.tiempo_total = fin - inicio
                 print(f"Solución encontrada en {self.tiempo_total:.2f} segundos")
-                return super().preparar_respuesta(resultado)
+                return super().preparar_respuesta(self.nodo_objetivo)
             
             # Si no, actualiza el límite al mínimo valor f(n) que excedió el límite anterior
             if resultado == float('inf'):  # No hay solución
@@ -13,41 +13,111 @@ class IDDFSStrategy(Strategy):
 	- **Desventaja:** Requiere revisitar muchos nodos a medida que incrementa el límite, lo que puede hacerlo más lento que BFS en algunos casos.
     """
 
-    def profundidad_limitada(self, estado, camino, limite, visitados):
+    def __init__(self, mapa, tabla_transposicion=None, **opciones):
+        super().__init__(mapa, **opciones)
+        # Tabla de transposición opcional (TablaTransposicion) compartida entre iteraciones
+        self.tabla_transposicion = tabla_transposicion
+
+        # Pila explícita de marcos preasignados (se amplía al duplicar su capacidad)
+        capacidad = 256
+        self.marco_estados = [None] * capacidad
+        self.marco_nodos = [None] * capacidad
+        self.marco_sucesores = [None] * capacidad
+        self.marco_indices = [None] * capacidad
+
+    def profundidad_limitada(self, limite, visitados, profundidades=None):
+        """
+        Realiza búsqueda en profundidad hasta un límite de profundidad, sin recursión: cada
+        nivel de la pila es un marco con el estado, su nodo, sus sucesores y el índice del
+        siguiente sucesor a explorar. Los marcos se reutilizan entre niveles y solo se
+        amplían cuando la búsqueda llega más hondo que nunca. El almacén de nodos se usa
+        como pila: las ramas sin solución se descartan al retroceder.
+
+        Con tabla de transposición, `visitados` son solo los estados del camino actual y
+        `profundidades` guarda la menor profundidad a la que se expandió cada estado en esta
+        iteración: un estado se vuelve a expandir si se alcanza a menor profundidad, con más
+        límite restante. Así la solución sigue siendo la más corta aunque la tabla, acotada,
+        haya reemplazado la entrada del estado.
+        """
+        estados, nodos = self.marco_estados, self.marco_nodos
+        sucesores, indices = self.marco_sucesores, self.marco_indices
+        tabla = self.tabla_transposicion
+        telemetria = self.telemetria
+        presupuesto = self.presupuesto
+
+        # El marco del estado inicial queda pendiente de evaluar (índice -1)
+        estados[0], nodos[0], indices[0] = self.estado_inicial, self.nodo_inicial, -1
+        tope = 0
+
+        while True:
+            estado = estados[tope]
+            # En este marco, la profundidad es el nivel de la pila y lo que resta del límite
+            profundidad = tope
+            restante = limite - tope
+
+            if indices[tope] < 0:
+                if presupuesto is not None and self.agotado():
+                    return None
+
+                # Verifica si el estado actual es objetivo
+                if self.es_estado_objetivo(estado):
+                    return nodos[tope]
+
+                # Si el límite es cero no profundizamos más, y se poda el estado si ya se
+                # expandió a menor o igual profundidad en esta iteración, o si la tabla lo
+                # registra a menor profundidad en una anterior
+                if restante > 0 and (tabla is None or (
+                    profundidades.get(estado.clave, limite) > profundidad
+                    and tabla.consultar(estado.clave, profundidad) is None
+                )):
+                    if profundidades is not None:
+                        profundidades[estado.clave] = profundidad
+                    # Marca este estado como visitado y genera sus sucesores
+                    visitados.add(estado)
+                    sucesores[tope] = self.generar_movimientos(estado)
+                    indices[tope] = 0
+                    if telemetria is not None:
+                        telemetria.progreso(self, tope + 1, len(visitados), limite)
+                    continue
+
+            elif indices[tope] < len(sucesores[tope]):
+                nuevo_estado, direccion = sucesores[tope][indices[tope]]
+                indices[tope] += 1
+
+                # Si el estado no ha sido visitado en este nivel de profundidad, se apila su marco
+                if nuevo_estado not in visitados:
+                    self.nodos_abiertos += 1  # Incrementar nodos abiertos
+                    tope += 1
+                    if tope == len(estados):
+                        self.ampliar_marcos()
+                    estados[tope] = nuevo_estado
+                    nodos[tope] = self.nodos.agregar(nodos[tope - 1], direccion)
+                    indices[tope] = -1
+                continue
+
+            else:
+                sucesores[tope] = None
+                self.nodos_cerrados += 1  # Incrementar nodos cerrados al finalizar la expansión de este nodo
+
+                # Recordar la profundidad a la que se exploró el estado para las transposiciones
+                # y sacarlo de los visitados, que con tabla son solo los del camino actual
+                if tabla is not None:
+                    tabla.guardar(estado.clave, profundidad, restante)
+                    visitados.remove(estado)
+
+            # Desapilar el marco sin solución
+            if tope == 0:
+                return None
+            self.nodos.truncar(nodos[tope])  # Descartar la rama explorada sin éxito
+            tope -= 1
+
+    def ampliar_marcos(self):
         """
-        Realiza búsqueda en profundidad hasta un límite de profundidad.
+        Duplica la capacidad de la pila de marcos.
         """
-        # Verifica si el estado actual es objetivo
-        if self.es_estado_objetivo(estado):
-            return camino
-
-        # Si el límite es cero, no profundizamos más
-        if limite <= 0:
-            return None
-
-        # Marca este estado como visitado
-        estado_clave = (estado["jugador"], frozenset(estado["cajas"]))
-        visitados.add(estado_clave)
-
-        for nuevo_estado, direccion in self.generar_movimientos(estado):
-            nuevo_estado_clave = (
-                nuevo_estado["jugador"],
-                frozenset(nuevo_estado["cajas"]),
-            )
-
-            # Si el estado no ha sido visitado en este nivel de profundidad
-            if nuevo_estado_clave not in visitados:
-                self.nodos_abiertos += 1  # Incrementar nodos abiertos
-                resultado = self.profundidad_limitada(
-                    nuevo_estado, camino + direccion, limite - 1, visitados
-                )
-                
-                # Si encuentra una solución, la devuelve
-                if resultado is not None:
-                    return resultado
-
-        self.nodos_cerrados += 1  # Incrementar nodos cerrados al finalizar la expansión de este nodo
-        return None
+        capacidad = len(self.marco_estados)
+        for marco in (self.marco_estados, self.marco_nodos, self.marco_sucesores, self.marco_indices):
+            marco.extend([None] * capacidad)
 
     def resolver(self):
         """
@@ -57,14 +127,18 @@ class IDDFSStrategy(Strategy):
         limite = 0  # Empieza con profundidad 0
         
         while True:
-            visitados = set()  # Reiniciar el conjunto de visitados para cada límite
+            visitados = self.crear_visitados()  # Reiniciar el conjunto de visitados para cada límite
             self.profundidad_maxima = max(self.profundidad_maxima, limite)  # Actualizar la profundidad máxima
-            resultado = self.profundidad_limitada(
-                self.estado_inicial, "", limite, visitados
-            )
+            profundidades = None
+            if self.tabla_transposicion is not None:
+                self.tabla_transposicion.nueva_iteracion()
+                profundidades = {}
+            resultado = self.profundidad_limitada(limite, visitados, profundidades)
 
-            # Si encuentra la solución, imprime y retorna el resultado
-            if resultado is not None:
+            # Si encuentra la solución o se agota el presupuesto, retorna el resultado
+            if resultado is not None or self.presupuesto_agotado:
+                if self.presupuesto_agotado:
+                    print("Presupuesto agotado, deteniendo la búsqueda.")
                 fin = time.time()
                 self.tiempo_total = fin - inicio
                 return super().preparar_respuesta(resultado)
@@ -0,0 +1,228 @@
+import random
+from collections import namedtuple
+
+# Direcciones en el orden en que se exploran, con su notación LURD
+DIRECCIONES = "UDLR"
+
+# Semilla fija de las claves Zobrist: el mismo nivel produce las mismas claves en
+# cualquier proceso
+SEMILLA_ZOBRIST = 0x50C0BA
+
+# Estado compacto de la búsqueda: la celda del jugador, las celdas de las cajas
+# como tupla ordenada, su clave Zobrist de 64 bits, que se actualiza con XOR en
+# cada movimiento y es la que se guarda en los conjuntos de visitados, y la
+# ocupación de las cajas como tablero de bits (`1 << celda` por caja), también
+# actualizada con XOR, para las pruebas de ocupación y de objetivo.
+Estado = namedtuple("Estado", ["jugador", "cajas", "clave", "ocupacion"])
+
+
+# Claves Zobrist ya generadas por cantidad de celdas: con la semilla fija solo dependen
+# de ella, así que los niveles del mismo tamaño comparten las listas (de solo lectura)
+CLAVES_ZOBRIST = {}
+
+
+def claves_zobrist(celdas):
+    """
+    Devuelve las claves Zobrist de caja y de jugador para un tablero de `celdas` celdas.
+    """
+    claves = CLAVES_ZOBRIST.get(celdas)
+    if claves is None:
+        generador = random.Random(SEMILLA_ZOBRIST)
+        cajas = [generador.getrandbits(64) for _ in range(celdas)]
+        jugador = [generador.getrandbits(64) for _ in range(celdas)]
+        claves = CLAVES_ZOBRIST[celdas] = (cajas, jugador)
+    return claves
+
+
+def tablero_de_bits(celdas):
+    """
+    Devuelve el tablero de bits de una colección de celdas.
+    """
+    bits = 0
+    for celda in celdas:
+        bits |= 1 << celda
+    return bits
+
+
+class Nivel():
+    """
+    Representación compilada de un nivel.
+
+    Las celdas se aplanan a índices enteros (`y * ancho + x`). Paredes y objetivos
+    se calculan una sola vez por nivel y se comparten entre todos los estados, que
+    solo guardan lo que cambia: el jugador y las cajas.
+    """
+
+    def __init__(self, mapa):
+        alto = len(mapa)
+        ancho = max((len(fila) for fila in mapa), default=0)
+
+        # Las celdas fuera de las filas (niveles irregulares) cuentan como pared
+        paredes = bytearray([1]) * (ancho * alto)
+        es_objetivo = bytearray(ancho * alto)
+
+        jugadores = []
+        cajas = []
+
+        for y, fila in enumerate(mapa):
+            for x, char in enumerate(fila):
+                celda = y * ancho + x
+                if char != "#":
+                    paredes[celda] = 0
+                if char in ("@", "+"):
+                    jugadores.append(celda)
+                if char in ("$", "*"):
+                    cajas.append(celda)
+                if char in (".", "+", "*"):
+                    es_objetivo[celda] = 1
+
+        if len(jugadores) != 1:
+            raise ValueError(f"El nivel debe tener un jugador y tiene {len(jugadores)}")
+        self.inicializar(ancho, alto, paredes, es_objetivo, jugadores[0], cajas)
+        self.validar()
+
+    @classmethod
+    def desde_tablas(cls, ancho, alto, paredes, es_objetivo, jugador, cajas):
+        """
+        Crea el nivel a partir de sus tablas ya compiladas (por ejemplo, leídas de la cache
+        de niveles compilados), sin recorrer el mapa ni volver a validarlo.
+        """
+        nivel = cls.__new__(cls)
+        nivel.inicializar(ancho, alto, bytearray(paredes), bytearray(es_objetivo), jugador, cajas)
+        return nivel
+
+    def inicializar(self, ancho, alto, paredes, es_objetivo, jugador, cajas):
+        """
+        Completa el nivel a partir de sus tablas: objetivos, claves Zobrist y estado inicial.
+        """
+        self.ancho = ancho
+        self.alto = alto
+        self.paredes = paredes
+        self.es_objetivo = es_objetivo
+        self.objetivos = tuple(celda for celda in range(len(es_objetivo)) if es_objetivo[celda])
+
+        # Claves Zobrist aleatorias por celda, una para caja y otra para jugador
+        self.zobrist_cajas, self.zobrist_jugador = claves_zobrist(self.ancho * self.alto)
+
+        cajas = tuple(sorted(cajas))
+        self.estado_inicial = Estado(jugador, cajas, self.clave(jugador, cajas), tablero_de_bits(cajas))
+
+        # Tablas derivadas (distancias, celdas muertas...) compartidas por las estrategias
+        self.tablas = {}
+
+        # Desplazamiento en el índice plano para cada dirección, en el orden de DIRECCIONES
+        self.desplazamientos = (
+            -self.ancho,  # Arriba
+            self.ancho,  # Abajo
+            -1,  # Izquierda
+            1,  # Derecha
+        )
+
+    def validar(self):
+        """
+        Verifica que el nivel tenga tantas cajas como objetivos y que el jugador, las cajas
+        y los objetivos estén encerrados por paredes. Lanza ValueError si no es así.
+        """
+        jugador, cajas, _, _ = self.estado_inicial
+        if not cajas:
+            raise ValueError("El nivel no tiene cajas")
+        if len(cajas) != len(self.objetivos):
+            raise ValueError(f"El nivel tiene {len(cajas)} cajas y {len(self.objetivos)} objetivos")
+
+        # Ninguna celda libre conectada con el jugador, las cajas o los objetivos puede estar
+        # en el borde: los desplazamientos saldrían del tablero
+        paredes = self.paredes
+        vistas = bytearray(len(paredes))
+        pendientes = [jugador, *cajas, *self.objetivos]
+        for celda in pendientes:
+            vistas[celda] = 1
+        while pendientes:
+            celda = pendientes.pop()
+            x, y = self.coordenadas(celda)
+            if x in (0, self.ancho - 1) or y in (0, self.alto - 1):
+                raise ValueError(f"El nivel no está cerrado por paredes (celda {x}, {y})")
+            for delta in self.desplazamientos:
+                vecina = celda + delta
+                if not vistas[vecina] and not paredes[vecina]:
+                    vistas[vecina] = 1
+                    pendientes.append(vecina)
+
+    def tabla(self, tipo):
+        """
+        Devuelve la tabla derivada `tipo(self)`, calculada una sola vez por nivel y
+        reutilizada por todas las estrategias que resuelven el mismo nivel.
+        """
+        tabla = self.tablas.get(tipo)
+        if tabla is None:
+            tabla = self.tablas[tipo] = tipo(self)
+        return tabla
+
+    def clave(self, jugador, cajas):
+        """
+        Calcula desde cero la clave Zobrist de una posición.
+        """
+        clave = self.zobrist_jugador[jugador]
+        for caja in cajas:
+            clave ^= self.zobrist_cajas[caja]
+        return clave
+
+    def coordenadas(self, celda):
+        """
+        Devuelve las coordenadas (x, y) de una celda.
+        """
+        y, x = divmod(celda, self.ancho)
+        return x, y
+
+    def region(self, inicio, ocupadas):
+        """
+        Calcula la región alcanzable por el jugador desde `inicio` sin empujar cajas.
+        Devuelve la máscara de celdas alcanzables y la menor de ellas, que sirve como
+        posición canónica del jugador dentro de la región.
+        """
+        paredes = self.paredes
+        desplazamientos = self.desplazamientos
+        alcanzables = bytearray(len(paredes))
+        alcanzables[inicio] = 1
+        pendientes = [inicio]
+        minima = inicio
+
+        while pendientes:
+            celda = pendientes.pop()
+            if celda < minima:
+                minima = celda
+            for delta in desplazamientos:
+                vecina = celda + delta
+                if not alcanzables[vecina] and not paredes[vecina] and vecina not in ocupadas:
+                    alcanzables[vecina] = 1
+                    pendientes.append(vecina)
+
+        return alcanzables, minima
+
+    def camino_jugador(self, origen, destino, ocupadas):
+        """
+        Busca (BFS) el camino más corto del jugador entre dos celdas sin empujar cajas.
+        Devuelve la lista de direcciones o None si el destino no es alcanzable.
+        """
+        padres = {origen: None}
+        frontera = [origen]
+
+        while frontera and destino not in padres:
+            siguiente = []
+            for celda in frontera:
+                for direccion, delta in enumerate(self.desplazamientos):
+                    vecina = celda + delta
+                    if vecina not in padres and not self.paredes[vecina] and vecina not in ocupadas:
+                        padres[vecina] = (celda, direccion)
+                        siguiente.append(vecina)
+            frontera = siguiente
+
+        if destino not in padres:
+            return None
+
+        direcciones = []
+        celda = destino
+        while padres[celda] is not None:
+            celda, direccion = padres[celda]
+            direcciones.append(direccion)
+        direcciones.reverse()
+        return direcciones
@@ -0,0 +1,265 @@
+import os
+import sys
+import struct
+import hashlib
+from array import array
+
+from strategies.nivel import Nivel
+from strategies.bloqueos import DetectorBloqueos
+from strategies.heuristica import MotorHeuristico
+
+# Directorio predeterminado de las colecciones compiladas, una por archivo de niveles
+DIRECTORIO_COMPILADOS = os.path.join(os.path.expanduser("~"), ".cache", "sokoban-solver", "niveles")
+
+# Encabezado del archivo compilado: firma, tamaño y fecha de modificación del archivo de
+# origen (para invalidarlo si cambia) y cantidad de niveles
+FIRMA = b"SKLVL1"
+ENCABEZADO = struct.Struct("<6sQqI")
+# Registro de cada nivel: longitud del nombre y, si es válido, ancho, alto, jugador,
+# cantidad de cajas y de objetivos; si no lo es, el ancho es 0 y el alto la longitud del mapa
+REGISTRO = struct.Struct("<IIIiII")
+
+# Caracteres de una fila de tablero en formato XSB ('-' y '_' son piso, como ' ')
+CARACTERES_TABLERO = frozenset("#@+$*. -_")
+# Caracteres adicionales de las filas comprimidas (RLE) de los archivos .sok
+CARACTERES_RLE = frozenset("0123456789|")
+
+
+def filas_de_tablero(linea):
+    """
+    Devuelve las filas de tablero que representa la línea (varias si está comprimida en
+    RLE con '|' como separador), o None si la línea no es parte de un tablero.
+    """
+    linea = linea.rstrip()
+    if "#" not in linea or not set(linea) <= CARACTERES_TABLERO | CARACTERES_RLE:
+        return None
+
+    if not CARACTERES_RLE.isdisjoint(linea):
+        filas, fila, cuenta = [], [], ""
+        for char in linea:
+            if char.isdigit():
+                cuenta += char
+            elif char == "|":
+                filas.append("".join(fila))
+                fila, cuenta = [], ""
+            else:
+                fila.append(char * int(cuenta or 1))
+                cuenta = ""
+        filas.append("".join(fila))
+    else:
+        filas = [linea]
+
+    return [list(fila.replace("-", " ").replace("_", " ").rstrip()) for fila in filas]
+
+
+def tableros(lineas):
+    """
+    Produce los tableros de una colección como pares (título, mapa). Un tablero se entrega
+    cuando empieza el siguiente o termina la entrada, para incluir su línea 'Title:'.
+    """
+    actual = None  # [título, mapa] del último tablero leído
+    titulo_pendiente = None
+    en_tablero = False
+
+    for linea in lineas:
+        filas = filas_de_tablero(linea)
+
+        if filas is not None:
+            if not en_tablero:
+                # Empieza un tablero nuevo: el anterior ya está completo
+                if actual is not None:
+                    yield tuple(actual)
+                actual = [titulo_pendiente, []]
+                titulo_pendiente = None
+                en_tablero = True
+            actual[1].extend(filas)
+            continue
+
+        en_tablero = False
+        texto = linea.strip()
+        if texto.lower().startswith("title:"):
+            titulo = texto[len("title:"):].strip()
+            if actual is not None and actual[0] is None:
+                actual[0] = titulo
+            else:
+                titulo_pendiente = titulo
+        elif texto.startswith(";"):
+            # Un comentario antes del tablero suele ser su título
+            titulo_pendiente = texto[1:].strip() or titulo_pendiente
+
+    if actual is not None:
+        yield tuple(actual)
+
+
+def leer_coleccion(lineas, nombre_base):
+    """
+    Lee una colección de niveles en formato XSB/SOK y produce pares (nombre, mapa) a medida
+    que los lee.
+
+    Si la colección tiene un solo nivel su nombre es `nombre_base`; si tiene varios, cada
+    uno se llama `nombre_base:título`, o `nombre_base:número` si no tiene título.
+    """
+    leidos = tableros(lineas)
+    primero = next(leidos, None)
+    if primero is None:
+        return
+
+    segundo = next(leidos, None)
+    if segundo is None:
+        yield nombre_base, primero[1]
+        return
+
+    for numero, (titulo, mapa) in enumerate((primero, segundo), start=1):
+        yield f"{nombre_base}:{titulo or numero}", mapa
+    for numero, (titulo, mapa) in enumerate(leidos, start=3):
+        yield f"{nombre_base}:{titulo or numero}", mapa
+
+
+def archivos_de_niveles(ruta):
+    """
+    Devuelve el archivo indicado o, si es un directorio, sus archivos en orden alfabético.
+    """
+    if os.path.isdir(ruta):
+        return sorted(
+            os.path.join(ruta, f) for f in os.listdir(ruta) if os.path.isfile(os.path.join(ruta, f))
+        )
+    return [ruta]
+
+
+def cargar_niveles(ruta):
+    """
+    Produce los niveles (nombre, mapa) de un archivo de colección o de todos los archivos
+    de un directorio, en orden alfabético. El nombre base de cada archivo es su nombre sin
+    extensión.
+    """
+    for archivo in archivos_de_niveles(ruta):
+        nombre_base = os.path.basename(archivo).split(".")[0]
+        with open(archivo, "r") as f:
+            yield from leer_coleccion(f, nombre_base)
+
+
+def compilar_nivel(nombre, mapa):
+    """
+    Compila un nivel y lo serializa para la cache: paredes, objetivos, estado inicial,
+    celdas muertas y tablas de distancias de empuje. Devuelve el registro y el `Nivel`, o
+    el mismo mapa si el nivel es inválido; en ese caso se guarda como texto, para que
+    quien lo cargue vuelva a obtener su error.
+    """
+    nombre = nombre.encode()
+    try:
+        nivel = Nivel(mapa)
+    except ValueError:
+        texto = "\n".join("".join(fila) for fila in mapa).encode()
+        return REGISTRO.pack(len(nombre), 0, len(texto), -1, 0, 0) + nombre + texto, mapa
+
+    jugador, cajas, _, _ = nivel.estado_inicial
+    distancias = array("H")
+    for fila in nivel.tabla(MotorHeuristico).filas:
+        distancias.extend(fila)
+    registro = b"".join((
+        REGISTRO.pack(len(nombre), nivel.ancho, nivel.alto, jugador, len(cajas), len(nivel.objetivos)),
+        nombre,
+        bytes(nivel.paredes),
+        bytes(nivel.es_objetivo),
+        array("I", cajas).tobytes(),
+        bytes(nivel.tabla(DetectorBloqueos).celdas_muertas),
+        distancias.tobytes(),
+    ))
+    return registro, nivel
+
+
+def leer_compilados(datos):
+    """
+    Produce los niveles (nombre, Nivel) de un archivo compilado, con sus tablas de celdas
+    muertas y distancias ya cargadas. Los niveles inválidos se entregan como mapa.
+    """
+    _, _, _, cantidad = ENCABEZADO.unpack_from(datos)
+    vista = memoryview(datos)
+    posicion = ENCABEZADO.size
+
+    for _ in range(cantidad):
+        largo_nombre, ancho, alto, jugador, n_cajas, n_objetivos = REGISTRO.unpack_from(datos, posicion)
+        posicion += REGISTRO.size
+        nombre = bytes(vista[posicion:posicion + largo_nombre]).decode()
+        posicion += largo_nombre
+
+        if ancho == 0:
+            texto = bytes(vista[posicion:posicion + alto]).decode()
+            posicion += alto
+            yield nombre, [list(fila) for fila in texto.split("\n")]
+            continue
+
+        celdas = ancho * alto
+        paredes = vista[posicion:posicion + celdas]
+        es_objetivo = vista[posicion + celdas:posicion + 2 * celdas]
+        posicion += 2 * celdas
+        cajas = array("I")
+        cajas.frombytes(vista[posicion:posicion + 4 * n_cajas])
+        posicion += 4 * n_cajas
+        nivel = Nivel.desde_tablas(ancho, alto, paredes, es_objetivo, jugador, cajas)
+
+        detector = DetectorBloqueos(nivel, bytearray(vista[posicion:posicion + celdas]))
+        posicion += celdas
+        distancias = array("H")
+        distancias.frombytes(vista[posicion:posicion + 2 * celdas * n_objetivos])
+        posicion += 2 * celdas * n_objetivos
+        motor = MotorHeuristico(nivel, filas=[
+            tuple(distancias[celda * n_objetivos:(celda + 1) * n_objetivos]) for celda in range(celdas)
+        ])
+        nivel.tablas[DetectorBloqueos] = detector
+        nivel.tablas[MotorHeuristico] = motor
+        yield nombre, nivel
+
+
+def cargar_archivo_compilado(archivo, directorio=DIRECTORIO_COMPILADOS):
+    """
+    Produce los niveles (nombre, Nivel) de un archivo de colección desde su versión
+    compilada. Si no existe o el archivo cambió desde que se compiló, se lee la colección
+    en streaming, se compila cada nivel a medida que se entrega y al terminar se guarda
+    la versión compilada. Los niveles inválidos se entregan como mapa: al compilarlos con
+    `Nivel` lanzan su ValueError.
+    """
+    ruta_absoluta = os.path.abspath(archivo)
+    estado = os.stat(ruta_absoluta)
+    huella = hashlib.sha256(ruta_absoluta.encode()).hexdigest()
+    # Las tablas se escriben en el orden de bytes de la máquina
+    ruta = os.path.join(directorio, f"{huella}-{sys.byteorder}.skl")
+
+    try:
+        with open(ruta, "rb") as f:
+            datos = f.read()
+        firma, tamano, modificado, _ = ENCABEZADO.unpack_from(datos)
+        if firma == FIRMA and (tamano, modificado) == (estado.st_size, estado.st_mtime_ns):
+            yield from leer_compilados(datos)
+            return
+    except (OSError, struct.error):
+        pass
+
+    registros = []
+    nombre_base = os.path.basename(archivo).split(".")[0]
+    with open(archivo, "r") as f:
+        for nombre, mapa in leer_coleccion(f, nombre_base):
+            registro, nivel = compilar_nivel(nombre, mapa)
+            registros.append(registro)
+            yield nombre, nivel
+
+    # Escribir en un archivo temporal y renombrar, para que otro proceso nunca lea uno a medias;
+    # si el directorio no se puede escribir, la colección simplemente no queda compilada
+    try:
+        os.makedirs(directorio, exist_ok=True)
+        temporal = f"{ruta}.{os.getpid()}.tmp"
+        with open(temporal, "wb") as f:
+            f.write(ENCABEZADO.pack(FIRMA, estado.st_size, estado.st_mtime_ns, len(registros)))
+            f.writelines(registros)
+        os.replace(temporal, ruta)
+    except OSError:
+        pass
+
+
+def cargar_compilados(ruta, directorio=DIRECTORIO_COMPILADOS):
+    """
+    Como `cargar_niveles`, pero produce cada nivel ya compilado (nombre, Nivel) usando la
+    cache de niveles compilados de cada archivo.
+    """
+    for archivo in archivos_de_niveles(ruta):
+        yield from cargar_archivo_compilado(archivo, directorio)
@@ -0,0 +1,45 @@
+from array import array
+
+
+class AlmacenNodos():
+    """
+    Almacén compacto de nodos de búsqueda compartido por todas las estrategias.
+
+    Cada nodo guarda únicamente el índice de su padre y el movimiento que lo generó,
+    en arreglos planos. El camino completo no se arrastra de nodo en nodo: se
+    reconstruye recorriendo los padres cuando se alcanza el objetivo.
+    """
+
+    def __init__(self):
+        self.padres = array("l")
+        self.movimientos = array("l")
+
+    def __len__(self):
+        return len(self.padres)
+
+    def agregar(self, padre, movimiento):
+        """
+        Agrega un nodo y devuelve su índice.
+        """
+        self.padres.append(padre)
+        self.movimientos.append(movimiento)
+        return len(self.padres) - 1
+
+    def truncar(self, longitud):
+        """
+        Descarta los nodos a partir de `longitud`. Permite usar el almacén como pila
+        en las búsquedas en profundidad, liberando las ramas al retroceder.
+        """
+        del self.padres[longitud:]
+        del self.movimientos[longitud:]
+
+    def movimientos_hasta(self, nodo):
+        """
+        Devuelve la secuencia de movimientos desde la raíz hasta el nodo.
+        """
+        secuencia = []
+        while self.padres[nodo] >= 0:
+            secuencia.append(self.movimientos[nodo])
+            nodo = self.padres[nodo]
+        secuencia.reverse()
+        return secuencia
@@ -0,0 +1,189 @@
+import os
+import sys
+import mmap
+import struct
+import hashlib
+from array import array
+from strategies.heuristica import MotorHeuristico, INALCANZABLE, asignacion_minima
+
+# Directorio predeterminado de las bases de datos de patrones, una por nivel
+DIRECTORIO_PATRONES = os.path.join(os.path.expanduser("~"), ".cache", "sokoban-solver", "patrones")
+
+# Encabezado del archivo: firma, ancho, alto y cantidad de celdas vivas
+FIRMA = b"SKPDB1"
+ENCABEZADO = struct.Struct("<6sIII")
+
+
+class BaseDatosPatrones():
+    """
+    Base de datos de patrones de pares de cajas.
+
+    Para cada par de celdas vivas guarda el mínimo exacto de empujes necesario para llevar
+    dos cajas desde ellas hasta dos objetivos distintos, sin las demás cajas y con el
+    jugador en la posición más favorable. Se calcula una vez por nivel con una búsqueda
+    retrógrada (tirones en amplitud) desde todas las parejas de objetivos, se guarda en un
+    archivo binario identificado por la huella del nivel y se carga con mmap, de modo que
+    las resoluciones siguientes arrancan sin recalcularla y los procesos que resuelven el
+    mismo nivel comparten sus páginas.
+    """
+
+    def __init__(self, nivel, motor, directorio=DIRECTORIO_PATRONES):
+        self.nivel = nivel
+        self.motor = motor
+
+        huella = hashlib.sha256(
+            struct.pack("<II", nivel.ancho, nivel.alto) + bytes(nivel.paredes) + bytes(nivel.es_objetivo)
+        ).hexdigest()
+        # Las tablas se escriben en el orden de bytes de la máquina
+        self.ruta = os.path.join(directorio, f"{huella}-{sys.byteorder}.pdb")
+        if not os.path.exists(self.ruta):
+            os.makedirs(directorio, exist_ok=True)
+            self.construir()
+        self.cargar()
+
+    def construir(self):
+        """
+        Calcula la tabla con una búsqueda retrógrada y la escribe en disco.
+        """
+        nivel = self.nivel
+        paredes = nivel.paredes
+        desplazamientos = nivel.desplazamientos
+        vivas = [
+            celda for celda in range(len(paredes))
+            if not paredes[celda] and min(self.motor.filas[celda], default=INALCANZABLE) < INALCANZABLE
+        ]
+        indice = {celda: i for i, celda in enumerate(vivas)}
+        n = len(vivas)
+        costos = array("H", [INALCANZABLE]) * (n * n)
+
+        def registrar(a, b, costo):
+            # En amplitud, la primera vez que aparece un par es con su mínimo de empujes
+            posicion = indice[a] * n + indice[b]
+            if costos[posicion] == INALCANZABLE:
+                costos[posicion] = costo
+                costos[indice[b] * n + indice[a]] = costo
+
+        # Estados finales: las dos cajas en objetivos distintos y el jugador en cada región vecina
+        vistos = set()
+        frontera = []
+        objetivos = nivel.objetivos
+        for i, primero in enumerate(objetivos):
+            for segundo in objetivos[i + 1:]:
+                ocupadas = {primero, segundo}
+                registrar(primero, segundo, 0)
+                for caja in ocupadas:
+                    for delta in desplazamientos:
+                        celda = caja + delta
+                        if paredes[celda] or celda in ocupadas:
+                            continue
+                        _, canonica = nivel.region(celda, ocupadas)
+                        estado = (primero, segundo, canonica)
+                        if estado not in vistos:
+                            vistos.add(estado)
+                            frontera.append(estado)
+
+        # Tirones en amplitud: el jugador, junto a una caja, retrocede arrastrándola
+        profundidad = 0
+        while frontera:
+            siguiente = []
+            for a, b, jugador in frontera:
+                alcanzables, _ = nivel.region(jugador, {a, b})
+                for caja, otra in ((a, b), (b, a)):
+                    for delta in desplazamientos:
+                        junto = caja + delta
+                        destino = junto + delta
+                        if not alcanzables[junto] or paredes[destino] or destino == otra:
+                            continue
+                        _, canonica = nivel.region(destino, {junto, otra})
+                        estado = (min(junto, otra), max(junto, otra), canonica)
+                        if estado in vistos:
+                            continue
+                        vistos.add(estado)
+                        siguiente.append(estado)
+                        registrar(junto, otra, profundidad + 1)
+            frontera = siguiente
+            profundidad += 1
+
+        # Escribir en un archivo temporal y renombrar, para que otro proceso nunca lea uno a medias
+        temporal = f"{self.ruta}.{os.getpid()}.tmp"
+        with open(temporal, "wb") as f:
+            f.write(ENCABEZADO.pack(FIRMA, nivel.ancho, nivel.alto, n))
+            f.write(array("I", vivas).tobytes())
+            f.write(costos.tobytes())
+        os.replace(temporal, self.ruta)
+
+    def cargar(self):
+        """
+        Mapea el archivo en memoria y prepara el índice de celdas vivas.
+        """
+        with open(self.ruta, "rb") as f:
+            self.datos = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        firma, ancho, alto, n = ENCABEZADO.unpack_from(self.datos)
+        if firma != FIRMA or (ancho, alto) != (self.nivel.ancho, self.nivel.alto):
+            raise ValueError(f"Base de datos de patrones inválida: {self.ruta}")
+
+        inicio = ENCABEZADO.size
+        vivas = memoryview(self.datos)[inicio:inicio + 4 * n].cast("I")
+        self.n = n
+        self.indice = array("l", [-1]) * len(self.nivel.paredes)
+        for i, celda in enumerate(vivas):
+            self.indice[celda] = i
+        vivas.release()
+        self.costos = memoryview(self.datos)[inicio + 4 * n:].cast("H")
+
+    def costo_par(self, a, b):
+        """
+        Devuelve el mínimo de empujes para llevar a objetivos dos cajas en las celdas dadas.
+        """
+        ia, ib = self.indice[a], self.indice[b]
+        if ia < 0 or ib < 0:
+            return INALCANZABLE
+        return self.costos[ia * self.n + ib]
+
+
+class MotorPatrones(MotorHeuristico):
+    """
+    Heurística que combina la asignación óptima con la base de datos de patrones de pares.
+
+    La cota de patrones reparte las cajas en pares disjuntos: cada caja suma su distancia
+    mínima a un objetivo y cada par elegido suma además su exceso (lo que cuesta el par
+    según la base de datos por encima de esas distancias). Como los empujes de cajas
+    distintas son distintos, la suma sobre pares disjuntos nunca sobreestima, y los pares
+    se eligen de forma voraz por mayor exceso. El resultado es el máximo entre esta cota y
+    la asignación óptima, así que sigue siendo admisible.
+    """
+
+    def __init__(self, nivel, tamano_cache=100000, directorio=DIRECTORIO_PATRONES):
+        super().__init__(nivel, tamano_cache)
+        self.patrones = BaseDatosPatrones(nivel, self, directorio)
+        self.minimos = [min(fila, default=0) for fila in self.filas]
+
+    def estimar(self, cajas):
+        asignacion = asignacion_minima([self.filas[caja] for caja in cajas])
+        if asignacion == float("inf"):
+            return asignacion
+        return max(asignacion, self.cota_patrones(cajas))
+
+    def cota_patrones(self, cajas):
+        """
+        Calcula la cota de pares disjuntos elegidos de forma voraz por mayor exceso.
+        """
+        minimos = [self.minimos[caja] for caja in cajas]
+        excesos = []
+        for i in range(len(cajas)):
+            for j in range(i + 1, len(cajas)):
+                costo = self.patrones.costo_par(cajas[i], cajas[j])
+                if costo == INALCANZABLE:
+                    # El par no puede llegar a dos objetivos: el estado es un bloqueo
+                    return float("inf")
+                exceso = costo - minimos[i] - minimos[j]
+                if exceso > 0:
+                    excesos.append((exceso, i, j))
+
+        total = sum(minimos)
+        usadas = set()
+        for exceso, i, j in sorted(excesos, reverse=True):
+            if i not in usadas and j not in usadas:
+                usadas.update((i, j))
+                total += exceso
+        return total
@@ -0,0 +1,191 @@
+from strategies.nivel import Estado
+from strategies.bloqueos import DetectorBloqueos
+
+
+class PodaMovimientos():
+    """
+    Poda de empujes (modo empujes), opcional con `podar_movimientos=True`.
+
+    - **Macros de túnel:** un túnel es un pasillo de una celda de ancho, con paredes a los
+      dos lados de la caja y del jugador que la empuja. Se precalcula una vez por nivel, por
+      dirección, a partir de las paredes. Cuando un empuje deja una caja en un túnel fuera de
+      un objetivo y el jugador no puede llegar al otro lado, la caja se sigue empujando en un
+      solo movimiento hasta salir del túnel, llegar a un objetivo o toparse con otra caja o
+      una celda muerta. El movimiento se codifica como `caja * 4 + direccion` más los
+      empujes extra multiplicados por `macro`.
+    - **Corrales PI:** un corral es una zona libre a la que el jugador no llega, cerrada por
+      paredes y cajas (la barrera). Es un corral PI si todo empuje de una caja de la barrera
+      desde fuera del corral va hacia dentro de él (I) y el jugador puede hacer ya todos esos
+      empujes (P). Si al corral le falta trabajo (un objetivo libre dentro o una caja de la
+      barrera fuera de un objetivo), toda solución tiene que hacer alguno de esos empujes y
+      puede hacerlo primero, así que solo se generan los empujes del corral PI con menos
+      empujes. Si esos empujes no existen, el corral no se puede abrir y el estado es un
+      bloqueo.
+
+    La poda de corrales conserva la solución con menos empujes; los macros de túnel cuentan
+    varios empujes como un movimiento, así que con ellos la solución puede tener más
+    empujes que la óptima.
+    """
+
+    def __init__(self, nivel):
+        self.nivel = nivel
+        self.celdas_muertas = nivel.tabla(DetectorBloqueos).celdas_muertas
+        # Multiplicador de los empujes extra de un macro en el código del movimiento
+        self.macro = 4 * len(nivel.paredes)
+        self.tuneles = self.calcular_tuneles()
+
+    def calcular_tuneles(self):
+        """
+        Marca, para cada dirección, las celdas de túnel: fuera de un objetivo, con paredes a
+        los dos lados y también a los dos lados de la celda anterior (donde queda el jugador).
+        """
+        paredes = self.nivel.paredes
+        es_objetivo = self.nivel.es_objetivo
+        ancho = self.nivel.ancho
+        tuneles = []
+
+        def es_pared(celda):
+            # Fuera del tablero cuenta como pared
+            return not 0 <= celda < len(paredes) or paredes[celda]
+
+        for delta in self.nivel.desplazamientos:
+            laterales = (-1, 1) if abs(delta) == ancho else (-ancho, ancho)
+            tunel = bytearray(len(paredes))
+            for celda in range(len(paredes)):
+                anterior = celda - delta
+                if paredes[celda] or es_objetivo[celda] or es_pared(anterior):
+                    continue
+                if all(es_pared(celda + lateral) and es_pared(anterior + lateral) for lateral in laterales):
+                    tunel[celda] = 1
+            tuneles.append(tunel)
+
+        return tuneles
+
+    def podar(self, estrategia, estado):
+        """
+        Genera los empujes del estado con la poda de corrales PI y los macros de túnel.
+        """
+        alcanzables, _ = self.nivel.region(estado.jugador, set(estado.cajas))
+        movimientos = estrategia.generar_empujes(estado, alcanzables)
+
+        empujes = self.corral_pi(estado, alcanzables)
+        if empujes is not None:
+            podados = len(movimientos)
+            movimientos = [movimiento for movimiento in movimientos if movimiento[1] in empujes]
+            podados -= len(movimientos)
+            estrategia.nodos_generados -= podados
+            estrategia.nodos_podados += podados
+
+        return [self.extender_tunel(estrategia, movimiento) for movimiento in movimientos]
+
+    def corral_pi(self, estado, alcanzables):
+        """
+        Busca los corrales PI del estado y devuelve los empujes (`caja * 4 + direccion`) del
+        que tiene menos, un conjunto vacío si alguno no se puede abrir, o None si no hay
+        ninguno con trabajo pendiente.
+        """
+        paredes = self.nivel.paredes
+        es_objetivo = self.nivel.es_objetivo
+        desplazamientos = self.nivel.desplazamientos
+        ocupadas = set(estado.cajas)
+        vistas = bytearray(len(paredes))
+        mejor = None
+
+        for caja in estado.cajas:
+            for delta in desplazamientos:
+                inicio = caja + delta
+                if paredes[inicio] or inicio in ocupadas or alcanzables[inicio] or vistas[inicio]:
+                    continue
+
+                # Recorrer el corral y reunir las cajas de su barrera
+                corral = {inicio}
+                barrera = set()
+                pendientes = [inicio]
+                vistas[inicio] = 1
+                while pendientes:
+                    celda = pendientes.pop()
+                    for vecino_delta in desplazamientos:
+                        vecina = celda + vecino_delta
+                        if paredes[vecina] or vistas[vecina]:
+                            continue
+                        if vecina in ocupadas:
+                            barrera.add(vecina)
+                            continue
+                        vistas[vecina] = 1
+                        corral.add(vecina)
+                        pendientes.append(vecina)
+
+                if not any(es_objetivo[celda] for celda in corral) and all(es_objetivo[celda] for celda in barrera):
+                    continue
+
+                empujes = self.empujes_hacia_corral(corral, barrera, alcanzables)
+                if empujes is not None and (mejor is None or len(empujes) < len(mejor)):
+                    mejor = empujes
+                    if not mejor:
+                        return mejor
+
+        return mejor
+
+    def empujes_hacia_corral(self, corral, barrera, alcanzables):
+        """
+        Devuelve los empujes de la barrera hacia el corral si es un corral PI, o None si no lo es.
+        """
+        paredes = self.nivel.paredes
+        empujes = set()
+        for caja in barrera:
+            for direccion, delta in enumerate(self.nivel.desplazamientos):
+                empujador = caja - delta
+                destino = caja + delta
+                # Solo cuentan los empujes desde fuera del corral hacia una celda que no sea pared
+                if paredes[empujador] or empujador in corral or paredes[destino]:
+                    continue
+                # I: el empuje tiene que ir hacia el corral; P: el jugador tiene que poder hacerlo ya
+                if destino not in corral or not alcanzables[empujador]:
+                    return None
+                empujes.add(caja * 4 + direccion)
+        return empujes
+
+    def extender_tunel(self, estrategia, movimiento):
+        """
+        Convierte el empuje en un macro si deja la caja en un túnel del que el jugador solo
+        puede seguir empujándola.
+        """
+        nuevo_estado, codigo = movimiento
+        origen, direccion = divmod(codigo, 4)
+        delta = self.nivel.desplazamientos[direccion]
+        tunel = self.tuneles[direccion]
+        caja = origen + delta
+        if not tunel[caja]:
+            return movimiento
+
+        paredes = self.nivel.paredes
+        cajas = set(nuevo_estado.cajas)
+        # Si el jugador llega al otro lado del túnel, la caja también puede volver
+        alcanzables, _ = self.nivel.region(origen, cajas)
+        if alcanzables[caja + delta]:
+            return movimiento
+
+        final = caja
+        while tunel[final]:
+            siguiente = final + delta
+            if paredes[siguiente] or nuevo_estado.ocupacion >> siguiente & 1 or self.celdas_muertas[siguiente]:
+                break
+            final = siguiente
+        if final == caja:
+            return movimiento
+
+        cajas.remove(caja)
+        cajas.add(final)
+        nuevas_cajas = sorted(cajas)
+        ocupacion = nuevo_estado.ocupacion ^ (1 << caja | 1 << final)
+        if estrategia.bloqueos is not None and estrategia.bloqueos.es_bloqueo(ocupacion, final):
+            return movimiento
+
+        _, canonica = self.nivel.region(final - delta, cajas)
+        clave = (
+            nuevo_estado.clave
+            ^ self.nivel.zobrist_jugador[nuevo_estado.jugador] ^ self.nivel.zobrist_jugador[canonica]
+            ^ self.nivel.zobrist_cajas[caja] ^ self.nivel.zobrist_cajas[final]
+        )
+        extra = (final - caja) // delta
+        return Estado(canonica, tuple(nuevas_cajas), clave, ocupacion), codigo + extra * self.macro
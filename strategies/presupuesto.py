@@ -0,0 +1,49 @@
+import time
+
+
+class Presupuesto():
+    """
+    Límite de tiempo (segundos) y de nodos generados para una búsqueda, que cualquier
+    estrategia acepta como `presupuesto=`.
+
+    El reloj empieza en la primera consulta, es decir, al comenzar la búsqueda. Si el mismo
+    presupuesto se pasa a varias estrategias, comparten el mismo plazo; para dar a cada
+    una su propio tiempo se usa un presupuesto nuevo por búsqueda (o `reiniciar`).
+    """
+
+    def __init__(self, tiempo=None, nodos=None):
+        self.tiempo = tiempo
+        self.nodos = nodos
+        self.limite = None  # Instante en que se agota el tiempo
+        self.consultas = 0
+
+    def agotado(self, estrategia):
+        """
+        Indica si la estrategia agotó el presupuesto. El reloj se consulta cada 64 llamadas
+        para que comprobarlo en cada expansión sea barato.
+        """
+        if self.nodos is not None and estrategia.nodos_generados >= self.nodos:
+            return True
+        if self.tiempo is None:
+            return False
+        self.consultas += 1
+        if self.limite is not None and self.consultas & 63:
+            return False
+        return self.vencido()
+
+    def vencido(self):
+        """
+        Indica si pasó el tiempo del presupuesto, consultando siempre el reloj.
+        """
+        if self.tiempo is None:
+            return False
+        if self.limite is None:
+            self.limite = time.monotonic() + self.tiempo
+        return time.monotonic() >= self.limite
+
+    def reiniciar(self):
+        """
+        Vuelve a empezar el plazo en la próxima consulta.
+        """
+        self.limite = None
+        self.consultas = 0
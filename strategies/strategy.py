@@ -1,114 +1,244 @@
+from strategies.nivel import Nivel, Estado, DIRECCIONES
+from strategies.nodos import AlmacenNodos
+from strategies.bloqueos import DetectorBloqueos
+from strategies.visitados import ConjuntoVisitados
+from strategies.poda import PodaMovimientos
+from strategies.tablero import Tablero
+
+# Modos de búsqueda: por pasos del jugador o por empujes de cajas (macro-movimientos)
+MODO_PASOS = "pasos"
+MODO_EMPUJES = "empujes"
 
 
 class Strategy():
 
 
-    def __init__(self, mapa):
+    def __init__(self, mapa, modo=MODO_PASOS, podar_bloqueos=True, verificar_colisiones=False, telemetria=None, presupuesto=None,
+                 podar_movimientos=False):
+        if modo not in (MODO_PASOS, MODO_EMPUJES):
+            raise ValueError(f"Modo de búsqueda desconocido: {modo}")
+        if podar_movimientos and modo != MODO_EMPUJES:
+            raise ValueError("La poda de movimientos requiere el modo empujes")
+        self.modo = modo
+        self.verificar_colisiones = verificar_colisiones
+
         # Estado inicial del juego: posiciones del jugador y cajas
         self.estado_inicial = self.mapa_a_estados(mapa)
 
+        # Tablas de vecinos, empujes y claves precalculadas para generar los sucesores
+        self.tablero = self.nivel.tabla(Tablero)
+
+        # Detector de bloqueos para descartar sucesores sin solución al generarlos
+        self.bloqueos = self.nivel.tabla(DetectorBloqueos) if podar_bloqueos else None
+        # Poda opcional de empujes: macros de túnel y corrales PI
+        self.poda = self.nivel.tabla(PodaMovimientos) if podar_movimientos else None
+
+        # Almacén de nodos con punteros al padre; el nodo raíz corresponde al estado inicial
+        self.nodos = AlmacenNodos()
+        self.nodo_inicial = self.nodos.agregar(-1, -1)
+
         # Métricas adicionales
         self.nodos_generados = 0
         self.nodos_abiertos = 0
         self.nodos_cerrados = 0
+        self.nodos_podados = 0
         self.profundidad_maxima = 0
         self.tiempo_total = 0
+
+        # Límite opcional de tiempo y nodos (Presupuesto); al agotarse la búsqueda se detiene
+        self.presupuesto = presupuesto
+        self.presupuesto_agotado = False
+
+        # Telemetría opcional (Telemetria): progreso periódico, tiempos por fase y perfilado
+        self.telemetria = telemetria
+        if telemetria is not None:
+            telemetria.instrumentar(self)
     
     def resolver(estado_inicial):
         pass
 
+    def cronometrar(self, fase, funcion):
+        """
+        Devuelve `funcion` medida en la fase dada si hay telemetría de fases, o la misma
+        función si no la hay.
+        """
+        if self.telemetria is None:
+            return funcion
+        return self.telemetria.cronometrar(fase, funcion)
+
+    def agotado(self, reloj=False):
+        """
+        Indica si se agotó el presupuesto, y lo registra para la respuesta. Con `reloj` se
+        consulta el tiempo en cada llamada, para los bucles que expanden lotes de estados.
+        """
+        presupuesto = self.presupuesto
+        if presupuesto is not None and (presupuesto.agotado(self) or (reloj and presupuesto.vencido())):
+            self.presupuesto_agotado = True
+        return self.presupuesto_agotado
+
+    def crear_visitados(self):
+        """
+        Crea un conjunto de visitados indexado por la clave Zobrist de los estados.
+        """
+        return ConjuntoVisitados(self.verificar_colisiones)
+
     def es_estado_objetivo(self, estado):
         """
         Verifica si el estado es objetivo, es decir, si todas las cajas están en los objetivos.
         """
-        return estado["cajas"] == estado["objetivos"]
+        return estado.ocupacion == self.tablero.objetivos
     
     def generar_movimientos(self, estado):
+        """
+        Genera los sucesores del estado según el modo de búsqueda.
+        """
+        if self.modo == MODO_EMPUJES:
+            if self.poda is not None:
+                return self.poda.podar(self, estado)
+            return self.generar_empujes(estado)
+        return self.generar_pasos(estado)
+
+    def generar_pasos(self, estado):
         """
         Genera movimientos válidos para el jugador y las cajas en el estado actual.
         """
         movimientos = []
-        jugador_x, jugador_y = estado["jugador"]
-
-        # Movimientos posibles y sus correspondientes notaciones LURD
-        desplazamientos = {
-            "U": (0, -1),  # Arriba
-            "D": (0, 1),  # Abajo
-            "L": (-1, 0),  # Izquierda
-            "R": (1, 0),  # Derecha
-        }
+        jugador, cajas, clave, ocupacion = estado
 
-        for direccion, (dx, dy) in desplazamientos.items():
-            nuevo_jugador = (jugador_x + dx, jugador_y + dy)
-
-            # Verifica si el movimiento es válido (no se sale del tablero ni choca con una pared)
-            if nuevo_jugador not in estado["paredes"]:
-                # Si hay una caja en la posición, verifica si se puede empujar
-                if nuevo_jugador in estado["cajas"]:
-                    nueva_caja = (nuevo_jugador[0] + dx, nuevo_jugador[1] + dy)
-
-                    # La nueva posición de la caja debe estar vacía y no ser una pared o caja
-                    if (
-                        nueva_caja not in estado["paredes"]
-                        and nueva_caja not in estado["cajas"]
-                    ):
-                        nuevo_estado = {
-                            "jugador": nuevo_jugador,
-                            "cajas": estado["cajas"] - {nuevo_jugador} | {nueva_caja},
-                            "objetivos": estado["objetivos"],
-                            "paredes": estado["paredes"],
-                        }
+        # Pasos sin pared desde la celda del jugador (índice en DIRECCIONES), con la celda a la
+        # que iría una caja empujada, los cambios de clave Zobrist y los bits de ambas celdas
+        for direccion, nuevo_jugador, nueva_caja, clave_paso, clave_empuje, bit_jugador, bit_caja in self.tablero.vecinos[jugador]:
+            # Si hay una caja en la posición, verifica si se puede empujar
+            if ocupacion & bit_jugador:
+                # La nueva posición de la caja debe estar vacía y no ser una pared o caja
+                if nueva_caja >= 0 and not ocupacion & bit_caja:
+                    nuevas_cajas = list(cajas)
+                    nuevas_cajas[cajas.index(nuevo_jugador)] = nueva_caja
+                    nuevas_cajas.sort()
+                    nueva_ocupacion = ocupacion ^ bit_jugador ^ bit_caja
+
+                    # Descartar el empuje si deja el nivel en un bloqueo
+                    if self.bloqueos is not None and self.bloqueos.es_bloqueo(nueva_ocupacion, nueva_caja):
+                        self.nodos_podados += 1
+                    else:
+                        # La clave y la ocupación se actualizan con XOR: salen el jugador y la caja de sus celdas y entran en las nuevas
+                        nuevo_estado = Estado(
+                            nuevo_jugador, tuple(nuevas_cajas), clave ^ clave_paso ^ clave_empuje, nueva_ocupacion
+                        )
                         movimientos.append((nuevo_estado, direccion))
                         self.nodos_generados += 1  # Incrementar el contador de nodos generados
-                else:
-                    # Si no hay caja, simplemente mueve el jugador
-                    nuevo_estado = {
-                        "jugador": nuevo_jugador,
-                        "cajas": estado["cajas"],
-                        "objetivos": estado["objetivos"],
-                        "paredes": estado["paredes"],
-                    }
-                    movimientos.append((nuevo_estado, direccion))
-                    self.nodos_generados += 1  # Incrementar el contador de nodos generados
+            else:
+                # Si no hay caja, simplemente mueve el jugador
+                nuevo_estado = Estado(nuevo_jugador, cajas, clave ^ clave_paso, ocupacion)
+                movimientos.append((nuevo_estado, direccion))
+                self.nodos_generados += 1  # Incrementar el contador de nodos generados
+
+        return movimientos
+
+    def generar_empujes(self, estado, alcanzables=None):
+        """
+        Genera solo los empujes de caja posibles desde la región alcanzable por el jugador
+        (que se calcula si no se indica). El jugador de cada sucesor se normaliza a la menor
+        celda de su región, de modo que los estados que solo difieren en la posición del
+        jugador dentro de ella coinciden. El movimiento se codifica como `caja * 4 + direccion`.
+        """
+        movimientos = []
+        jugador, cajas, clave, ocupacion = estado
+        zobrist_jugador = self.nivel.zobrist_jugador
+        empujes = self.tablero.empujes
+        ocupadas = set(cajas)
+        if alcanzables is None:
+            alcanzables, _ = self.nivel.region(jugador, ocupadas)
+
+        for indice, caja in enumerate(cajas):
+            # Direcciones en que las paredes permiten empujar la caja
+            for direccion, detras, nueva_caja, clave_caja, bit_caja, cambio in empujes[caja]:
+                # El jugador debe poder llegar detrás de la caja y el destino debe estar libre
+                if not alcanzables[detras] or ocupacion & bit_caja:
+                    continue
+
+                nuevas_cajas = list(cajas)
+                nuevas_cajas[indice] = nueva_caja
+                nuevas_cajas.sort()
+                nueva_ocupacion = ocupacion ^ cambio
+
+                # Descartar el empuje si deja el nivel en un bloqueo
+                if self.bloqueos is not None and self.bloqueos.es_bloqueo(nueva_ocupacion, nueva_caja):
+                    self.nodos_podados += 1
+                    continue
+
+                # Tras el empuje el jugador queda donde estaba la caja
+                _, canonica = self.nivel.region(caja, set(nuevas_cajas))
+                nueva_clave = clave ^ zobrist_jugador[jugador] ^ zobrist_jugador[canonica] ^ clave_caja
+                nuevo_estado = Estado(canonica, tuple(nuevas_cajas), nueva_clave, nueva_ocupacion)
+                movimientos.append((nuevo_estado, caja * 4 + direccion))
+                self.nodos_generados += 1  # Incrementar el contador de nodos generados
 
         return movimientos
 
-    def preparar_respuesta(self, camino):
+    def reconstruir_camino(self, nodo):
+        """
+        Reconstruye el camino en notación LURD desde la raíz hasta el nodo.
+        """
+        return self.camino_lurd(self.nodos.movimientos_hasta(nodo))
+
+    def camino_lurd(self, secuencia):
+        """
+        Convierte una secuencia de movimientos desde el estado inicial en notación LURD.
+        """
+        if self.modo == MODO_PASOS:
+            return "".join(DIRECCIONES[movimiento] for movimiento in secuencia)
+
+        # En modo empujes se repiten los empujes desde la posición real del jugador,
+        # intercalando el recorrido más corto dentro de la región hasta cada caja
+        jugador, cajas, _, _ = self.nivel.estado_inicial
+        cajas = set(cajas)
+        camino = []
+        macro = 4 * len(self.nivel.paredes)
+        for movimiento in secuencia:
+            # Los macros de túnel repiten el empuje de la misma caja en la misma dirección
+            extra, movimiento = divmod(movimiento, macro)
+            caja, direccion = divmod(movimiento, 4)
+            delta = self.nivel.desplazamientos[direccion]
+            recorrido = self.nivel.camino_jugador(jugador, caja - delta, cajas)
+            camino.extend(DIRECCIONES[paso] for paso in recorrido)
+            for _ in range(1 + extra):
+                camino.append(DIRECCIONES[direccion])
+                cajas.remove(caja)
+                cajas.add(caja + delta)
+                jugador = caja
+                caja += delta
+        return "".join(camino)
+
+    def preparar_respuesta(self, nodo):
         """
-        Prepara la respuesta final con el camino y las métricas.
+        Prepara la respuesta final con el camino y las métricas. El camino se reconstruye
+        a partir del nodo objetivo (None si no hay solución).
         """
-        return {
+        camino = self.reconstruir_camino(nodo) if nodo is not None else None
+        respuesta = {
             "camino": camino,
             "nodos_generados": self.nodos_generados,
             "nodos_abiertos": self.nodos_abiertos,
             "nodos_cerrados": self.nodos_cerrados,
+            "nodos_podados": self.nodos_podados,
             "profundidad_maxima": self.profundidad_maxima,
             "tiempo_total": self.tiempo_total,
+            "presupuesto_agotado": self.presupuesto_agotado,
         }
+        if self.telemetria is not None and self.telemetria.fases:
+            respuesta["fases"] = self.telemetria.resumen()
+        return respuesta
 
     def mapa_a_estados(self, mapa):
         """
-        Convierte el mapa del nivel en un estado del juego.
-        """
-        jugador = None
-        cajas = set()
-        objetivos = set()
-        paredes = set()
-
-        for y, row in enumerate(mapa):
-            for x, char in enumerate(row):
-                if char in ("@", "+"):
-                    jugador = (x, y)
-                if char in ("$", "*"):
-                    cajas.add((x, y))
-                if char in (".", "+", "*"):
-                    objetivos.add((x, y))
-                if char == "#":
-                    paredes.add((x, y))
-
-        return {
-            "jugador": jugador,
-            "cajas": cajas,
-            "objetivos": objetivos,
-            "paredes": paredes,
-        }
+        Compila el mapa del nivel (o reutiliza un `Nivel` ya compilado) y devuelve el
+        estado inicial del juego.
+        """
+        self.nivel = mapa if isinstance(mapa, Nivel) else Nivel(mapa)
+        if self.modo == MODO_EMPUJES:
+            # En modo empujes el jugador se representa por la posición canónica de su región
+            jugador, cajas, _, ocupacion = self.nivel.estado_inicial
+            _, canonica = self.nivel.region(jugador, set(cajas))
+            return Estado(canonica, cajas, self.nivel.clave(canonica, cajas), ocupacion)
+        return self.nivel.estado_inicial
@@ -0,0 +1,83 @@
+from strategies.nivel import tablero_de_bits
+
+
+class Tablero():
+    """
+    Tablero compilado de un nivel, con tablas precalculadas para la generación de sucesores.
+
+    - **Vecinos:** para cada celda, los pasos posibles del jugador sin chocar con una pared:
+      dirección, celda vecina, celda a la que iría una caja empujada desde ella (-1 si es
+      pared), los cambios de clave Zobrist del paso y del empuje y los bits de ambas celdas.
+      Así la generación no recalcula desplazamientos, paredes ni claves en cada expansión.
+    - **Empujes y tirones:** para cada celda con una caja, las direcciones en que se puede
+      empujar (o tirar de) ella según las paredes, con la celda del jugador, la de destino y
+      el cambio de la ocupación de cajas (`1 << celda | 1 << destino`).
+    - **Tableros de bits:** paredes, objetivos y cajas como enteros con un bit por celda
+      (`1 << celda`). La ocupación de las cajas viaja en el `Estado` y se actualiza con XOR,
+      de modo que las pruebas de ocupación, de objetivo y de bloques 2x2 son operaciones de
+      bits.
+    """
+
+    def __init__(self, nivel):
+        self.nivel = nivel
+        paredes = nivel.paredes
+        zobrist_cajas = nivel.zobrist_cajas
+        zobrist_jugador = nivel.zobrist_jugador
+        celdas = len(paredes)
+
+        def es_pared(celda):
+            # Fuera del tablero cuenta como pared
+            return not 0 <= celda < celdas or paredes[celda]
+
+        self.vecinos = []
+        self.empujes = []
+        self.tirones = []
+        for celda in range(celdas):
+            vecinos, empujes, tirones = [], [], []
+            if not paredes[celda]:
+                for direccion, delta in enumerate(nivel.desplazamientos):
+                    anterior, siguiente = celda - delta, celda + delta
+                    if es_pared(siguiente):
+                        continue
+                    destino = siguiente + delta if not es_pared(siguiente + delta) else -1
+                    bit_siguiente = 1 << siguiente
+                    bit_destino = 1 << destino if destino >= 0 else 0
+                    cambio = 1 << celda | bit_siguiente
+                    vecinos.append((
+                        direccion, siguiente, destino,
+                        zobrist_jugador[celda] ^ zobrist_jugador[siguiente],
+                        zobrist_cajas[siguiente] ^ zobrist_cajas[destino] if destino >= 0 else 0,
+                        bit_siguiente, bit_destino,
+                    ))
+                    # Empujar la caja de `celda` hacia `siguiente` desde `anterior`
+                    if not es_pared(anterior):
+                        empujes.append((
+                            direccion, anterior, siguiente,
+                            zobrist_cajas[celda] ^ zobrist_cajas[siguiente], bit_siguiente, cambio,
+                        ))
+                    # Tirar de la caja de `celda` hacia `siguiente`, con el jugador retrocediendo a `destino`
+                    if destino >= 0:
+                        tirones.append((
+                            direccion, siguiente, destino,
+                            zobrist_cajas[celda] ^ zobrist_cajas[siguiente], bit_destino, cambio,
+                        ))
+            self.vecinos.append(tuple(vecinos))
+            self.empujes.append(tuple(empujes))
+            self.tirones.append(tuple(tirones))
+
+        self.paredes = tablero_de_bits(celda for celda in range(celdas) if paredes[celda])
+        self.objetivos = tablero_de_bits(nivel.objetivos)
+
+        # Máscaras de los bloques 2x2 que contienen a cada celda libre (donde puede haber una caja)
+        ancho = nivel.ancho
+        self.cuadrados = [()] * celdas
+        for celda in range(celdas):
+            if paredes[celda]:
+                continue
+            mascaras = []
+            for horizontal in (-1, 1):
+                for vertical in (-ancho, ancho):
+                    bloque = (celda, celda + horizontal, celda + vertical, celda + horizontal + vertical)
+                    if all(0 <= otra < celdas for otra in bloque):
+                        mascaras.append(tablero_de_bits(bloque))
+            self.cuadrados[celda] = tuple(mascaras)
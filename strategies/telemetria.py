@@ -0,0 +1,168 @@
+import os
+import sys
+import time
+import cProfile
+import pstats
+
+
+def memoria_residente(pid=None):
+    """
+    Devuelve la memoria residente (RSS) de un proceso en bytes (por defecto el actual), o
+    None si el sistema no expone /proc.
+    """
+    try:
+        with open(f"/proc/{pid or 'self'}/statm", "r") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def informe_en_consola(progreso):
+    """
+    Callback de progreso predeterminado: una línea por informe en stderr.
+    """
+    memoria = progreso["memoria"]
+    print(
+        f"[{progreso['estrategia']}] {progreso['tiempo']:.1f}s "
+        f"{progreso['nodos_por_segundo']:.0f} nodos/s "
+        f"frontera={progreso['frontera']} visitados={progreso['visitados']} cota={progreso['cota']} "
+        f"memoria={memoria // (1024 * 1024) if memoria is not None else '?'}MB",
+        file=sys.stderr,
+    )
+
+
+class Telemetria():
+    """
+    Instrumentación opcional de una estrategia, que se pasa como `telemetria=` a cualquier
+    estrategia.
+
+    - **Progreso:** los bucles de búsqueda llaman a `progreso` en cada expansión; cada
+      `intervalo` segundos se invoca `callback` con un diccionario con nodos por segundo,
+      tamaño de la frontera y de los visitados, la cota f actual y la memoria residente.
+    - **Fases:** con `fases=True` se mide el tiempo acumulado y las llamadas de la
+      generación de sucesores, la heurística, el conjunto de visitados (hash) y las
+      operaciones de la cola. Agrega un costo fijo por llamada, así que no conviene
+      activarlo al comparar tiempos.
+    - **Perfilado:** con `perfilador=True` se ejecuta `resolver` bajo cProfile; también
+      acepta cualquier objeto con `enable()` y `disable()` (por ejemplo un perfilador por
+      muestreo). Con `archivo_perfil` las estadísticas de cProfile se guardan en disco.
+    """
+
+    def __init__(self, callback=informe_en_consola, intervalo=1.0, fases=False, perfilador=None, archivo_perfil=None):
+        self.callback = callback
+        self.intervalo = intervalo
+        self.fases = fases
+        self.perfilador = cProfile.Profile() if perfilador is True else perfilador
+        self.archivo_perfil = archivo_perfil
+
+        self.tiempos = {}  # fase -> [segundos, llamadas]
+        self.llamadas = 0
+        self.inicio = self.anterior = self.proximo = time.perf_counter()
+        self.generados_anteriores = 0
+
+    def instrumentar(self, estrategia):
+        """
+        Envuelve los métodos de la estrategia que se miden. Se llama desde `Strategy`.
+        """
+        estrategia.resolver = self.envolver_resolver(estrategia.resolver)
+        if not self.fases:
+            return
+
+        estrategia.generar_movimientos = self.cronometrar("sucesores", estrategia.generar_movimientos)
+        if hasattr(estrategia, "heuristica"):
+            estrategia.heuristica = self.cronometrar("heuristica", estrategia.heuristica)
+
+        crear_visitados = estrategia.crear_visitados
+        estrategia.crear_visitados = lambda: VisitadosCronometrados(crear_visitados(), self)
+
+    def envolver_resolver(self, resolver):
+        def resolver_instrumentado():
+            self.inicio = self.anterior = self.proximo = time.perf_counter()
+            if self.perfilador is None:
+                return resolver()
+
+            self.perfilador.enable()
+            try:
+                return resolver()
+            finally:
+                self.perfilador.disable()
+                if self.archivo_perfil is not None and isinstance(self.perfilador, cProfile.Profile):
+                    pstats.Stats(self.perfilador).dump_stats(self.archivo_perfil)
+
+        return resolver_instrumentado
+
+    def cronometrar(self, fase, funcion):
+        """
+        Devuelve `funcion` envuelta para acumular su tiempo en la fase dada, o la misma
+        función si la medición de fases está desactivada.
+        """
+        if not self.fases:
+            return funcion
+
+        acumulado = self.tiempos.setdefault(fase, [0.0, 0])
+        reloj = time.perf_counter
+
+        def medida(*argumentos):
+            inicio = reloj()
+            try:
+                return funcion(*argumentos)
+            finally:
+                acumulado[0] += reloj() - inicio
+                acumulado[1] += 1
+
+        return medida
+
+    def progreso(self, estrategia, frontera=None, visitados=None, cota=None):
+        """
+        Registra una expansión e invoca el callback si pasó el intervalo. El reloj solo se
+        consulta cada 1024 llamadas para que el costo por expansión sea mínimo.
+        """
+        self.llamadas += 1
+        if self.llamadas & 1023:
+            return
+        ahora = time.perf_counter()
+        if ahora < self.proximo:
+            return
+
+        generados = estrategia.nodos_generados
+        self.callback({
+            "estrategia": type(estrategia).__name__,
+            "tiempo": ahora - self.inicio,
+            "nodos_generados": generados,
+            "nodos_cerrados": estrategia.nodos_cerrados,
+            "nodos_por_segundo": (generados - self.generados_anteriores) / max(ahora - self.anterior, 1e-9),
+            "frontera": frontera,
+            "visitados": visitados,
+            "cota": cota,
+            "memoria": memoria_residente(),
+        })
+        self.anterior = ahora
+        self.proximo = ahora + self.intervalo
+        self.generados_anteriores = generados
+
+    def resumen(self):
+        """
+        Devuelve el tiempo y las llamadas acumuladas por fase.
+        """
+        return {
+            fase: {"segundos": segundos, "llamadas": llamadas}
+            for fase, (segundos, llamadas) in self.tiempos.items()
+        }
+
+
+class VisitadosCronometrados():
+    """
+    Conjunto de visitados que acumula en la fase "visitados" el tiempo de sus operaciones.
+    """
+
+    def __init__(self, visitados, telemetria):
+        self.visitados = visitados
+        self.contiene = telemetria.cronometrar("visitados", visitados.__contains__)
+        self.add = telemetria.cronometrar("visitados", visitados.add)
+        self.remove = telemetria.cronometrar("visitados", visitados.remove)
+
+    def __contains__(self, estado):
+        return self.contiene(estado)
+
+    def __len__(self):
+        return len(self.visitados)
@@ -0,0 +1,112 @@
+from array import array
+
+# Políticas de reemplazo cuando dos estados compiten por la misma entrada
+REEMPLAZO_PROFUNDIDAD = "profundidad"
+REEMPLAZO_ANTIGUEDAD = "antiguedad"
+
+
+class TablaTransposicion():
+    """
+    Tabla de transposición de tamaño fijo para las búsquedas en profundidad iterativas.
+
+    Guarda por estado (clave Zobrist) el mejor costo g con que se exploró, la cota f
+    devuelta por su subárbol y la iteración en que ocurrió. Permite podar un estado si ya
+    se alcanzó con un costo menor, o con el mismo costo en la iteración actual (su subárbol
+    ya se exploró con el mismo presupuesto).
+
+    La memoria está acotada: las entradas viven en arreglos planos indexados por
+    `clave % tamaño` y, ante un conflicto, la política de reemplazo decide cuál se queda:
+
+    - **profundidad:** conserva la entrada con menor g (más cercana a la raíz, con el
+      subárbol más grande) mientras su cota siga vigente: que sea de esta iteración o, en
+      IDA*, que supere el límite actual (como las de posiciones sin salida, con cota
+      infinita, que así no se reemplazan para volver a explorarlas).
+    - **antiguedad:** la entrada más reciente siempre reemplaza a la anterior.
+
+    **Tamaño mínimo útil:** `max_entradas` tiene que alcanzar para varias veces los estados
+    distintos que expande una iteración; con menos, las entradas se reemplazan antes de
+    volver a consultarse y la búsqueda repite subárboles enteros. La solución no cambia,
+    pero IDA* puede ser mucho más lento que con la tabla predeterminada (aunque más rápido
+    que sin tabla). En los niveles incluidos una iteración expande unos 4000 estados, e
+    IDA* necesita del orden de 20000 entradas (unos 640 KB): level2 tarda unos 6 s con 1000
+    entradas y 1 s con 2000, y level8 agota los 60 s con 5000 y tarda 4 s con
+    20000.
+    """
+
+    def __init__(self, max_entradas=None, max_bytes=None, reemplazo=REEMPLAZO_PROFUNDIDAD):
+        if reemplazo not in (REEMPLAZO_PROFUNDIDAD, REEMPLAZO_ANTIGUEDAD):
+            raise ValueError(f"Política de reemplazo desconocida: {reemplazo}")
+
+        if max_entradas is None:
+            bytes_por_entrada = sum(array(tipo).itemsize for tipo in "Qldl")
+            max_entradas = (max_bytes or 64 * 1024 * 1024) // bytes_por_entrada
+        self.tamano = max(1, max_entradas)
+        self.reemplazo = reemplazo
+
+        # Entradas en arreglos planos; una entrada con iteración -1 está vacía
+        self.claves = array("Q", [0]) * self.tamano
+        self.costos = array("l", [0]) * self.tamano
+        self.cotas = array("d", [0.0]) * self.tamano
+        self.iteraciones = array("l", [-1]) * self.tamano
+
+        self.iteracion = 0
+        self.limite = None
+        self.aciertos = 0
+
+    def nueva_iteracion(self, limite=None):
+        """
+        Marca el inicio de una nueva iteración (un nuevo límite de costo o profundidad). Con
+        el límite de costo f de IDA*, las cotas guardadas que lo superan siguen sirviendo.
+        """
+        self.iteracion += 1
+        self.limite = limite
+
+    def vigente(self, indice):
+        """
+        Indica si la cota de la entrada vale en esta iteración: es de esta iteración o, con
+        límite de costo f, supera el límite actual (en particular, si es infinita).
+        """
+        return self.iteraciones[indice] == self.iteracion or (
+            self.limite is not None and self.cotas[indice] > self.limite
+        )
+
+    def consultar(self, clave, costo):
+        """
+        Devuelve la cota con la que se puede podar el estado, o None si hay que explorarlo.
+        Se poda si el estado ya se alcanzó con menor costo (la cota es infinita, el otro
+        camino lo cubre) o con el mismo costo y una cota vigente (se reutiliza su cota).
+        """
+        indice = clave % self.tamano
+        if self.iteraciones[indice] < 0 or self.claves[indice] != clave:
+            return None
+
+        costo_guardado = self.costos[indice]
+        if costo_guardado < costo:
+            self.aciertos += 1
+            return float("inf")
+        if costo_guardado == costo and self.vigente(indice):
+            self.aciertos += 1
+            return self.cotas[indice]
+        return None
+
+    def guardar(self, clave, costo, cota):
+        """
+        Registra el resultado de explorar el subárbol de un estado.
+        """
+        indice = clave % self.tamano
+        if self.iteraciones[indice] >= 0:
+            if self.claves[indice] == clave:
+                # Se conserva siempre el mejor costo conocido del mismo estado
+                if self.costos[indice] < costo:
+                    return
+            elif (
+                self.reemplazo == REEMPLAZO_PROFUNDIDAD
+                and self.vigente(indice)
+                and self.costos[indice] < costo
+            ):
+                return
+
+        self.claves[indice] = clave
+        self.costos[indice] = costo
+        self.cotas[indice] = cota
+        self.iteraciones[indice] = self.iteracion
@@ -0,0 +1,360 @@
+import time
+from strategies.strategy import Strategy, MODO_PASOS
+from strategies.heuristica import MotorHeuristico, INALCANZABLE
+from strategies.bloqueos import DetectorBloqueos
+
+try:
+    import numpy as np
+except ImportError:  # NumPy es opcional: solo lo necesitan las estrategias vectoriales
+    np = None
+
+# Constantes de mezcla (splitmix64) para la clave de 64 bits de cada estado
+MEZCLA_1 = 0xBF58476D1CE4E5B9
+MEZCLA_2 = 0x94D049BB133111EB
+MEZCLA_3 = 0x9E3779B97F4A7C15
+
+
+class MotorVectorial():
+    """
+    Generación de sucesores y heurística por lotes con NumPy (modo pasos).
+
+    Un lote de estados son dos arreglos: las celdas del jugador (N) y las cajas como
+    tableros de bits (N x palabras de 64 bits, bit `celda` encendido si hay una caja). Los
+    movimientos y empujes de todo el lote se calculan con máscaras sobre las tablas de
+    paredes y celdas muertas, una dirección a la vez, sin un bucle de Python por estado.
+    Cada estado se identifica por una clave de 64 bits mezclando sus palabras, que es la
+    que se usa para descartar duplicados (como la clave Zobrist en las demás estrategias).
+    """
+
+    def __init__(self, nivel):
+        if np is None:
+            raise ImportError("Las estrategias vectoriales requieren NumPy (pip install numpy)")
+        self.nivel = nivel
+        celdas = len(nivel.paredes)
+        # Palabras para todas las celdas más la celda extra `fuera`
+        self.palabras = celdas // 64 + 1
+        self.desplazamientos = nivel.desplazamientos
+
+        # Tablas por celda, con una celda de pared extra para los índices fuera del tablero
+        self.fuera = celdas
+        self.paredes = np.ones(celdas + 1, dtype=bool)
+        self.paredes[:celdas] = np.frombuffer(bytes(nivel.paredes), dtype=np.uint8).astype(bool)
+        self.celdas_muertas = np.zeros(celdas + 1, dtype=bool)
+        self.celdas_muertas[:celdas] = np.frombuffer(
+            bytes(nivel.tabla(DetectorBloqueos).celdas_muertas), dtype=np.uint8
+        ).astype(bool)
+
+        # Distancia mínima de empujes de cada celda a algún objetivo (una fila por bit)
+        motor = nivel.tabla(MotorHeuristico)
+        self.minimos = np.full(64 * self.palabras, INALCANZABLE, dtype=np.int64)
+        self.minimos[:celdas] = [min(fila, default=INALCANZABLE) for fila in motor.filas]
+
+        self.objetivos = self.tablero(nivel.objetivos)
+
+    def tablero(self, cajas):
+        """
+        Devuelve el tablero de bits de una colección de celdas.
+        """
+        palabras = np.zeros(self.palabras, dtype=np.uint64)
+        for caja in cajas:
+            palabras[caja >> 6] |= np.uint64(1 << (caja & 63))
+        return palabras
+
+    def celdas(self, palabras):
+        """
+        Devuelve las celdas encendidas de un tablero de bits, en orden.
+        """
+        bits = np.unpackbits(palabras.astype("<u8").view(np.uint8), bitorder="little")
+        return tuple(int(celda) for celda in np.flatnonzero(bits))
+
+    def hay_caja(self, cajas, celdas):
+        """
+        Indica, para cada fila del lote, si la celda correspondiente tiene una caja.
+        """
+        palabras = cajas[np.arange(len(celdas)), celdas >> 6]
+        return ((palabras >> (celdas & 63).astype(np.uint64)) & np.uint64(1)).astype(bool)
+
+    def claves(self, jugadores, cajas):
+        """
+        Calcula la clave de 64 bits de cada estado del lote.
+        """
+        with np.errstate(over="ignore"):
+            clave = jugadores.astype(np.uint64) * np.uint64(MEZCLA_3)
+            for palabra in range(self.palabras):
+                clave ^= cajas[:, palabra]
+                clave ^= clave >> np.uint64(30)
+                clave *= np.uint64(MEZCLA_1)
+                clave ^= clave >> np.uint64(27)
+                clave *= np.uint64(MEZCLA_2)
+                clave ^= clave >> np.uint64(31)
+        return clave
+
+    def expandir(self, jugadores, cajas, podar_bloqueos=True):
+        """
+        Genera los sucesores de todo el lote. Devuelve los jugadores y cajas de los sucesores,
+        la fila de su padre en el lote, la dirección del movimiento y cuántos empujes se
+        descartaron por llevar la caja a una celda muerta.
+        """
+        filas = np.arange(len(jugadores))
+        resultado_jugadores, resultado_cajas, padres, direcciones = [], [], [], []
+        podados = 0
+
+        for direccion, delta in enumerate(self.desplazamientos):
+            nuevos = jugadores + delta
+            libre = ~self.paredes[nuevos]
+            con_caja = libre & self.hay_caja(cajas, nuevos)
+
+            # Pasos sin caja: mismas cajas, el jugador avanza
+            pasos = libre & ~con_caja
+            resultado_jugadores.append(nuevos[pasos])
+            resultado_cajas.append(cajas[pasos])
+            padres.append(filas[pasos])
+
+            # Empujes: el destino de la caja no puede ser pared, caja ni celda muerta
+            destinos = np.where(con_caja, nuevos + delta, self.fuera)
+            destinos = np.minimum(np.maximum(destinos, 0), self.fuera)
+            empujes = con_caja & ~self.paredes[destinos] & ~self.hay_caja(cajas, destinos)
+            if podar_bloqueos:
+                muertos = empujes & self.celdas_muertas[destinos]
+                podados += int(muertos.sum())
+                empujes &= ~muertos
+
+            origen, destino = nuevos[empujes], destinos[empujes]
+            nuevas_cajas = cajas[empujes]
+            indices = np.arange(len(origen))
+            nuevas_cajas[indices, origen >> 6] ^= np.uint64(1) << (origen & 63).astype(np.uint64)
+            nuevas_cajas[indices, destino >> 6] ^= np.uint64(1) << (destino & 63).astype(np.uint64)
+            resultado_jugadores.append(origen)
+            resultado_cajas.append(nuevas_cajas)
+            padres.append(filas[empujes])
+
+            direcciones.append(np.full(int(pasos.sum()) + len(origen), direccion, dtype=np.int8))
+
+        return (
+            np.concatenate(resultado_jugadores), np.concatenate(resultado_cajas),
+            np.concatenate(padres), np.concatenate(direcciones), podados,
+        )
+
+    def heuristica_lote(self, cajas):
+        """
+        Evalúa la heurística de todo el lote en una pasada: la suma, sobre las cajas, de la
+        distancia mínima de empujes a algún objetivo. Es más débil que la asignación óptima
+        pero admisible y consistente; vale INALCANZABLE o más si alguna caja no puede llegar.
+        """
+        bits = np.unpackbits(cajas.astype("<u8").view(np.uint8), axis=1, bitorder="little")
+        return bits @ self.minimos
+
+    def contenidas(self, claves, ordenadas):
+        """
+        Indica qué claves están en el arreglo ordenado (búsqueda binaria, sin reordenarlo).
+        """
+        if not len(ordenadas):
+            return np.zeros(len(claves), dtype=bool)
+        posiciones = np.minimum(np.searchsorted(ordenadas, claves), len(ordenadas) - 1)
+        return ordenadas[posiciones] == claves
+
+    def agregar(self, ordenadas, claves):
+        """
+        Inserta claves ordenadas y nuevas en el arreglo ordenado, manteniéndolo ordenado.
+        """
+        return np.insert(ordenadas, np.searchsorted(ordenadas, claves), claves)
+
+    def resueltos(self, cajas):
+        """
+        Indica qué estados del lote tienen todas las cajas en los objetivos.
+        """
+        return (cajas == self.objetivos).all(axis=1)
+
+
+class EstrategiaVectorial(Strategy):
+    """
+    Base de las estrategias vectoriales: prepara el motor y reconstruye el camino.
+    """
+
+    def __init__(self, mapa, **opciones):
+        super().__init__(mapa, **opciones)
+        if self.modo != MODO_PASOS:
+            raise ValueError("Las estrategias vectoriales solo admiten el modo pasos")
+        self.motor = self.nivel.tabla(MotorVectorial)
+        # Los bloqueos se podan solo por celdas muertas: congelamientos y bloques 2x2
+        # requieren recorrer cada estado en Python
+        self.podar_bloqueos = self.bloqueos is not None
+
+    def lote_inicial(self):
+        """
+        Devuelve el estado inicial como lote de un elemento.
+        """
+        jugador, cajas, _, _ = self.estado_inicial
+        return np.array([jugador], dtype=np.int64), self.motor.tablero(cajas)[np.newaxis, :]
+
+    def nodo_desde_lotes(self, lotes, indice, fila):
+        """
+        Recorre los punteros al padre desde una fila de un lote expandido hasta el estado
+        inicial y carga los movimientos en el almacén de nodos. Cada lote guarda, por fila,
+        el lote y la fila del padre (-1 en el estado inicial) y la dirección del movimiento.
+        """
+        secuencia = []
+        while True:
+            lote_padre, filas_padre, direcciones = lotes[indice]
+            if lote_padre[fila] < 0:
+                break
+            secuencia.append(int(direcciones[fila]))
+            indice, fila = int(lote_padre[fila]), int(filas_padre[fila])
+
+        nodo = self.nodo_inicial
+        for direccion in reversed(secuencia):
+            nodo = self.nodos.agregar(nodo, direccion)
+        return nodo
+
+
+class VectorBFSStrategy(EstrategiaVectorial):
+    """
+    ## Búsqueda en Amplitud vectorial (BFS por capas con NumPy)
+
+    - **Objetivo:** Quitar el costo del intérprete por nodo en BFS procesando cada capa completa como arreglos.
+    - **Método:** Cada capa es un lote de jugadores y tableros de bits de cajas. Los sucesores de toda la capa se generan con máscaras de NumPy; los duplicados dentro de la capa y con las capas anteriores se descartan por clave de 64 bits con `unique` e `isin` sobre arreglos ordenados.
+    - **Optimalidad:** Igual que BFS: la primera capa con un estado objetivo da la solución más corta en pasos.
+    - **Ventaja:** El trabajo por nodo se hace en código compilado, así que las capas grandes se procesan mucho más rápido que estado a estado.
+    - **Desventaja:** Requiere NumPy, solo funciona en modo pasos y solo poda bloqueos por celdas muertas, así que explora más estados que BFS.
+    """
+
+    def resolver(self):
+        """
+        Ejecuta la búsqueda en amplitud capa por capa.
+        """
+        inicio = time.time()
+        motor = self.motor
+        jugadores, cajas = self.lote_inicial()
+        visitados = motor.claves(jugadores, cajas)
+        # Por capa y fila: capa del padre, fila del padre y dirección; la inicial no tiene padre
+        capas = [(np.full(1, -1), np.zeros(1, dtype=np.int64), np.zeros(1, dtype=np.int8))]
+
+        while len(jugadores):
+            self.nodos_cerrados += len(jugadores)
+            if self.telemetria is not None:
+                self.telemetria.progreso(self, len(jugadores), len(visitados), len(capas) - 1)
+            if self.presupuesto is not None and self.agotado(reloj=True):
+                print("Presupuesto agotado, deteniendo la búsqueda.")
+                break
+
+            resueltos = np.flatnonzero(motor.resueltos(cajas))
+            if len(resueltos):
+                nodo = self.nodo_desde_lotes(capas, len(capas) - 1, int(resueltos[0]))
+                self.tiempo_total = time.time() - inicio
+                print(f"Solución encontrada en {self.tiempo_total:.2f} segundos")
+                return super().preparar_respuesta(nodo)
+
+            jugadores, cajas, padres, direcciones, podados = motor.expandir(jugadores, cajas, self.podar_bloqueos)
+            self.nodos_generados += len(jugadores)
+            self.nodos_podados += podados
+
+            # Quedarse con la primera aparición de cada estado nuevo
+            claves = motor.claves(jugadores, cajas)
+            claves, primeros = np.unique(claves, return_index=True)
+            nuevos = ~motor.contenidas(claves, visitados)
+            claves, primeros = claves[nuevos], primeros[nuevos]
+            jugadores, cajas = jugadores[primeros], cajas[primeros]
+            visitados = motor.agregar(visitados, claves)
+
+            capas.append((np.full(len(primeros), len(capas) - 1), padres[primeros], direcciones[primeros]))
+            self.nodos_abiertos += len(jugadores)
+            if len(jugadores):
+                self.profundidad_maxima = len(capas) - 1
+
+        self.tiempo_total = time.time() - inicio
+        return super().preparar_respuesta(None)
+
+
+class VectorAStarStrategy(EstrategiaVectorial):
+    """
+    ## A* vectorial (A* por cubetas de f con NumPy)
+
+    - **Objetivo:** Reducir el costo por nodo de A* evaluando la heurística y generando sucesores por lotes.
+    - **Método:** Los abiertos se agrupan en cubetas por f(n) = g(n) + h(n). En cada paso se toma completa la cubeta de menor f y se expande como un lote: se descartan los estados ya cerrados, se generan todos los sucesores con máscaras y se calcula la heurística de todos en una sola operación (suma de distancias mínimas de empuje por caja, como producto de los bits de cajas por la tabla de distancias). Los sucesores se reparten en las cubetas según su f.
+    - **Optimalidad:** La heurística es consistente y se expande siempre la menor f, así que la solución es óptima en pasos, como la de A*.
+    - **Ventaja:** La heurística y la generación cuestan una operación de NumPy por lote en lugar de una llamada de Python por nodo.
+    - **Desventaja:** La heurística por lotes es más débil que la asignación óptima de `AStarStrategy`, así que expande más estados; requiere NumPy y solo funciona en modo pasos.
+    """
+
+    def resolver(self):
+        """
+        Ejecuta A* por cubetas de f, expandiendo cada cubeta como un lote.
+        """
+        inicio = time.time()
+        motor = self.motor
+        jugadores, cajas = self.lote_inicial()
+        h_inicial = int(motor.heuristica_lote(cajas)[0])
+
+        # Cubetas: f -> lista de trozos (jugadores, cajas, g, lote padre, fila padre, dirección),
+        # con un valor por fila en cada arreglo
+        cubetas = {}
+        if h_inicial < INALCANZABLE:
+            cubetas[h_inicial] = [(
+                jugadores, cajas, np.zeros(1, dtype=np.int64), np.full(1, -1), np.zeros(1, dtype=np.int64), np.zeros(1, dtype=np.int8),
+            )]
+        cerrados = np.empty(0, dtype=np.uint64)
+        lotes = []  # Por lote expandido: (lote padre, fila del padre, dirección)
+
+        while cubetas:
+            f_cost = min(cubetas)
+            trozos = cubetas.pop(f_cost)
+            if self.telemetria is not None:
+                self.telemetria.progreso(self, sum(len(trozo[0]) for trozo in trozos), len(cerrados), f_cost)
+            if self.presupuesto is not None and self.agotado(reloj=True):
+                print("Presupuesto agotado, deteniendo la búsqueda.")
+                break
+
+            # Los trozos de la cubeta (de distintos lotes padre) se expanden juntos
+            jugadores, cajas, costos, lote_padre, filas_padre, direcciones = (
+                np.concatenate(columna) for columna in zip(*trozos)
+            )
+
+            # Descartar duplicados y estados ya cerrados; con la misma f, el mismo estado tiene la misma g
+            claves = motor.claves(jugadores, cajas)
+            claves, primeros = np.unique(claves, return_index=True)
+            nuevos = ~motor.contenidas(claves, cerrados)
+            claves, primeros = claves[nuevos], primeros[nuevos]
+            if not len(claves):
+                continue
+            cerrados = motor.agregar(cerrados, claves)
+            jugadores, cajas, costos = jugadores[primeros], cajas[primeros], costos[primeros]
+            lote_padre, filas_padre, direcciones = lote_padre[primeros], filas_padre[primeros], direcciones[primeros]
+
+            # Cada lote expandido guarda sus punteros a las filas de los lotes padre
+            indice = len(lotes)
+            lotes.append((lote_padre, filas_padre, direcciones))
+            self.nodos_cerrados += len(jugadores)
+            self.profundidad_maxima = max(self.profundidad_maxima, int(costos.max()))
+
+            resueltos = np.flatnonzero(motor.resueltos(cajas))
+            if len(resueltos):
+                nodo = self.nodo_desde_lotes(lotes, indice, int(resueltos[0]))
+                self.tiempo_total = time.time() - inicio
+                print(f"Solución encontrada en {self.tiempo_total:.2f} segundos")
+                return super().preparar_respuesta(nodo)
+
+            hijos_jugadores, hijos_cajas, padres, hijos_direcciones, podados = motor.expandir(jugadores, cajas, self.podar_bloqueos)
+            self.nodos_generados += len(hijos_jugadores)
+            self.nodos_podados += podados
+
+            # Heurística de todo el lote; se descartan los bloqueos y los ya cerrados
+            h_costs = motor.heuristica_lote(hijos_cajas)
+            validos = h_costs < INALCANZABLE
+            validos &= ~motor.contenidas(motor.claves(hijos_jugadores, hijos_cajas), cerrados)
+            self.nodos_podados += int((h_costs >= INALCANZABLE).sum())
+            hijos_jugadores, hijos_cajas, padres = hijos_jugadores[validos], hijos_cajas[validos], padres[validos]
+            hijos_direcciones, h_costs = hijos_direcciones[validos], h_costs[validos]
+            hijos_costos = costos[padres] + 1
+            self.nodos_abiertos += len(hijos_jugadores)
+
+            # Repartir los sucesores en las cubetas por f
+            f_costs = hijos_costos + h_costs
+            for f in np.unique(f_costs):
+                seleccion = f_costs == f
+                cubetas.setdefault(int(f), []).append((
+                    hijos_jugadores[seleccion], hijos_cajas[seleccion], hijos_costos[seleccion],
+                    np.full(int(seleccion.sum()), indice), padres[seleccion], hijos_direcciones[seleccion],
+                ))
+
+        self.tiempo_total = time.time() - inicio
+        return super().preparar_respuesta(None)
@@ -0,0 +1,44 @@
+class ConjuntoVisitados():
+    """
+    Conjunto de estados visitados indexado por la clave Zobrist del estado.
+
+    Por defecto solo guarda las claves de 64 bits, sin referencias a las cajas. Con
+    `verificar=True` guarda además la posición completa de cada clave, de modo que una
+    colisión (dos estados distintos con la misma clave) se detecta, se cuenta y no hace
+    que se descarte un estado nuevo.
+    """
+
+    def __init__(self, verificar=False):
+        self.claves = set()
+        self.posiciones = {} if verificar else None
+        self.colisiones = 0
+
+    def __len__(self):
+        return len(self.claves)
+
+    def __contains__(self, estado):
+        if estado.clave not in self.claves:
+            return False
+        if self.posiciones is None:
+            return True
+
+        if (estado.jugador, estado.cajas) in self.posiciones[estado.clave]:
+            return True
+        self.colisiones += 1
+        return False
+
+    def add(self, estado):
+        self.claves.add(estado.clave)
+        if self.posiciones is not None:
+            self.posiciones.setdefault(estado.clave, set()).add((estado.jugador, estado.cajas))
+
+    def remove(self, estado):
+        if self.posiciones is None:
+            self.claves.remove(estado.clave)
+            return
+
+        posiciones = self.posiciones[estado.clave]
+        posiciones.remove((estado.jugador, estado.cajas))
+        if not posiciones:
+            del self.posiciones[estado.clave]
+            self.claves.remove(estado.clave)
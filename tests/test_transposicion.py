@@ -0,0 +1,38 @@
+import io
+import os
+import unittest
+import contextlib
+
+from strategies import BFSStrategy, IDDFSStrategy
+from strategies.niveles import cargar_niveles
+from strategies.transposicion import TablaTransposicion
+
+DIRECTORIO_NIVELES = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "levels")
+
+
+def resolver(estrategia, mapa, **opciones):
+    """
+    Resuelve el nivel sin los mensajes de la estrategia.
+    """
+    with contextlib.redirect_stdout(io.StringIO()):
+        return estrategia(mapa, **opciones).resolver()
+
+
+class PruebaIDDFSConTablaAcotada(unittest.TestCase):
+    """
+    Con una tabla de transposición pequeña, IDDFS tiene que seguir encontrando la solución
+    más corta: la de BFS.
+    """
+
+    def test_solucion_de_longitud_bfs(self):
+        for nombre in ("level1", "level2", "level8"):
+            _, mapa = next(cargar_niveles(os.path.join(DIRECTORIO_NIVELES, f"{nombre}.py")))
+            with self.subTest(nivel=nombre):
+                esperada = resolver(BFSStrategy, mapa)["camino"]
+                camino = resolver(IDDFSStrategy, mapa, tabla_transposicion=TablaTransposicion(max_entradas=1000))["camino"]
+                self.assertIsNotNone(camino)
+                self.assertEqual(len(camino), len(esperada))
+
+
+if __name__ == "__main__":
+    unittest.main()